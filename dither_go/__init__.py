@@ -5,5 +5,6 @@ __version__ = "0.4.0"
 
 from .wrapper import *
 from .matrices import *
+from .algorithms import *
 from .utils.matrices import *
-from .exceptions import DitherGoError, InvalidColorError
+from .exceptions import DitherGoError, InvalidColorError, InvalidBufferError
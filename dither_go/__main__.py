@@ -0,0 +1,8 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import sys
+
+from dither_go.cli import main
+
+sys.exit(main())
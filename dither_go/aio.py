@@ -0,0 +1,247 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Asyncio-native versions of Dither Go! helper functions.
+
+Each coroutine starts its work in a separate goroutine on the Go side and
+waits for it without blocking the event loop nor occupying any Python
+threads. Go reports finished jobs through a pipe watched by the event loop,
+so the amount of concurrent operations isn't limited by a thread pool.
+
+.. note:: This module requires an event loop supporting ``add_reader``
+(eg. the default event loop on Linux and macOS).
+"""
+
+import asyncio
+import os
+import struct
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+from dither_go.utils.buffer import BufferUtils
+from dither_go.wrapper import _go_ditherer
+from dither_go.bindings import dither_go
+
+__all__ = [
+    "open_image", "open_image_bytes", "dither", "dither_copy",
+    "dither_paletted", "dither_into", "encode", "save_image"
+]
+
+_JOB_ID = struct.Struct("<q")
+
+
+class _JobWatcher:
+    """
+    Watches a ``Notifier`` pipe in an event loop and resolves futures
+    of finished jobs.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.notifier = dither_go.NewNotifier()
+        self.fd = self.notifier.Fd()
+        self.pending = b""
+        self.jobs: Dict[int, Tuple[asyncio.Future, Any, Any]] = {}
+
+        loop.add_reader(self.fd, self._on_readable)
+
+        # Don't keep the event loop alive, it's the key of `_watchers`
+        weakref.finalize(self, self._close, weakref.ref(loop), self.fd, self.notifier)
+
+    def submit(self, loop: asyncio.AbstractEventLoop, job, owner: Any = None) -> asyncio.Future:
+        """
+        Returns a future resolved with the job, once it's finished.
+        The owner object is kept alive until then.
+        """
+
+        future = loop.create_future()
+        self.jobs[job.ID] = (future, job, owner)
+
+        return future
+
+    def _on_readable(self) -> None:
+        data = self.pending + os.read(self.fd, _JOB_ID.size * 512)
+
+        finished = len(data) - len(data) % _JOB_ID.size
+        self.pending = data[finished:]
+
+        for (job_id,) in _JOB_ID.iter_unpack(data[:finished]):
+            future, job, _owner = self.jobs.pop(job_id, (None, None, None))
+            if future is not None and not future.done():
+                future.set_result(job)
+
+    @staticmethod
+    def _close(loop_ref: "weakref.ref[asyncio.AbstractEventLoop]", fd: int, notifier) -> None:
+        loop = loop_ref()
+        if loop is not None and not loop.is_closed():
+            loop.remove_reader(fd)
+
+        notifier.Close()
+
+
+_watchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _JobWatcher]" = weakref.WeakKeyDictionary()
+
+
+async def _run(start: Callable[[Any], Any], owner: Any = None):
+    """
+    Starts a job using the notifier of the running event loop and waits for it.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    watcher = _watchers.get(loop)
+    if watcher is None:
+        watcher = _watchers[loop] = _JobWatcher(loop)
+
+    return await watcher.submit(loop, start(watcher.notifier), owner)
+
+
+async def open_image(path: str):
+    """
+    Opens image file and decodes its contents using ``image.Decode`` Golang function.
+
+    See ``dither_go.open_image`` for the details.
+
+    :param path: An path to the location of the image.
+    :type path: :class:`str`
+
+    :raises Exception: If there is a failure in I/O operations or image decoding.
+
+    :returns: An ``image.Image`` Golang object containing image data.
+    """
+
+    job = await _run(lambda notifier: notifier.OpenImage(os.fspath(path)))
+    return job.Image()
+
+
+async def open_image_bytes(data):
+    """
+    Decodes image data stored in memory using ``image.Decode`` Golang function.
+
+    See ``dither_go.open_image_bytes`` for the details.
+
+    :param data: An object supporting the buffer protocol (eg. ``bytes``,
+    ``bytearray`` or ``memoryview``) with encoded image contents.
+
+    :raises InvalidBufferError: If provided object can't be passed to Go.
+    :raises Exception: If there is a failure in image decoding.
+
+    :returns: An ``image.Image`` Golang object containing image data.
+    """
+
+    address, size, owner = BufferUtils().get_address(data)
+
+    job = await _run(lambda notifier: notifier.OpenImageBuffer(address, size), owner)
+    return job.Image()
+
+
+async def dither(ditherer, img_data):
+    """
+    Dithers provided image using ``Ditherer.Dither`` method.
+
+    :param ditherer: A ``Ditherer`` object.
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If dithering failed, eg. because of misconfigured ``Ditherer``.
+
+    :returns: An ``image.Image`` Golang object containing dithered image.
+    """
+
+    job = await _run(lambda notifier: notifier.Dither(_go_ditherer(ditherer, img_data), img_data), img_data)
+    return job.Image()
+
+
+async def dither_copy(ditherer, img_data):
+    """
+    Dithers a copy of provided image using ``Ditherer.DitherCopy`` method.
+    The copy can be given back for reuse with ``dither_go.release_image``.
+
+    :param ditherer: A ``Ditherer`` object.
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If dithering failed, eg. because of misconfigured ``Ditherer``.
+
+    :returns: An ``image.Image`` Golang object containing dithered image.
+    """
+
+    job = await _run(lambda notifier: notifier.DitherCopy(_go_ditherer(ditherer, img_data), img_data), img_data)
+    return job.Image()
+
+
+async def dither_paletted(ditherer, img_data):
+    """
+    Dithers a copy of provided image using ``Ditherer.DitherPaletted`` method.
+    The copy can be given back for reuse with ``dither_go.release_image``.
+
+    :param ditherer: A ``Ditherer`` object.
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If dithering failed, eg. because of misconfigured ``Ditherer``.
+
+    :returns: An ``image.Image`` Golang object containing dithered image.
+    """
+
+    job = await _run(lambda notifier: notifier.DitherPaletted(_go_ditherer(ditherer, img_data), img_data), img_data)
+    return job.Image()
+
+
+async def dither_into(ditherer, dst, img_data):
+    """
+    Dithers provided image into the ``dst`` image, as done by ``dither_go.dither_into``.
+
+    :param ditherer: A ``Ditherer`` object.
+    :param dst: A ``draw.Image`` Golang object with the same bounds as ``img_data``.
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If dithering failed, eg. because the bounds of the images differ.
+
+    :returns: The ``dst`` image.
+    """
+
+    job = await _run(lambda notifier: notifier.DitherInto(_go_ditherer(ditherer, img_data), dst, img_data), (dst, img_data))
+    return job.Image()
+
+
+async def encode(img_data, encode_format: str) -> bytes:
+    """
+    Encodes provided image data to the supported format in memory.
+
+    See ``dither_go.encode_image`` for the details.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :param encode_format: A name of the image format used in encoding.
+    :type encode_format: :class:`str`
+
+    :raises Exception: If there is a failure in image encoding.
+
+    :returns: The encoded image contents.
+    :rtype: :class:`bytes`
+    """
+
+    job = await _run(lambda notifier: notifier.EncodeImage(img_data, encode_format), img_data)
+    return BufferUtils().read_bytes(job.Bytes())
+
+
+async def save_image(img_data, output_path: str, encode_format: str) -> None:
+    """
+    Saves provided image data in specified output path and
+    encodes it to the supported format.
+
+    See ``dither_go.save_image`` for the details.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :param output_path: An path to the output location of the image.
+    :type output_path: :class:`str`
+
+    :param encode_format: A name of the image format used in encoding.
+    :type encode_format: :class:`str`
+
+    :raises Exception: If there is a failure in I/O operations or image encoding.
+
+    :rtype: :class:`None`
+    """
+
+    job = await _run(lambda notifier: notifier.SaveImage(img_data, os.fspath(output_path), encode_format), img_data)
+    job.Err()
@@ -0,0 +1,140 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Static registry of built-in dithering algorithms.
+
+Metadata of the algorithms is written down here, so listing them doesn't
+create any matrices nor read any docstrings.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from dither_go.exceptions import DitherGoError
+
+__all__ = [
+    "ERROR_DIFFUSION", "ORDERED", "AlgorithmInfo",
+    "get_algorithm", "list_algorithms", "get_matrix"
+]
+
+ERROR_DIFFUSION = "error_diffusion"
+"""Kind of algorithms using an ``ErrorDiffusionMatrix`` from ``ErrorDiffusers``."""
+
+ORDERED = "ordered"
+"""Kind of algorithms using an ``OrderedDitherMatrix`` from ``OrderedDitherers``."""
+
+
+class AlgorithmInfo(NamedTuple):
+    """
+    Metadata of a built-in dithering algorithm.
+    """
+
+    name: str
+    """Name of the matrix in ``ErrorDiffusers`` or ``OrderedDitherers``."""
+
+    display_name: str
+    """Human-readable name of the algorithm."""
+
+    kind: str
+    """Either ``ERROR_DIFFUSION`` or ``ORDERED``."""
+
+    width: int
+    """Width of the matrix."""
+
+    height: int
+    """Height of the matrix."""
+
+    cost: int
+    """
+    Relative amount of work per pixel: 1 for ordered dithering, and 1 plus
+    the amount of pixels receiving the error for error diffusion. Keep in mind
+    that error diffusion is also sequential, while ordered dithering uses all CPUs.
+    """
+
+
+_ALGORITHMS: Dict[str, AlgorithmInfo] = {
+    info.name: info for info in (
+        AlgorithmInfo("Simple2D", "Simple 2D", ERROR_DIFFUSION, 2, 2, 3),
+        AlgorithmInfo("FloydSteinberg", "Floyd-Steinberg", ERROR_DIFFUSION, 3, 2, 5),
+        AlgorithmInfo("FalseFloydSteinberg", "False Floyd-Steinberg", ERROR_DIFFUSION, 2, 2, 4),
+        AlgorithmInfo("Stucki", "Stucki", ERROR_DIFFUSION, 5, 3, 13),
+        AlgorithmInfo("Burkes", "Burkes", ERROR_DIFFUSION, 5, 2, 8),
+        AlgorithmInfo("Atkinson", "Atkinson", ERROR_DIFFUSION, 4, 3, 7),
+        AlgorithmInfo("JarvisJudiceNinke", "Jarvis, Judice & Ninke", ERROR_DIFFUSION, 5, 3, 13),
+        AlgorithmInfo("Sierra", "Sierra", ERROR_DIFFUSION, 5, 3, 11),
+        AlgorithmInfo("Sierra2", "Sierra2", ERROR_DIFFUSION, 5, 2, 8),
+        AlgorithmInfo("Sierra2_4A", "Sierra2-4A", ERROR_DIFFUSION, 3, 2, 4),
+        AlgorithmInfo("Sierra3", "Sierra3", ERROR_DIFFUSION, 5, 3, 11),
+        AlgorithmInfo("SierraLite", "Sierra Lite", ERROR_DIFFUSION, 3, 2, 4),
+        AlgorithmInfo("TwoRowSierra", "Two-Row Sierra", ERROR_DIFFUSION, 5, 2, 8),
+        AlgorithmInfo("StevenPigeon", "Pigeon", ERROR_DIFFUSION, 5, 3, 10),
+        AlgorithmInfo("ClusteredDot4x4", "Clustered-Dot 4x4", ORDERED, 4, 4, 1),
+        AlgorithmInfo("ClusteredDot6x6", "Clustered-Dot 6x6", ORDERED, 6, 6, 1),
+        AlgorithmInfo("ClusteredDot6x6_2", "Clustered-Dot 6x6-2", ORDERED, 6, 6, 1),
+        AlgorithmInfo("ClusteredDot6x6_3", "Clustered-Dot 6x6-3", ORDERED, 6, 6, 1),
+        AlgorithmInfo("ClusteredDot8x8", "Clustered-Dot 8x8", ORDERED, 8, 8, 1),
+        AlgorithmInfo("ClusteredDotDiagonal6x6", "Clustered-Dot Diagonal 6x6", ORDERED, 6, 6, 1),
+        AlgorithmInfo("ClusteredDotDiagonal8x8", "Clustered-Dot Diagonal 8x8", ORDERED, 8, 8, 1),
+        AlgorithmInfo("ClusteredDotDiagonal8x8_2", "Clustered-Dot Diagonal 8x8-2", ORDERED, 8, 8, 1),
+        AlgorithmInfo("ClusteredDotDiagonal8x8_3", "Clustered-Dot Diagonal 8x8-3", ORDERED, 8, 8, 1),
+        AlgorithmInfo("ClusteredDotDiagonal16x16", "Clustered-Dot Diagonal 16x16", ORDERED, 16, 16, 1),
+        AlgorithmInfo("Horizontal3x5", "Horizontal 3x5", ORDERED, 3, 5, 1),
+        AlgorithmInfo("Vertical5x3", "Vertical 5x3", ORDERED, 5, 3, 1),
+        AlgorithmInfo("ClusteredDotSpiral5x5", "Clustered-Dot Spiral 5x5", ORDERED, 5, 5, 1),
+        AlgorithmInfo("ClusteredDotHorizontalLine", "Clustered-Dot Horizontal Line", ORDERED, 6, 6, 1),
+        AlgorithmInfo("ClusteredDotVerticalLine", "Clustered-Dot Vertical Line", ORDERED, 6, 6, 1),
+    )
+}
+
+
+def get_algorithm(name: str) -> AlgorithmInfo:
+    """
+    Returns metadata of the built-in algorithm.
+
+    :param name: A name of the matrix in ``ErrorDiffusers`` or ``OrderedDitherers``.
+    :type name: :class:`str`
+
+    :raises DitherGoError: When there is no algorithm with provided name.
+
+    :rtype: AlgorithmInfo
+    """
+
+    try:
+        return _ALGORITHMS[name]
+    except KeyError as exc:
+        raise DitherGoError(f"Unknown dithering algorithm: {name}") from exc
+
+def list_algorithms(kind: Optional[str] = None) -> List[AlgorithmInfo]:
+    """
+    Returns metadata of all built-in algorithms, in the order of their
+    matrices in ``ErrorDiffusers`` and ``OrderedDitherers``.
+
+    :param kind: If provided, only algorithms of this kind are returned.
+    :type kind: Optional[str]
+
+    :rtype: List[AlgorithmInfo]
+    """
+
+    return [info for info in _ALGORITHMS.values() if kind is None or info.kind == kind]
+
+def get_matrix(name: str):
+    """
+    Returns the matrix of the built-in algorithm, creating it if it wasn't used yet.
+
+    :param name: A name of the matrix in ``ErrorDiffusers`` or ``OrderedDitherers``.
+    :type name: :class:`str`
+
+    :raises DitherGoError: When there is no algorithm with provided name.
+
+    :returns: An ``ErrorDiffusionMatrix`` or ``OrderedDitherMatrix`` object.
+    """
+
+    # pylint: disable=C0415
+    from dither_go.matrices import ErrorDiffusers, OrderedDitherers
+
+    info = get_algorithm(name)
+
+    if info.kind == ERROR_DIFFUSION:
+        return getattr(ErrorDiffusers, name)
+
+    return getattr(OrderedDitherers, name)
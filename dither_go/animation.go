@@ -0,0 +1,239 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"bytes"
+	"errors"
+	"fmt"
+	"image"
+	"image/color"
+	"image/gif"
+	"os"
+	"runtime"
+	"sync"
+)
+
+// OpenAnimation opens a GIF file and decodes all of its frames
+// using gif.DecodeAll function.
+func OpenAnimation(path string) (*gif.GIF, error) {
+	reader, err := os.Open(path)
+	if err != nil {
+		return nil, err
+	}
+	defer reader.Close()
+
+	return gif.DecodeAll(reader)
+}
+
+// OpenAnimationBuffer decodes all frames of GIF data stored in memory block
+// of provided size, starting at the provided address, using gif.DecodeAll function.
+//
+// The data isn't copied before decoding, so the memory block must stay
+// valid and unchanged until the function returns.
+func OpenAnimationBuffer(address uintptr, size int) (*gif.GIF, error) {
+	data, err := bytesFromAddress(address, size)
+	if err != nil {
+		return nil, err
+	}
+
+	return gif.DecodeAll(bytes.NewReader(data))
+}
+
+// SaveAnimation saves all frames of provided animation in specified
+// output path using gif.EncodeAll function.
+func SaveAnimation(animation *gif.GIF, output_path string) error {
+	writer, err := os.Create(output_path)
+	if err != nil {
+		return err
+	}
+
+	if encode_err := gif.EncodeAll(writer, animation); encode_err != nil {
+		writer.Close()
+		return encode_err
+	}
+
+	return writer.Close()
+}
+
+// EncodeAnimation encodes all frames of provided animation using
+// gif.EncodeAll function and returns them as an in-memory buffer.
+func EncodeAnimation(animation *gif.GIF) (*Buffer, error) {
+	var writer bytes.Buffer
+
+	if err := gif.EncodeAll(&writer, animation); err != nil {
+		return nil, err
+	}
+
+	return &Buffer{data: writer.Bytes()}, nil
+}
+
+// DitherAnimation dithers all frames of provided animation and returns them
+// as a new animation, keeping frame delays, disposal methods and loop count.
+//
+// Frames are dithered concurrently by a pool of workers, all using the same
+// Ditherer (or Engine). If the amount of workers isn't a positive number,
+// runtime.GOMAXPROCS(0) workers are used.
+//
+// All frames share the Ditherer's palette, extended with a transparent color
+// if any of the frames has transparent pixels, which stay transparent.
+// Because of that, the palette can have at most 255 colors if the animation
+// uses transparency, and 256 colors otherwise.
+func DitherAnimation(d ImageDitherer, animation *gif.GIF, workers int) (*gif.GIF, error) {
+	if d == nil || animation == nil {
+		return nil, errors.New("no Ditherer or animation provided")
+	}
+
+	palette := color.Palette(d.GetPalette())
+	if len(palette) > 256 {
+		return nil, errors.New("palette has more than 256 colors")
+	}
+
+	transparent := -1
+	if hasTransparency(animation) {
+		if len(palette) == 256 {
+			return nil, errors.New("palette has no room for a transparent color")
+		}
+
+		transparent = len(palette)
+		palette = append(palette, color.RGBA{})
+	}
+
+	opaque := palette
+	if transparent >= 0 {
+		opaque = palette[:transparent]
+	}
+
+	indexes := make(map[color.RGBA]uint8, len(opaque))
+	for i := len(opaque) - 1; i >= 0; i-- {
+		indexes[color.RGBAModel.Convert(opaque[i]).(color.RGBA)] = uint8(i)
+	}
+
+	if workers <= 0 {
+		workers = runtime.GOMAXPROCS(0)
+	}
+
+	frames := make([]*image.Paletted, len(animation.Image))
+	panics := make([]interface{}, len(animation.Image))
+	jobs := make(chan int)
+
+	var wg sync.WaitGroup
+	for i := 0; i < workers && i < len(frames); i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for job := range jobs {
+				func() {
+					defer func() {
+						panics[job] = recover()
+					}()
+
+					frames[job] = ditherFrame(d, animation.Image[job], palette, indexes, transparent)
+				}()
+			}
+		}()
+	}
+
+	for job := range frames {
+		jobs <- job
+	}
+	close(jobs)
+
+	wg.Wait()
+
+	for i, p := range panics {
+		if p != nil {
+			return nil, fmt.Errorf("dithering frame %d failed: %v", i, p)
+		}
+	}
+
+	result := &gif.GIF{
+		Image:     frames,
+		Delay:     append([]int(nil), animation.Delay...),
+		LoopCount: animation.LoopCount,
+		Disposal:  append([]byte(nil), animation.Disposal...),
+		Config: image.Config{
+			ColorModel: palette,
+			Width:      animation.Config.Width,
+			Height:     animation.Config.Height,
+		},
+	}
+
+	if transparent >= 0 {
+		result.BackgroundIndex = uint8(transparent)
+	}
+
+	return result, nil
+}
+
+// ditherFrame dithers a single animation frame and maps its pixels
+// to the provided palette.
+func ditherFrame(d ImageDitherer, frame *image.Paletted, palette color.Palette, indexes map[color.RGBA]uint8, transparent int) *image.Paletted {
+	bounds := frame.Bounds()
+	dithered := d.DitherCopy(frame)
+	result := image.NewPaletted(bounds, palette)
+
+	opaque := palette
+	if transparent >= 0 {
+		opaque = palette[:transparent]
+	}
+
+	hidden := transparentIndexes(frame)
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			if transparent >= 0 && hidden[frame.ColorIndexAt(x, y)] {
+				result.SetColorIndex(x, y, uint8(transparent))
+				continue
+			}
+
+			c := dithered.RGBAAt(x, y)
+
+			index, ok := indexes[c]
+			if !ok {
+				index = uint8(opaque.Index(c))
+			}
+
+			result.SetColorIndex(x, y, index)
+		}
+	}
+
+	return result
+}
+
+// hasTransparency reports whether any frame of the animation has transparent pixels.
+func hasTransparency(animation *gif.GIF) bool {
+	for _, frame := range animation.Image {
+		hidden := transparentIndexes(frame)
+
+		bounds := frame.Bounds()
+		for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+			for x := bounds.Min.X; x < bounds.Max.X; x++ {
+				if hidden[frame.ColorIndexAt(x, y)] {
+					return true
+				}
+			}
+		}
+	}
+
+	return false
+}
+
+// transparentIndexes reports which color indexes of the frame are fully
+// transparent. Indexes outside of the frame palette are treated as transparent.
+func transparentIndexes(frame *image.Paletted) [256]bool {
+	var hidden [256]bool
+
+	for i := range hidden {
+		if i >= len(frame.Palette) {
+			hidden[i] = true
+			continue
+		}
+
+		_, _, _, a := frame.Palette[i].RGBA()
+		hidden[i] = a == 0
+	}
+
+	return hidden
+}
@@ -0,0 +1,120 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"image/color"
+	"image/gif"
+	"math/rand"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// randomFrame returns a paletted frame with random pixels, using the first
+// color of its palette as the transparent one.
+func randomFrame(random *rand.Rand, width int, height int) *image.Paletted {
+	palette := color.Palette{color.NRGBA{}}
+	palette = append(palette, randomPalette(random, 15)...)
+
+	frame := image.NewPaletted(image.Rect(0, 0, width, height), palette)
+	for i := range frame.Pix {
+		frame.Pix[i] = uint8(random.Intn(len(palette)))
+	}
+
+	return frame
+}
+
+func TestDitherAnimation(t *testing.T) {
+	random := rand.New(rand.NewSource(23))
+
+	palette := randomPalette(random, 4)
+	d := dither.NewDitherer(palette)
+	d.Matrix = dither.FloydSteinberg
+
+	animation := &gif.GIF{
+		Image:     []*image.Paletted{randomFrame(random, 9, 7), randomFrame(random, 9, 7), randomFrame(random, 9, 7)},
+		Delay:     []int{10, 20, 30},
+		Disposal:  []byte{gif.DisposalNone, gif.DisposalBackground, gif.DisposalPrevious},
+		LoopCount: 2,
+		Config:    image.Config{Width: 9, Height: 7},
+	}
+
+	for _, workers := range []int{0, 1, 2} {
+		result, err := DitherAnimation(d, animation, workers)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		if len(result.Image) != len(animation.Image) || result.LoopCount != animation.LoopCount || result.Config.Width != 9 || result.Config.Height != 7 {
+			t.Fatalf("workers: %d: animation properties are lost", workers)
+		}
+
+		for i := range animation.Image {
+			if result.Delay[i] != animation.Delay[i] || result.Disposal[i] != animation.Disposal[i] {
+				t.Fatalf("workers: %d: frame %d timing is lost", workers, i)
+			}
+		}
+
+		// The Ditherer palette is extended with a single transparent color
+		transparent := len(palette)
+		if len(result.Image[0].Palette) != len(palette)+1 || int(result.BackgroundIndex) != transparent {
+			t.Fatalf("workers: %d: got %d palette colors, background %d", workers, len(result.Image[0].Palette), result.BackgroundIndex)
+		}
+
+		if _, _, _, a := result.Image[0].Palette[transparent].RGBA(); a != 0 {
+			t.Fatalf("workers: %d: extra palette color is opaque", workers)
+		}
+
+		for i, frame := range animation.Image {
+			dithered := d.DitherCopy(frame)
+			bounds := frame.Bounds()
+
+			for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+				for x := bounds.Min.X; x < bounds.Max.X; x++ {
+					index := int(result.Image[i].ColorIndexAt(x, y))
+
+					// Transparent pixels stay transparent, the rest keep dithered colors
+					if frame.ColorIndexAt(x, y) == 0 {
+						if index != transparent {
+							t.Fatalf("workers: %d: frame %d: transparent pixel (%d, %d) has index %d", workers, i, x, y, index)
+						}
+						continue
+					}
+
+					if index == transparent || color.RGBAModel.Convert(palette[index]) != dithered.RGBAAt(x, y) {
+						t.Fatalf("workers: %d: frame %d: pixel (%d, %d) has index %d", workers, i, x, y, index)
+					}
+				}
+			}
+		}
+	}
+
+	// Without transparent pixels, the palette stays the same
+	for _, frame := range animation.Image {
+		frame.Palette[0] = color.NRGBA{A: 255}
+	}
+
+	result, err := DitherAnimation(d, animation, 0)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if len(result.Image[0].Palette) != len(palette) {
+		t.Fatalf("got %d palette colors for an opaque animation", len(result.Image[0].Palette))
+	}
+
+	full := dither.NewDitherer(randomPalette(random, 256))
+	if _, err := DitherAnimation(full, animation, 0); err != nil {
+		t.Fatalf("opaque animation with 256 colors: %v", err)
+	}
+
+	animation.Image[1].Palette[0] = color.NRGBA{}
+	if _, err := DitherAnimation(full, animation, 0); err == nil {
+		t.Fatal("transparency is accepted with a full palette")
+	}
+}
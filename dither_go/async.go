@@ -0,0 +1,204 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"encoding/binary"
+	"fmt"
+	"image"
+	"image/draw"
+	"os"
+	"sync"
+	"sync/atomic"
+)
+
+// Notifier starts jobs in separate goroutines and reports their completion
+// by writing IDs of finished jobs to a pipe, as 8-byte little-endian integers.
+//
+// The read end of the pipe can be watched by an event loop (eg. asyncio),
+// so waiting for the jobs doesn't block any threads.
+type Notifier struct {
+	reader *os.File
+	writer *os.File
+	mutex  sync.Mutex
+	lastID int64
+}
+
+// Job holds the result of an operation started by Notifier.
+type Job struct {
+	ID     int64
+	done   chan struct{}
+	image  image.Image
+	buffer *Buffer
+	err    error
+}
+
+// NewNotifier creates a new Notifier with its own pipe.
+func NewNotifier() (*Notifier, error) {
+	reader, writer, err := os.Pipe()
+	if err != nil {
+		return nil, err
+	}
+
+	return &Notifier{reader: reader, writer: writer}, nil
+}
+
+// Fd returns the file descriptor of the read end of the pipe.
+func (n *Notifier) Fd() int {
+	return int(n.reader.Fd())
+}
+
+// Close closes both ends of the pipe. Jobs finished afterwards
+// aren't reported anymore.
+func (n *Notifier) Close() error {
+	n.mutex.Lock()
+	defer n.mutex.Unlock()
+
+	if err := n.writer.Close(); err != nil {
+		return err
+	}
+
+	return n.reader.Close()
+}
+
+// OpenImage starts opening image file, as done by OpenImage function.
+func (n *Notifier) OpenImage(path string) *Job {
+	return n.start(func(j *Job) {
+		j.image, j.err = OpenImage(path)
+	})
+}
+
+// OpenImageBuffer starts decoding image data stored in memory, as done by
+// OpenImageBuffer function. The memory must stay valid until the job is finished.
+func (n *Notifier) OpenImageBuffer(address uintptr, size int) *Job {
+	return n.start(func(j *Job) {
+		j.image, j.err = OpenImageBuffer(address, size)
+	})
+}
+
+// Dither starts dithering provided image using Ditherer.Dither method.
+func (n *Notifier) Dither(d ImageDitherer, img_data image.Image) *Job {
+	return n.start(func(j *Job) {
+		j.image = d.Dither(img_data)
+	})
+}
+
+// DitherCopy starts dithering a copy of provided image, like Ditherer.DitherCopy
+// method. The copy is acquired with AcquireRGBA, so it can be given back for
+// reuse with ReleaseImage.
+func (n *Notifier) DitherCopy(d ImageDitherer, img_data image.Image) *Job {
+	return n.start(func(j *Job) {
+		dst := acquireRGBA(img_data.Bounds())
+		if j.err = DitherInto(d, dst, img_data); j.err == nil {
+			j.image = dst
+		}
+	})
+}
+
+// DitherPaletted starts dithering a copy of provided image, like Ditherer.DitherPaletted
+// method. If provided ditherer is an Engine, the copy is acquired with AcquirePaletted,
+// so it can be given back for reuse with ReleaseImage.
+func (n *Notifier) DitherPaletted(d ImageDitherer, img_data image.Image) *Job {
+	return n.start(func(j *Job) {
+		palette := d.GetPalette()
+		if len(palette) > 256 {
+			panic("dither_go: palette has more than 256 colors")
+		}
+
+		if !dithersInto(d, img_data) {
+			j.image = d.DitherPaletted(img_data)
+			return
+		}
+
+		dst := acquirePaletted(img_data.Bounds(), palette)
+		if j.err = DitherInto(d, dst, img_data); j.err == nil {
+			j.image = dst
+		}
+	})
+}
+
+// DitherInto starts dithering provided image into the dst image, as done by
+// DitherInto function.
+func (n *Notifier) DitherInto(d ImageDitherer, dst draw.Image, img_data image.Image) *Job {
+	return n.start(func(j *Job) {
+		if j.err = DitherInto(d, dst, img_data); j.err == nil {
+			j.image = dst
+		}
+	})
+}
+
+// EncodeImage starts encoding provided image data to the supported format,
+// as done by EncodeImage function.
+func (n *Notifier) EncodeImage(img_data image.Image, encode_format string) *Job {
+	return n.start(func(j *Job) {
+		j.buffer, j.err = EncodeImage(img_data, encode_format)
+	})
+}
+
+// SaveImage starts saving provided image data in specified output path,
+// as done by SaveImage function.
+func (n *Notifier) SaveImage(img_data image.Image, output_path string, encode_format string) *Job {
+	return n.start(func(j *Job) {
+		j.err = SaveImage(img_data, output_path, encode_format)
+	})
+}
+
+// start runs the operation in a new goroutine and reports its ID once it's done.
+// Panics raised by the operation are stored as the job error.
+func (n *Notifier) start(operation func(j *Job)) *Job {
+	job := &Job{
+		ID:   atomic.AddInt64(&n.lastID, 1),
+		done: make(chan struct{}),
+	}
+
+	go func() {
+		defer n.notify(job)
+		defer func() {
+			if r := recover(); r != nil {
+				job.err = fmt.Errorf("job failed: %v", r)
+			}
+		}()
+
+		operation(job)
+	}()
+
+	return job
+}
+
+// notify marks the job as done and writes its ID to the pipe.
+func (n *Notifier) notify(job *Job) {
+	close(job.done)
+
+	var id [8]byte
+	binary.LittleEndian.PutUint64(id[:], uint64(job.ID))
+
+	n.mutex.Lock()
+	defer n.mutex.Unlock()
+
+	// Writes below PIPE_BUF in size are atomic, so IDs are never interleaved
+	n.writer.Write(id[:])
+}
+
+// Wait blocks until the job is done.
+func (j *Job) Wait() {
+	<-j.done
+}
+
+// Image waits for the job and returns the image it produced.
+func (j *Job) Image() (image.Image, error) {
+	<-j.done
+	return j.image, j.err
+}
+
+// Bytes waits for the job and returns the encoded image data it produced.
+func (j *Job) Bytes() (*Buffer, error) {
+	<-j.done
+	return j.buffer, j.err
+}
+
+// Err waits for the job and returns its error.
+func (j *Job) Err() error {
+	<-j.done
+	return j.err
+}
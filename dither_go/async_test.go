@@ -0,0 +1,82 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"encoding/binary"
+	"io"
+	"math/rand"
+	"path/filepath"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestNotifier(t *testing.T) {
+	random := rand.New(rand.NewSource(23))
+
+	n, err := NewNotifier()
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer n.Close()
+
+	d := dither.NewDitherer(randomPalette(random, 4))
+	d.Matrix = dither.FloydSteinberg
+
+	img := randomImage(random, 19, 13)
+
+	copied := n.DitherCopy(d, img)
+	encoded := n.EncodeImage(img, "png")
+	missing := n.OpenImage(filepath.Join(t.TempDir(), "missing.png"))
+	panicked := n.Dither(nil, img)
+
+	// Each job reports its ID once, in the order the jobs finish
+	jobs := map[int64]*Job{copied.ID: copied, encoded.ID: encoded, missing.ID: missing, panicked.ID: panicked}
+	for range jobs {
+		var id [8]byte
+		if _, err := io.ReadFull(n.reader, id[:]); err != nil {
+			t.Fatal(err)
+		}
+
+		job, ok := jobs[int64(binary.LittleEndian.Uint64(id[:]))]
+		if !ok {
+			t.Fatalf("unknown or repeated job ID %d reported", binary.LittleEndian.Uint64(id[:]))
+		}
+
+		delete(jobs, job.ID)
+
+		// Reported jobs are done, so waiting for them doesn't block
+		job.Wait()
+	}
+
+	dithered, err := copied.Image()
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if !sameImages(dithered, d.DitherCopy(img)) {
+		t.Fatal("dithered image differs from DitherCopy output")
+	}
+
+	buffer, err := encoded.Bytes()
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	decoded, err := OpenImageBuffer(bytesAddress(buffer.data), buffer.Len())
+	if err != nil || !sameImages(decoded, img) {
+		t.Fatalf("encoded image can't be decoded back: %v", err)
+	}
+
+	if missing.Err() == nil {
+		t.Fatal("opening a missing file succeeded")
+	}
+
+	if panicked.Err() == nil {
+		t.Fatal("panic wasn't reported as job error")
+	}
+}
@@ -0,0 +1,88 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"runtime"
+	"sync"
+)
+
+// DitherBatch opens images from input paths, dithers them using provided
+// Ditherer (or Engine) and saves them in output paths encoded to the supported format.
+//
+// Images are processed concurrently by a pool of workers. If the amount of
+// workers isn't a positive number, runtime.GOMAXPROCS(0) workers are used.
+//
+// A failure in processing one image doesn't stop the others from being
+// processed. The returned slice holds an error message for each image,
+// or an empty string if the image was processed successfully.
+func DitherBatch(inputs []string, outputs []string, d ImageDitherer, encode_format string, workers int) ([]string, error) {
+	if len(inputs) != len(outputs) {
+		return nil, errors.New("amount of input and output paths differs")
+	}
+
+	if d == nil {
+		return nil, errors.New("no Ditherer provided")
+	}
+
+	if workers <= 0 {
+		workers = runtime.GOMAXPROCS(0)
+	}
+
+	errs := make([]string, len(inputs))
+	jobs := make(chan int)
+
+	var wg sync.WaitGroup
+	for i := 0; i < workers && i < len(inputs); i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for job := range jobs {
+				if err := ditherFile(inputs[job], outputs[job], d, encode_format); err != nil {
+					errs[job] = err.Error()
+				}
+			}
+		}()
+	}
+
+	for job := range inputs {
+		jobs <- job
+	}
+	close(jobs)
+
+	wg.Wait()
+
+	return errs, nil
+}
+
+// ditherFile opens image from input path, dithers it and saves it in output path.
+// Panics raised by Ditherer (eg. when it's misconfigured) are returned as errors.
+func ditherFile(input string, output string, d ImageDitherer, encode_format string) (err error) {
+	defer func() {
+		if r := recover(); r != nil {
+			err = fmt.Errorf("%s: dithering failed: %v", input, r)
+		}
+	}()
+
+	img, err := OpenImage(input)
+	if err != nil {
+		return fmt.Errorf("%s: %w", input, err)
+	}
+
+	// Images of the same size share pixel buffers of the dithered copies
+	dst := acquireRGBA(img.Bounds())
+	defer ReleaseImage(dst)
+
+	if err := DitherInto(d, dst, img); err != nil {
+		return fmt.Errorf("%s: %w", input, err)
+	}
+
+	if err := SaveImage(dst, output, encode_format); err != nil {
+		return fmt.Errorf("%s: %w", output, err)
+	}
+
+	return nil
+}
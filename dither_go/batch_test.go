@@ -0,0 +1,82 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"fmt"
+	"math/rand"
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestDitherBatch(t *testing.T) {
+	random := rand.New(rand.NewSource(22))
+	dir := t.TempDir()
+
+	d := dither.NewDitherer(randomPalette(random, 4))
+	d.Matrix = dither.FloydSteinberg
+
+	img := randomImage(random, 21, 11)
+	if err := SaveImage(img, filepath.Join(dir, "valid.png"), "png"); err != nil {
+		t.Fatal(err)
+	}
+
+	if err := os.WriteFile(filepath.Join(dir, "broken.png"), []byte("not an image"), 0o644); err != nil {
+		t.Fatal(err)
+	}
+
+	names := []string{"valid", "missing", "broken", "valid"}
+	inputs := make([]string, len(names))
+	outputs := make([]string, len(names))
+
+	for i, name := range names {
+		inputs[i] = filepath.Join(dir, name+".png")
+		outputs[i] = filepath.Join(dir, "out", fmt.Sprintf("%d-%s.png", i, name))
+	}
+
+	// The first output can't be written, as its directory doesn't exist
+	if err := os.Mkdir(filepath.Join(dir, "out"), 0o755); err != nil {
+		t.Fatal(err)
+	}
+	outputs[0] = filepath.Join(dir, "nowhere", "valid.png")
+
+	errs, err := DitherBatch(inputs, outputs, d, "png", 2)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	// Each failure is reported for its own image, with the failing path
+	for i, path := range []string{outputs[0], inputs[1], inputs[2]} {
+		if !strings.HasPrefix(errs[i], path+": ") {
+			t.Fatalf("image %d: got error %q", i, errs[i])
+		}
+	}
+
+	if errs[3] != "" {
+		t.Fatalf("valid image failed: %s", errs[3])
+	}
+
+	dithered, err := OpenImage(outputs[3])
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if !sameImages(dithered, d.DitherCopy(img)) {
+		t.Fatal("saved image differs from DitherCopy output")
+	}
+
+	if _, err := DitherBatch(inputs, outputs[:1], d, "png", 0); err == nil {
+		t.Fatal("different amounts of inputs and outputs are accepted")
+	}
+
+	if _, err := DitherBatch(inputs, outputs, nil, "png", 0); err == nil {
+		t.Fatal("missing Ditherer is accepted")
+	}
+}
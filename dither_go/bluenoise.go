@@ -0,0 +1,303 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"bytes"
+	"encoding/binary"
+	"errors"
+	"fmt"
+	"math"
+	"math/rand"
+	"os"
+	"path/filepath"
+	"sync"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+const (
+	// blueNoiseSigma is the standard deviation of the Gaussian filter used
+	// to find clusters and voids of the pattern.
+	blueNoiseSigma = 1.5
+
+	// blueNoiseMaxSize is the largest supported size of the texture, so that
+	// ranks of its cells fit in uint16.
+	blueNoiseMaxSize = 256
+)
+
+// blueNoiseMagic starts the blue noise texture files.
+var blueNoiseMagic = []byte("DGBN\x01")
+
+// blueNoiseTexture is a blue noise texture, cached in memory.
+type blueNoiseTexture struct {
+	once  sync.Once
+	ranks []uint16
+}
+
+var (
+	blueNoiseMutex    sync.Mutex
+	blueNoiseTextures = map[int]*blueNoiseTexture{}
+)
+
+// BlueNoise returns an ordered dither matrix of a size x size blue noise
+// texture, for use in Ditherer.SetOrdered, eg.:
+//
+//	matrix, err := BlueNoise(64)
+//	d.SetOrdered(matrix, 1.0)
+//
+// The texture is tileable, and its thresholds are spread evenly at every level,
+// without low frequency patterns, so dithered images look similar to error
+// diffusion, but each pixel is still mapped independently (and concurrently).
+//
+// Textures are generated with the void-and-cluster method, which takes a moment
+// for large sizes (under a second for 128, about ten seconds for 256), so each
+// size is generated once and cached in memory, and in a file in the user's cache
+// directory (or in DITHER_GO_CACHE_DIR, if it's set). The same size always gives
+// the same texture.
+//
+// Size must be between 4 and 256.
+func BlueNoise(size int) (dither.OrderedDitherMatrix, error) {
+	if size < 4 || size > blueNoiseMaxSize {
+		return dither.OrderedDitherMatrix{}, fmt.Errorf("blue noise size must be between 4 and %d", blueNoiseMaxSize)
+	}
+
+	blueNoiseMutex.Lock()
+	texture, ok := blueNoiseTextures[size]
+	if !ok {
+		texture = &blueNoiseTexture{}
+		blueNoiseTextures[size] = texture
+	}
+	blueNoiseMutex.Unlock()
+
+	texture.once.Do(func() {
+		path := blueNoisePath(size)
+
+		if path != "" {
+			if ranks, err := readBlueNoise(path, size); err == nil {
+				texture.ranks = ranks
+				return
+			}
+		}
+
+		texture.ranks = voidAndCluster(size)
+
+		if path != "" {
+			// The texture can always be generated again, so a cache that
+			// can't be written is not an error
+			_ = writeBlueNoise(path, size, texture.ranks)
+		}
+	})
+
+	matrix := make([][]uint, size)
+	for y := range matrix {
+		matrix[y] = make([]uint, size)
+		for x := range matrix[y] {
+			matrix[y][x] = uint(texture.ranks[y*size+x])
+		}
+	}
+
+	return dither.OrderedDitherMatrix{Matrix: matrix, Max: uint(size * size)}, nil
+}
+
+// blueNoisePath returns the path of the cached texture of provided size,
+// or an empty string if there's no cache directory.
+func blueNoisePath(size int) string {
+	dir := os.Getenv("DITHER_GO_CACHE_DIR")
+	if dir == "" {
+		cache, err := os.UserCacheDir()
+		if err != nil {
+			return ""
+		}
+
+		dir = filepath.Join(cache, "dither-go")
+	}
+
+	return filepath.Join(dir, fmt.Sprintf("blue-noise-%d.bin", size))
+}
+
+// readBlueNoise reads the cached texture, checking that it holds every rank once.
+func readBlueNoise(path string, size int) ([]uint16, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+
+	header := len(blueNoiseMagic) + 2
+	if len(data) != header+2*size*size || !bytes.HasPrefix(data, blueNoiseMagic) ||
+		int(binary.LittleEndian.Uint16(data[len(blueNoiseMagic):])) != size {
+		return nil, errors.New("invalid blue noise texture file")
+	}
+
+	ranks := make([]uint16, size*size)
+	seen := make([]bool, size*size)
+
+	for i := range ranks {
+		ranks[i] = binary.LittleEndian.Uint16(data[header+2*i:])
+		if int(ranks[i]) >= len(ranks) || seen[ranks[i]] {
+			return nil, errors.New("invalid blue noise texture file")
+		}
+
+		seen[ranks[i]] = true
+	}
+
+	return ranks, nil
+}
+
+// writeBlueNoise writes the texture to a temporary file, and then moves it
+// in place, so other processes never read a partially written file.
+func writeBlueNoise(path string, size int, ranks []uint16) error {
+	data := make([]byte, 0, len(blueNoiseMagic)+2+2*len(ranks))
+	data = append(data, blueNoiseMagic...)
+	data = binary.LittleEndian.AppendUint16(data, uint16(size))
+
+	for _, rank := range ranks {
+		data = binary.LittleEndian.AppendUint16(data, rank)
+	}
+
+	dir := filepath.Dir(path)
+	if err := os.MkdirAll(dir, 0o755); err != nil {
+		return err
+	}
+
+	file, err := os.CreateTemp(dir, "blue-noise-*.tmp")
+	if err != nil {
+		return err
+	}
+
+	_, err = file.Write(data)
+	if closeErr := file.Close(); err == nil {
+		err = closeErr
+	}
+
+	if err == nil {
+		err = os.Rename(file.Name(), path)
+	}
+
+	if err != nil {
+		os.Remove(file.Name())
+	}
+
+	return err
+}
+
+// voidAndCluster generates a size x size blue noise texture with Ulichney's
+// void-and-cluster method, returning the rank of each cell.
+//
+// Clusters and voids are found using the energy of each cell: the sum of
+// a Gaussian filter centered on every set cell, wrapping around the edges
+// so the texture can be tiled. The tightest cluster is the set cell with the
+// highest energy, and the largest void is the unset cell with the lowest one.
+func voidAndCluster(size int) []uint16 {
+	cells := size * size
+
+	radius := int(math.Ceil(3 * blueNoiseSigma))
+	if radius > (size-1)/2 {
+		radius = (size - 1) / 2
+	}
+
+	kernel := make([]float64, 0, (2*radius+1)*(2*radius+1))
+	for dy := -radius; dy <= radius; dy++ {
+		for dx := -radius; dx <= radius; dx++ {
+			kernel = append(kernel, math.Exp(-float64(dx*dx+dy*dy)/(2*blueNoiseSigma*blueNoiseSigma)))
+		}
+	}
+
+	pattern := make([]bool, cells)
+	energy := make([]float64, cells)
+
+	toggle := func(pattern []bool, energy []float64, cell int) {
+		sign := 1.0
+		if pattern[cell] {
+			sign = -1.0
+		}
+
+		pattern[cell] = !pattern[cell]
+
+		cx, cy := cell%size, cell/size
+		k := 0
+
+		for dy := -radius; dy <= radius; dy++ {
+			row := (cy + dy + size) % size * size
+
+			for dx := -radius; dx <= radius; dx++ {
+				energy[row+(cx+dx+size)%size] += sign * kernel[k]
+				k++
+			}
+		}
+	}
+
+	tightestCluster := func(pattern []bool, energy []float64) int {
+		best := -1
+		for i, set := range pattern {
+			if set && (best < 0 || energy[i] > energy[best]) {
+				best = i
+			}
+		}
+
+		return best
+	}
+
+	largestVoid := func(pattern []bool, energy []float64) int {
+		best := -1
+		for i, set := range pattern {
+			if !set && (best < 0 || energy[i] < energy[best]) {
+				best = i
+			}
+		}
+
+		return best
+	}
+
+	// Initial pattern of randomly set cells, with a fixed seed
+	random := rand.New(rand.NewSource(int64(size)))
+
+	ones := cells / 10
+	if ones == 0 {
+		ones = 1
+	}
+
+	for _, cell := range random.Perm(cells)[:ones] {
+		toggle(pattern, energy, cell)
+	}
+
+	// Move cells from the tightest clusters to the largest voids, until
+	// removing the tightest cluster creates the largest void
+	for i := 0; i < cells; i++ {
+		cluster := tightestCluster(pattern, energy)
+		toggle(pattern, energy, cluster)
+
+		void := largestVoid(pattern, energy)
+		toggle(pattern, energy, void)
+
+		if void == cluster {
+			break
+		}
+	}
+
+	ranks := make([]uint16, cells)
+
+	// Ranks of the initial pattern's cells are given by removing its tightest clusters
+	removed := append([]bool(nil), pattern...)
+	removedEnergy := append([]float64(nil), energy...)
+
+	for rank := ones - 1; rank >= 0; rank-- {
+		cluster := tightestCluster(removed, removedEnergy)
+		toggle(removed, removedEnergy, cluster)
+		ranks[cluster] = uint16(rank)
+	}
+
+	// The rest are given by filling the largest voids. Once more than half of
+	// the cells are set, the largest void is also the tightest cluster of the
+	// unset cells, since the energy of the set and unset cells sums to a constant
+	for rank := ones; rank < cells; rank++ {
+		void := largestVoid(pattern, energy)
+		toggle(pattern, energy, void)
+		ranks[void] = uint16(rank)
+	}
+
+	return ranks
+}
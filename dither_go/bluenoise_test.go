@@ -0,0 +1,83 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"os"
+	"testing"
+)
+
+func TestBlueNoise(t *testing.T) {
+	dir := t.TempDir()
+	t.Setenv("DITHER_GO_CACHE_DIR", dir)
+
+	const size = 32
+
+	matrix, err := BlueNoise(size)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if matrix.Max != size*size || len(matrix.Matrix) != size {
+		t.Fatalf("unexpected matrix size: %d rows, max %d", len(matrix.Matrix), matrix.Max)
+	}
+
+	seen := make([]bool, size*size)
+	for _, row := range matrix.Matrix {
+		for _, rank := range row {
+			if rank >= size*size || seen[rank] {
+				t.Fatalf("rank %d is out of range or repeated", rank)
+			}
+
+			seen[rank] = true
+		}
+	}
+
+	// Cells of the lowest eighth of thresholds shouldn't touch each other,
+	// even across the edges of the texture
+	for y := 0; y < size; y++ {
+		for x := 0; x < size; x++ {
+			if matrix.Matrix[y][x] >= size*size/8 {
+				continue
+			}
+
+			for _, offset := range [][2]int{{1, 0}, {0, 1}, {1, 1}, {1, -1}} {
+				nx, ny := (x+offset[0]+size)%size, (y+offset[1]+size)%size
+				if matrix.Matrix[ny][nx] < size*size/8 {
+					t.Fatalf("cells (%d, %d) and (%d, %d) form a cluster", x, y, nx, ny)
+				}
+			}
+		}
+	}
+
+	cached, err := readBlueNoise(blueNoisePath(size), size)
+	if err != nil {
+		t.Fatalf("texture wasn't cached on disk: %v", err)
+	}
+
+	generated := voidAndCluster(size)
+	for i, rank := range generated {
+		if cached[i] != rank || matrix.Matrix[i/size][i%size] != uint(rank) {
+			t.Fatal("cached texture differs from the generated one")
+		}
+	}
+
+	if err := os.WriteFile(blueNoisePath(size), []byte("DGBN\x01"), 0o644); err != nil {
+		t.Fatal(err)
+	}
+
+	if _, err := readBlueNoise(blueNoisePath(size), size); err == nil {
+		t.Fatal("truncated texture file was read")
+	}
+
+	if _, err := BlueNoise(2); err == nil {
+		t.Fatal("texture of unsupported size was generated")
+	}
+}
+
+func BenchmarkVoidAndCluster(b *testing.B) {
+	for i := 0; i < b.N; i++ {
+		voidAndCluster(64)
+	}
+}
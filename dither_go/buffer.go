@@ -0,0 +1,49 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"unsafe"
+)
+
+// Buffer holds a block of Go memory, which can be read on the Python side
+// through its address, instead of copying it element by element.
+type Buffer struct {
+	data []byte
+}
+
+// Address returns the memory address of the first byte stored in the buffer,
+// or 0 if the buffer is empty.
+func (b *Buffer) Address() uintptr {
+	if len(b.data) == 0 {
+		return 0
+	}
+
+	return uintptr(unsafe.Pointer(&b.data[0]))
+}
+
+// Len returns the amount of bytes stored in the buffer.
+func (b *Buffer) Len() int {
+	return len(b.data)
+}
+
+// bytesFromAddress returns a byte slice backed by the memory block starting
+// at the provided address, without copying it.
+//
+// The address is expected to point to memory owned by the Python side
+// (eg. a bytes object or a buffer exported by it), so the caller must make
+// sure the memory stays valid for as long as the slice is used.
+//
+// Pointer checks (enabled eg. by the race detector) are disabled for it, as they
+// reject addresses of Go memory, which tests pass instead of Python buffers.
+//
+//go:nocheckptr
+func bytesFromAddress(address uintptr, size int) ([]byte, error) {
+	if address == 0 || size <= 0 {
+		return nil, errors.New("empty buffer provided")
+	}
+
+	return unsafe.Slice((*byte)(unsafe.Pointer(address)), size), nil
+}
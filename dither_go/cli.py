@@ -0,0 +1,185 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Command-line interface of Dither Go!, dithering image files and directories
+using a pool of Go workers.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dither_go.exceptions import DitherGoError
+from dither_go.matrices import ErrorDiffusers, OrderedDitherers
+from dither_go.wrapper import dither_batch, get_ditherer
+
+INPUT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".tif", ".tiff")
+
+OUTPUT_EXTENSIONS = {
+    "png": ".png",
+    "jpeg": ".jpg",
+    "bmp": ".bmp",
+    "gif": ".gif",
+    "webp": ".webp",
+    "tiff": ".tiff",
+}
+
+# Amount of images passed to Go at once, per worker
+BATCH_SIZE = 64
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    error_diffusers = ErrorDiffusers.names()
+    ordered_ditherers = OrderedDitherers.names()
+
+    parser = argparse.ArgumentParser(
+        prog="dither-go",
+        description="Dither image files, or all images in directories, using Dither Go!"
+    )
+
+    parser.add_argument("inputs", nargs="+", help="image files or directories to dither")
+    parser.add_argument("-o", "--output", required=True, help="directory for dithered images")
+    parser.add_argument(
+        "-p", "--palette", required=True, metavar="COLORS",
+        help="comma-separated palette colors as hex color codes (eg. '#000,#fff')"
+    )
+    parser.add_argument(
+        "-a", "--algorithm", default="FloydSteinberg", choices=error_diffusers + ordered_ditherers,
+        metavar="ALGORITHM", help="name of the dither matrix from ErrorDiffusers or OrderedDitherers "
+        "(default: %(default)s)"
+    )
+    parser.add_argument("-s", "--strength", type=float, default=1.0, help="strength of the dither matrix (default: %(default)s)")
+    parser.add_argument("--serpentine", action="store_true", help="apply error diffusion in a serpentine manner")
+    parser.add_argument(
+        "-f", "--format", default="png", choices=list(OUTPUT_EXTENSIONS),
+        help="format of the dithered images (default: %(default)s)"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=0,
+        help="amount of images processed in parallel (default: number of CPUs)"
+    )
+    parser.add_argument("--force", action="store_true", help="dither images even if their output is up to date")
+
+    return parser
+
+
+def _find_images(inputs: Sequence[str], output_dir: str, extension: str) -> List[Tuple[str, str]]:
+    """
+    Returns pairs of input and output paths of images found in provided inputs.
+    Directories are searched recursively and their structure is kept in the output.
+
+    :raises DitherGoError: If two images would be written to the same output path
+    (eg. ``photo.jpg`` and ``photo.png``, or images with the same name in two inputs).
+    """
+
+    images: List[Tuple[str, str]] = []
+    sources: Dict[str, str] = {}
+
+    for input_path, output_path in _walk_images(inputs, output_dir, extension):
+        key = os.path.normcase(os.path.normpath(output_path))
+        if key in sources:
+            raise DitherGoError(f"{sources[key]} and {input_path} would both be written to {output_path}")
+
+        sources[key] = input_path
+        images.append((input_path, output_path))
+
+    return images
+
+
+def _walk_images(inputs: Sequence[str], output_dir: str, extension: str) -> Iterator[Tuple[str, str]]:
+    for path in inputs:
+        if not os.path.isdir(path):
+            name = os.path.splitext(os.path.basename(path))[0]
+            yield path, os.path.join(output_dir, name + extension)
+            continue
+
+        for root, _dirs, files in os.walk(path):
+            for file in sorted(files):
+                if not file.lower().endswith(INPUT_EXTENSIONS):
+                    continue
+
+                relative = os.path.relpath(os.path.join(root, os.path.splitext(file)[0]), path)
+                yield os.path.join(root, file), os.path.join(output_dir, relative + extension)
+
+
+def _is_up_to_date(input_path: str, output_path: str) -> bool:
+    try:
+        return os.stat(output_path).st_mtime >= os.stat(input_path).st_mtime
+    except OSError:
+        return False
+
+
+def _run_batch(jobs: List[Tuple[str, str]], ditherer, args: argparse.Namespace) -> int:
+    for output_dir in {os.path.dirname(output) for _input, output in jobs}:
+        os.makedirs(output_dir, exist_ok=True)
+
+    errors = dither_batch(
+        [input_path for input_path, _output in jobs],
+        [output_path for _input, output_path in jobs],
+        ditherer, args.format, args.workers
+    )
+
+    failed = 0
+    for error in errors:
+        if error is not None:
+            print(f"dither-go: {error}", file=sys.stderr)
+            failed += 1
+
+    return failed
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the command-line interface with provided arguments.
+
+    :returns: An exit code, 1 if any of the images couldn't be dithered.
+    :rtype: :class:`int`
+    """
+
+    args = _build_parser().parse_args(argv)
+
+    try:
+        ditherer = get_ditherer(
+            [color.strip() for color in args.palette.split(",")],
+            args.algorithm, args.strength, args.serpentine
+        )
+    except DitherGoError as exc:
+        print(f"dither-go: {exc}", file=sys.stderr)
+        return 2
+
+    try:
+        images = _find_images(args.inputs, args.output, OUTPUT_EXTENSIONS[args.format])
+    except DitherGoError as exc:
+        print(f"dither-go: {exc}", file=sys.stderr)
+        return 2
+
+    batch_size = BATCH_SIZE * (args.workers if args.workers > 0 else os.cpu_count() or 1)
+
+    processed = skipped = failed = 0
+    jobs: List[Tuple[str, str]] = []
+
+    for input_path, output_path in images:
+        if not args.force and _is_up_to_date(input_path, output_path):
+            skipped += 1
+            continue
+
+        jobs.append((input_path, output_path))
+
+        if len(jobs) == batch_size:
+            failed += _run_batch(jobs, ditherer, args)
+            processed += len(jobs)
+            jobs = []
+
+    if jobs:
+        failed += _run_batch(jobs, ditherer, args)
+        processed += len(jobs)
+
+    print(f"dither-go: dithered {processed - failed} images, {failed} failed, {skipped} up to date")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
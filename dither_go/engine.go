@@ -0,0 +1,947 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"image"
+	"image/color"
+	"image/draw"
+	"runtime"
+	"sync"
+	"sync/atomic"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// Special amounts of workers, used by Engine.SetWorkers and SetDefaultWorkers.
+const (
+	// WorkersDefault makes an Engine use the process-wide default amount
+	// of workers. As the default, it means runtime.GOMAXPROCS(0) workers.
+	WorkersDefault = 0
+
+	// WorkersAuto picks the amount of workers from the area of each image,
+	// up to runtime.GOMAXPROCS(0), so small images are dithered by a single one.
+	WorkersAuto = -1
+)
+
+// autoPixelsPerWorker is the amount of pixels of the image per each worker
+// used in WorkersAuto mode. Smaller images are dithered faster by a single
+// worker than it takes to start and synchronize the others.
+const autoPixelsPerWorker = 1 << 16
+
+// defaultWorkers is the process-wide default amount of workers.
+var defaultWorkers int64
+
+// SetDefaultWorkers sets the amount of workers used by all Engines, unless
+// they have their own amount set with SetWorkers. It can be a positive number,
+// WorkersDefault (runtime.GOMAXPROCS(0), which is the initial value) or WorkersAuto.
+//
+// When several images are dithered at once, limiting the amount of workers
+// of each one prevents them from starting more goroutines than there are CPUs.
+func SetDefaultWorkers(workers int) error {
+	if workers < WorkersAuto {
+		return errors.New("amount of workers can't be negative")
+	}
+
+	atomic.StoreInt64(&defaultWorkers, int64(workers))
+	return nil
+}
+
+// DefaultWorkers returns the process-wide default amount of workers.
+func DefaultWorkers() int {
+	return int(atomic.LoadInt64(&defaultWorkers))
+}
+
+// ImageDitherer is implemented by both *dither.Ditherer and *Engine,
+// so they can be used interchangeably by functions dithering many images.
+type ImageDitherer interface {
+	Dither(src image.Image) image.Image
+	DitherCopy(src image.Image) *image.RGBA
+	DitherPaletted(src image.Image) *image.Paletted
+	GetPalette() []color.Color
+}
+
+// Engine dithers images using the settings of a Ditherer, with its own
+// implementation of error diffusion and pixel mapper dithering, which produces
+// exactly the same images as the Ditherer. In comparison to Ditherer, it lets
+// you choose how the closest palette colors are found (see SetSearch).
+//
+// Colors are converted to linear RGB and compared like Ditherer does it, and
+// errors are spread and rounded in the same order. If two palette colors are
+// equally close, the one that comes first in the palette is used. All search
+// strategies find exactly the same colors.
+//
+// The palette is prepared once, when the Engine is created. Matrix, Mapper,
+// Serpentine and SingleThreaded members of the Ditherer are read each time an
+// image is dithered, so they can be changed in-between dithering images.
+// If the Ditherer uses special dithering, or doesn't have exactly one of Matrix
+// and Mapper set, images are dithered by the Ditherer itself. So are the images
+// Engine doesn't read exactly like the Ditherer: ones with transparent pixels,
+// ones of types other than *image.RGBA, *image.NRGBA, *image.Gray, *image.YCbCr
+// and *image.Paletted with 8-bit palette colors (or PreparedImage of them),
+// and, in serpentine mode, ones which bounds start at an odd row.
+//
+// Unlike Ditherer, Engine also uses multiple workers for error diffusion,
+// unless SingleThreaded is set, and still produces exactly the same output as
+// the Ditherer. The amount of workers can be limited with SetWorkers and
+// SetDefaultWorkers.
+//
+// Engine can be safely reused for many images, and used concurrently.
+type Engine struct {
+	ditherer *dither.Ditherer
+	colors   []color.Color
+	palette  []color.RGBA
+	nrgba    []color.NRGBA
+	linear   [][3]uint16
+	search   string
+	finder   colorFinder
+	workers  int
+}
+
+// NewEngine creates a new Engine dithering images with the settings of provided
+// Ditherer. It uses the SearchScan strategy until SetSearch is called.
+func NewEngine(d *dither.Ditherer) (*Engine, error) {
+	if d == nil {
+		return nil, errors.New("no Ditherer provided")
+	}
+
+	colors := d.GetPalette()
+	if len(colors) == 0 {
+		return nil, errors.New("Ditherer has an empty palette")
+	}
+
+	table := linearTable()
+
+	e := &Engine{
+		ditherer: d,
+		colors:   colors,
+		palette:  make([]color.RGBA, len(colors)),
+		nrgba:    make([]color.NRGBA, len(colors)),
+		linear:   make([][3]uint16, len(colors)),
+		search:   SearchScan,
+	}
+
+	for i, c := range colors {
+		// Ditherer linearizes the palette colors without unpremultiplying them
+		r, g, b, _ := c.RGBA()
+		e.palette[i] = color.RGBAModel.Convert(c).(color.RGBA)
+		e.nrgba[i] = color.NRGBAModel.Convert(c).(color.NRGBA)
+		e.linear[i] = [3]uint16{table[r], table[g], table[b]}
+	}
+
+	e.finder = paletteScan(e.linear)
+
+	return e, nil
+}
+
+// SetSearch sets the strategy of finding the closest palette colors.
+//
+// SearchScan compares each pixel with every palette color, which is fast
+// enough for small palettes. SearchLUT builds a lookup table of candidate
+// colors once, which makes dithering with large palettes (eg. 64 colors
+// and more) several times faster.
+//
+// Like the members of Ditherer, it should only be changed in-between
+// dithering images.
+func (e *Engine) SetSearch(strategy string) error {
+	finder, err := newColorFinder(strategy, e.linear)
+	if err != nil {
+		return err
+	}
+
+	e.search = strategy
+	e.finder = finder
+
+	return nil
+}
+
+// Search returns the name of the strategy of finding the closest palette colors.
+func (e *Engine) Search() string {
+	return e.search
+}
+
+// SetWorkers sets the maximum amount of goroutines dithering each image.
+// It can be a positive number, WorkersDefault (the process-wide default set
+// with SetDefaultWorkers, which is the initial value) or WorkersAuto.
+// Setting SingleThreaded of the Ditherer still makes it use one goroutine.
+//
+// Like the members of Ditherer, it should only be changed in-between
+// dithering images.
+func (e *Engine) SetWorkers(workers int) error {
+	if workers < WorkersAuto {
+		return errors.New("amount of workers can't be negative")
+	}
+
+	e.workers = workers
+	return nil
+}
+
+// Workers returns the amount of workers set with SetWorkers.
+func (e *Engine) Workers() int {
+	return e.workers
+}
+
+// workerCount returns the amount of goroutines dithering the image of provided size.
+func (e *Engine) workerCount(bounds image.Rectangle) int {
+	if e.ditherer.SingleThreaded {
+		return 1
+	}
+
+	workers := e.workers
+	if workers == WorkersDefault {
+		workers = DefaultWorkers()
+	}
+
+	switch workers {
+	case WorkersDefault:
+		return runtime.GOMAXPROCS(0)
+	case WorkersAuto:
+		workers = bounds.Dx() * bounds.Dy() / autoPixelsPerWorker
+		if procs := runtime.GOMAXPROCS(0); workers > procs {
+			workers = procs
+		}
+
+		if workers < 1 {
+			workers = 1
+		}
+	}
+
+	return workers
+}
+
+// GetPalette returns a copy of the palette used by the Engine's Ditherer.
+func (e *Engine) GetPalette() []color.Color {
+	return e.ditherer.GetPalette()
+}
+
+// GetColorModel returns the color.Model of the Engine's Ditherer.
+func (e *Engine) GetColorModel() color.Model {
+	return e.ditherer.GetColorModel()
+}
+
+// Dither dithers the provided image.
+//
+// Like Ditherer.Dither, it will always try to change the provided image and return
+// it, but if that is not possible it will return the dithered image as a copy.
+// A copy is made if the input image is *image.Paletted and the image's palette is
+// different than the Ditherer's, or if the image can't be casted to draw.Image
+// (eg. *PreparedImage).
+func (e *Engine) Dither(src image.Image) image.Image {
+	if !e.handles(src) {
+		return e.ditherer.Dither(src)
+	}
+
+	switch img := src.(type) {
+	case *image.RGBA:
+		e.ditherImage(img, e.rgbaWriter(img))
+		return img
+	case *image.NRGBA:
+		e.ditherImage(img, e.nrgbaWriter(img))
+		return img
+	case *image.Paletted:
+		if !e.samePalette(img.Palette) {
+			return e.DitherCopy(img)
+		}
+
+		e.ditherImage(img, palettedWriter(img))
+		return img
+	case draw.Image:
+		e.ditherImage(img, e.drawWriter(img))
+		return img
+	}
+
+	return e.DitherCopy(src)
+}
+
+// DitherCopy dithers a copy of the src image and returns it. The src image remains unchanged.
+func (e *Engine) DitherCopy(src image.Image) *image.RGBA {
+	if !e.handles(src) {
+		return e.ditherer.DitherCopy(src)
+	}
+
+	dst := image.NewRGBA(src.Bounds())
+	e.ditherImage(src, e.rgbaWriter(dst))
+
+	return dst
+}
+
+// DitherPaletted dithers a copy of the src image and returns it as an *image.Paletted,
+// which palette is equal to the output of GetPalette(). The src image remains unchanged.
+//
+// If the palette has over 256 colors then the function will panic, because
+// *image.Paletted does not allow for that.
+//
+// DitherPaletted can't handle images with transparency.
+func (e *Engine) DitherPaletted(src image.Image) *image.Paletted {
+	if !e.handles(src) {
+		return e.ditherer.DitherPaletted(src)
+	}
+
+	if len(e.palette) > 256 {
+		panic("dither_go: palette has more than 256 colors")
+	}
+
+	dst := image.NewPaletted(src.Bounds(), e.GetPalette())
+	e.ditherImage(src, palettedWriter(dst))
+
+	return dst
+}
+
+// DitherInto dithers the src image and writes the result to the dst image,
+// which must have the same bounds, without allocating a new image. If dst is
+// *image.Paletted, its palette must be equal to the Engine's palette.
+// The src image remains unchanged, unless it's the dst image.
+//
+// Reusing dst for images of the same size (eg. frames of a video) avoids
+// allocating and garbage collecting a new image for each one. See also
+// AcquireRGBA and AcquirePaletted.
+//
+// Settings and images the Engine doesn't handle itself (eg. special dithering
+// modes) are dithered like in DitherInto function, by dithering dst in place
+// with the Ditherer. If dst is *image.Paletted, the Ditherer's DitherPaletted
+// output is copied to it instead.
+func (e *Engine) DitherInto(dst draw.Image, src image.Image) error {
+	if dst.Bounds() != src.Bounds() {
+		return fmt.Errorf("destination bounds %v differ from source bounds %v", dst.Bounds(), src.Bounds())
+	}
+
+	if paletted, ok := dst.(*image.Paletted); ok {
+		if len(e.palette) > 256 {
+			return errors.New("palette has more than 256 colors")
+		}
+
+		if !e.samePalette(paletted.Palette) {
+			return errors.New("destination palette differs from the Ditherer's palette")
+		}
+	}
+
+	if !e.handles(src) {
+		paletted, ok := dst.(*image.Paletted)
+		if !ok {
+			return ditherInPlace(e.ditherer, dst, src)
+		}
+
+		// The Ditherer can't write to an *image.Paletted, so its copy is copied over
+		copyPaletted(paletted, e.ditherer.DitherPaletted(src))
+		return nil
+	}
+
+	switch img := dst.(type) {
+	case *image.RGBA:
+		e.ditherImage(src, e.rgbaWriter(img))
+	case *image.NRGBA:
+		e.ditherImage(src, e.nrgbaWriter(img))
+	case *image.Paletted:
+		e.ditherImage(src, palettedWriter(img))
+	default:
+		e.ditherImage(src, e.drawWriter(img))
+	}
+
+	return nil
+}
+
+// handles reports whether the Engine can dither the src image with the current
+// settings of its Ditherer, producing the same output as the Ditherer.
+func (e *Engine) handles(src image.Image) bool {
+	d := e.ditherer
+	if d.Special != 0 || (d.Matrix != nil) == (d.Mapper != nil) {
+		return false
+	}
+
+	// Serpentine rows are reversed by their parity, which has to be the same
+	// counted from the image bounds and from the origin
+	if d.Matrix != nil && d.Serpentine && src.Bounds().Min.Y%2 != 0 {
+		return false
+	}
+
+	return readsExactly(src)
+}
+
+// readsExactly reports whether linearReader reads the src image exactly like
+// Ditherer does. Ditherer reads most images through an *image.RGBA copy,
+// so only opaque images with 8-bit channels are read the same way.
+func readsExactly(src image.Image) bool {
+	switch img := src.(type) {
+	case *PreparedImage:
+		return readsExactly(img.src)
+	case *image.RGBA:
+		return img.Opaque()
+	case *image.NRGBA:
+		return img.Opaque()
+	case *image.Gray, *image.YCbCr:
+		return true
+	case *image.Paletted:
+		for _, c := range img.Palette {
+			r, g, b, a := c.RGBA()
+			if r%0x101 != 0 || g%0x101 != 0 || b%0x101 != 0 || a%0x101 != 0 {
+				return false
+			}
+		}
+
+		return img.Opaque()
+	}
+
+	return false
+}
+
+// copyPaletted copies the palette indexes of the src image to dst, which
+// has the same bounds.
+func copyPaletted(dst *image.Paletted, src *image.Paletted) {
+	bounds := dst.Bounds()
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		copy(dst.Pix[dst.PixOffset(bounds.Min.X, y):][:bounds.Dx()], src.Pix[src.PixOffset(bounds.Min.X, y):])
+	}
+}
+
+// samePalette reports whether provided palette is the Engine's palette.
+func (e *Engine) samePalette(palette color.Palette) bool {
+	if len(palette) != len(e.palette) {
+		return false
+	}
+
+	for i, c := range palette {
+		if color.RGBAModel.Convert(c).(color.RGBA) != e.palette[i] {
+			return false
+		}
+	}
+
+	return true
+}
+
+// ditherImage dithers the src image row by row, passing palette indexes
+// of each row to the writer.
+func (e *Engine) ditherImage(src image.Image, write rowWriter) {
+	if src.Bounds().Empty() {
+		return
+	}
+
+	d := e.ditherer
+	workers := e.workerCount(src.Bounds())
+
+	if d.Matrix != nil {
+		if workers > 1 && src.Bounds().Dy() > 1 {
+			e.diffuseErrorsParallel(src, d.Matrix, d.Serpentine, workers, write)
+			return
+		}
+
+		e.diffuseErrors(src, d.Matrix, d.Serpentine, write)
+		return
+	}
+
+	e.mapPixels(src, d.Mapper, workers, write)
+}
+
+// diffuseErrors dithers the image using error diffusion matrix.
+//
+// Like Ditherer, it keeps the linear values of the pixels, and rounds them
+// each time an error is spread to them. Only the rows the matrix reaches
+// are kept, and the next row is read once the current one is done.
+func (e *Engine) diffuseErrors(src image.Image, matrix dither.ErrorDiffusionMatrix, serpentine bool, write rowWriter) {
+	bounds := src.Bounds()
+	width := bounds.Dx()
+	current := matrix.CurrentPixel()
+	reader := newLinearReader(src)
+
+	rows := make([][]uint16, len(matrix))
+	for dy := range rows {
+		rows[dy] = make([]uint16, 3*width)
+
+		if y := bounds.Min.Y + dy; y < bounds.Max.Y {
+			reader.readRow(y, rows[dy])
+		}
+	}
+
+	indexes := make([]int, width)
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		reverse := serpentine && (y-bounds.Min.Y)%2 == 1
+		row := rows[0]
+
+		for i := 0; i < width; i++ {
+			x := i
+			if reverse {
+				x = width - 1 - i
+			}
+
+			r, g, b := row[3*x], row[3*x+1], row[3*x+2]
+
+			index := e.finder.closest(r, g, b)
+			indexes[x] = index
+
+			c := e.linear[index]
+			errR, errG, errB := float32(r)-float32(c[0]), float32(g)-float32(c[1]), float32(b)-float32(c[2])
+
+			for dy, weights := range matrix {
+				if y+dy >= bounds.Max.Y {
+					break
+				}
+
+				target := rows[dy]
+
+				for dx, weight := range weights {
+					if weight == 0 {
+						continue
+					}
+
+					tx := x + dx - current
+					if reverse {
+						tx = x - dx + current
+					}
+
+					if tx < 0 || tx >= width {
+						continue
+					}
+
+					target[3*tx] = dither.RoundClamp(float32(target[3*tx]) + errR*weight)
+					target[3*tx+1] = dither.RoundClamp(float32(target[3*tx+1]) + errG*weight)
+					target[3*tx+2] = dither.RoundClamp(float32(target[3*tx+2]) + errB*weight)
+				}
+			}
+		}
+
+		write(y, indexes)
+
+		// The current row is reused for the next row the matrix reaches
+		copy(rows, rows[1:])
+		rows[len(rows)-1] = row
+
+		if next := y + len(matrix); next < bounds.Max.Y {
+			reader.readRow(next, row)
+		}
+	}
+}
+
+// progressStep is the amount of pixels diffuseErrorsParallel processes in
+// a row before telling the workers of the next rows about it.
+const progressStep = 32
+
+// diffuseTap is a non-zero weight of the error diffusion matrix, with its
+// horizontal offset from the pixel spreading the error.
+type diffuseTap struct {
+	offset int
+	weight float32
+}
+
+// diffuseErrorsParallel dithers the image using error diffusion matrix, producing
+// exactly the same output as diffuseErrors and Ditherer, but with rows processed
+// concurrently by the provided amount of workers.
+//
+// Rows are processed in a skewed wavefront: a row waits only until the rows
+// above it have processed every pixel that spreads its error to the next pixel
+// of the row, so each worker runs a few pixels behind the worker of the previous
+// row. Instead of adding errors to the pixels they're spread to, each pixel keeps
+// its own error, and reads the errors spread to it when it's processed. They're
+// added and rounded one by one, in the same order diffuseErrors adds them in,
+// so the pixel values are equal.
+//
+// In serpentine mode, the first pixel of a row is the last pixel of the row above
+// it, so a row can't start before the previous row is (almost) done. Only reading
+// and writing the rows is done concurrently then.
+func (e *Engine) diffuseErrorsParallel(src image.Image, matrix dither.ErrorDiffusionMatrix, serpentine bool, workers int, write rowWriter) {
+	bounds := src.Bounds()
+	width, height := bounds.Dx(), bounds.Dy()
+	current := matrix.CurrentPixel()
+	reader := newLinearReader(src)
+
+	if workers > height {
+		workers = height
+	}
+
+	// Errors of each matrix row, from the rightmost one. A pixel at x receives
+	// the error of the pixel at x-offset (or x+offset, if the source row is reversed).
+	// Weights in the first row that spread errors to the already processed pixels
+	// are dropped, just like diffuseErrors does when reading the current row.
+	taps := make([][]diffuseTap, len(matrix))
+	for dy, weights := range matrix {
+		for dx := len(weights) - 1; dx >= 0; dx-- {
+			if weights[dx] == 0 || (dy == 0 && dx <= current) {
+				continue
+			}
+
+			taps[dy] = append(taps[dy], diffuseTap{dx - current, weights[dx]})
+		}
+	}
+
+	// Errors of the pixels, kept for the rows that are processed and the rows
+	// they read errors from. Row y reuses the slot of row y-slots, once that row
+	// and the rows reading its errors (up to row y-workers) are done.
+	slots := workers + len(matrix) - 1
+	errs := make([][]float32, slots)
+	for i := range errs {
+		errs[i] = make([]float32, 3*width)
+	}
+
+	// Amount of processed pixels of each row
+	progress := make([]int64, height)
+
+	reversed := func(row int) bool {
+		return serpentine && row%2 == 1
+	}
+
+	next := int64(-1)
+
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			lin := make([]uint16, 3*width)
+			indexes := make([]int, width)
+			ready := make([]int64, len(matrix))
+
+			for {
+				row := int(atomic.AddInt64(&next, 1))
+				if row >= height {
+					return
+				}
+
+				y := bounds.Min.Y + row
+				reader.readRow(y, lin)
+
+				// Rows usually finish in order, since each one waits for the last pixels
+				// of the row above. But if the matrix doesn't spread errors from them
+				// (eg. its second row is empty), a row can finish before the rows above
+				// it, and the row taking its slot can't assume they're done.
+				for above := maxInt(row-slots, 0); above <= row-workers; above++ {
+					for atomic.LoadInt64(&progress[above]) < int64(width) {
+						runtime.Gosched()
+					}
+				}
+
+				reverse := reversed(row)
+				own := errs[row%slots]
+
+				for i := range ready {
+					ready[i] = 0
+				}
+
+				for i := 0; i < width; i++ {
+					x := i
+					if reverse {
+						x = width - 1 - i
+					}
+
+					// Wait until the rows above have processed the pixels spreading their errors here
+					for dy := 1; dy < len(taps) && dy <= row; dy++ {
+						if len(taps[dy]) == 0 {
+							continue
+						}
+
+						var needed int64
+						if last := taps[dy][len(taps[dy])-1].offset; reversed(row - dy) {
+							needed = int64(width - maxInt(x+last, 0))
+						} else {
+							needed = int64(minInt(x-last, width-1) + 1)
+						}
+
+						for ready[dy] < needed {
+							if ready[dy] = atomic.LoadInt64(&progress[row-dy]); ready[dy] < needed {
+								runtime.Gosched()
+							}
+						}
+					}
+
+					r, g, b := lin[3*x], lin[3*x+1], lin[3*x+2]
+
+					for dy := len(taps) - 1; dy >= 0; dy-- {
+						if dy > row {
+							continue
+						}
+
+						source := errs[(row-dy)%slots]
+						sourceReversed := reversed(row - dy)
+
+						for _, tap := range taps[dy] {
+							sx := x - tap.offset
+							if sourceReversed {
+								sx = x + tap.offset
+							}
+
+							if sx < 0 || sx >= width {
+								continue
+							}
+
+							r = dither.RoundClamp(float32(r) + source[3*sx]*tap.weight)
+							g = dither.RoundClamp(float32(g) + source[3*sx+1]*tap.weight)
+							b = dither.RoundClamp(float32(b) + source[3*sx+2]*tap.weight)
+						}
+					}
+
+					index := e.finder.closest(r, g, b)
+					indexes[x] = index
+
+					c := e.linear[index]
+					own[3*x], own[3*x+1], own[3*x+2] = float32(r)-float32(c[0]), float32(g)-float32(c[1]), float32(b)-float32(c[2])
+
+					if (i+1)%progressStep == 0 {
+						atomic.StoreInt64(&progress[row], int64(i+1))
+					}
+				}
+
+				atomic.StoreInt64(&progress[row], int64(width))
+
+				write(y, indexes)
+			}
+		}()
+	}
+
+	wg.Wait()
+}
+
+func minInt(a int, b int) int {
+	if a < b {
+		return a
+	}
+
+	return b
+}
+
+func maxInt(a int, b int) int {
+	if a > b {
+		return a
+	}
+
+	return b
+}
+
+// mapPixels dithers the image using pixel mapper. Rows are processed
+// concurrently by the provided amount of workers.
+func (e *Engine) mapPixels(src image.Image, mapper dither.PixelMapper, workers int, write rowWriter) {
+	bounds := src.Bounds()
+	width := bounds.Dx()
+	reader := newLinearReader(src)
+
+	if workers > bounds.Dy() {
+		workers = bounds.Dy()
+	}
+
+	next := int64(bounds.Min.Y) - 1
+
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			lin := make([]uint16, 3*width)
+			indexes := make([]int, width)
+
+			for {
+				y := int(atomic.AddInt64(&next, 1))
+				if y >= bounds.Max.Y {
+					return
+				}
+
+				reader.readRow(y, lin)
+
+				for i := 0; i < width; i++ {
+					r, g, b := mapper(bounds.Min.X+i, y, lin[3*i], lin[3*i+1], lin[3*i+2])
+					indexes[i] = e.finder.closest(r, g, b)
+				}
+
+				write(y, indexes)
+			}
+		}()
+	}
+
+	wg.Wait()
+}
+
+// rowWriter writes a row of dithered pixels, provided as palette indexes.
+type rowWriter func(y int, indexes []int)
+
+func (e *Engine) rgbaWriter(dst *image.RGBA) rowWriter {
+	return func(y int, indexes []int) {
+		bounds := dst.Bounds()
+		pix := dst.Pix[dst.PixOffset(bounds.Min.X, y):]
+
+		for i, index := range indexes {
+			c := e.palette[index]
+			pix[4*i], pix[4*i+1], pix[4*i+2], pix[4*i+3] = c.R, c.G, c.B, c.A
+		}
+	}
+}
+
+func (e *Engine) nrgbaWriter(dst *image.NRGBA) rowWriter {
+	return func(y int, indexes []int) {
+		bounds := dst.Bounds()
+		pix := dst.Pix[dst.PixOffset(bounds.Min.X, y):]
+
+		for i, index := range indexes {
+			c := e.nrgba[index]
+			pix[4*i], pix[4*i+1], pix[4*i+2], pix[4*i+3] = c.R, c.G, c.B, c.A
+		}
+	}
+}
+
+func palettedWriter(dst *image.Paletted) rowWriter {
+	return func(y int, indexes []int) {
+		bounds := dst.Bounds()
+		pix := dst.Pix[dst.PixOffset(bounds.Min.X, y):]
+
+		for i, index := range indexes {
+			pix[i] = uint8(index)
+		}
+	}
+}
+
+func (e *Engine) drawWriter(dst draw.Image) rowWriter {
+	return func(y int, indexes []int) {
+		minX := dst.Bounds().Min.X
+
+		for i, index := range indexes {
+			dst.Set(minX+i, y, e.colors[index])
+		}
+	}
+}
+
+// unpremultiply returns 16-bit color channel value divided by 16-bit alpha.
+func unpremultiply(v uint32, a uint32) uint32 {
+	if a == 0xffff {
+		return v
+	}
+
+	if a == 0 {
+		return 0
+	}
+
+	v = v * 0xffff / a
+	if v > 0xffff {
+		v = 0xffff
+	}
+
+	return v
+}
+
+var (
+	linearOnce   sync.Once
+	linearValues []uint16
+)
+
+// linearTable returns a table converting 16-bit sRGB channel values
+// to 16-bit linear RGB.
+//
+// The values are taken from a Ditherer, which passes linear colors to its
+// pixel mapper, so they're rounded exactly like the ones it compares.
+func linearTable() []uint16 {
+	linearOnce.Do(func() {
+		linearValues = make([]uint16, 1<<16)
+
+		// The red channel of each pixel is its index in the table
+		img := image.NewRGBA64(image.Rect(0, 0, 256, 256))
+		for i := range linearValues {
+			img.SetRGBA64(i%256, i/256, color.RGBA64{uint16(i), 0, 0, 0xffff})
+		}
+
+		d := dither.NewDitherer([]color.Color{color.Black})
+		d.Mapper = func(x, y int, r, g, b uint16) (uint16, uint16, uint16) {
+			linearValues[256*y+x] = r
+			return r, g, b
+		}
+
+		d.Dither(img)
+	})
+
+	return linearValues
+}
+
+// linearReader reads rows of an image as unpremultiplied linear RGB channels.
+type linearReader struct {
+	src   image.Image
+	table []uint16
+
+	// Linear channels of the palette colors, for *image.Paletted
+	palette [][3]uint16
+}
+
+func newLinearReader(src image.Image) *linearReader {
+	reader := &linearReader{src: src, table: linearTable()}
+
+	if paletted, ok := src.(*image.Paletted); ok {
+		// Indexes outside of the palette are read as black
+		reader.palette = make([][3]uint16, 256)
+
+		for i, c := range paletted.Palette {
+			if i == len(reader.palette) {
+				break
+			}
+
+			reader.palette[i] = reader.unpremultiplied(c)
+		}
+	}
+
+	return reader
+}
+
+// readRow reads the row of the image to lin, as unpremultiplied linear RGB channels.
+func (l *linearReader) readRow(y int, lin []uint16) {
+	bounds := l.src.Bounds()
+	width := bounds.Dx()
+	table := l.table
+
+	switch src := l.src.(type) {
+	case *PreparedImage:
+		src.readRow(y, lin)
+	case *image.RGBA:
+		pix := src.Pix[src.PixOffset(bounds.Min.X, y):]
+
+		for i := 0; i < width; i++ {
+			r, g, b, a := uint32(pix[4*i])*0x101, uint32(pix[4*i+1])*0x101, uint32(pix[4*i+2])*0x101, uint32(pix[4*i+3])*0x101
+			if a != 0xffff {
+				r, g, b = unpremultiply(r, a), unpremultiply(g, a), unpremultiply(b, a)
+			}
+
+			lin[3*i], lin[3*i+1], lin[3*i+2] = table[r], table[g], table[b]
+		}
+	case *image.NRGBA:
+		pix := src.Pix[src.PixOffset(bounds.Min.X, y):]
+
+		for i := 0; i < width; i++ {
+			lin[3*i] = table[uint32(pix[4*i])*0x101]
+			lin[3*i+1] = table[uint32(pix[4*i+1])*0x101]
+			lin[3*i+2] = table[uint32(pix[4*i+2])*0x101]
+		}
+	case *image.Gray:
+		pix := src.Pix[src.PixOffset(bounds.Min.X, y):]
+
+		for i := 0; i < width; i++ {
+			v := table[uint32(pix[i])*0x101]
+			lin[3*i], lin[3*i+1], lin[3*i+2] = v, v, v
+		}
+	case *image.Paletted:
+		pix := src.Pix[src.PixOffset(bounds.Min.X, y):]
+
+		for i := 0; i < width; i++ {
+			c := l.palette[pix[i]]
+			lin[3*i], lin[3*i+1], lin[3*i+2] = c[0], c[1], c[2]
+		}
+	case *image.YCbCr:
+		for i := 0; i < width; i++ {
+			x := bounds.Min.X + i
+			yi, ci := src.YOffset(x, y), src.COffset(x, y)
+
+			r, g, b := color.YCbCrToRGB(src.Y[yi], src.Cb[ci], src.Cr[ci])
+			lin[3*i], lin[3*i+1], lin[3*i+2] = table[uint32(r)*0x101], table[uint32(g)*0x101], table[uint32(b)*0x101]
+		}
+	default:
+		for i := 0; i < width; i++ {
+			c := l.unpremultiplied(src.At(bounds.Min.X+i, y))
+			lin[3*i], lin[3*i+1], lin[3*i+2] = c[0], c[1], c[2]
+		}
+	}
+}
+
+// unpremultiplied returns linear RGB channels of the color.
+func (l *linearReader) unpremultiplied(c color.Color) [3]uint16 {
+	r, g, b, a := c.RGBA()
+	r, g, b = unpremultiply(r, a), unpremultiply(g, a), unpremultiply(b, a)
+
+	return [3]uint16{l.table[r], l.table[g], l.table[b]}
+}
@@ -0,0 +1,124 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"fmt"
+	"image"
+	"math/rand"
+	"runtime"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestParallelDiffusionMatchesDitherer(t *testing.T) {
+	random := rand.New(rand.NewSource(5))
+
+	d := dither.NewDitherer(randomPalette(random, 16))
+	engine, err := NewEngine(d)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	matrices := map[string]dither.ErrorDiffusionMatrix{
+		"FloydSteinberg":    dither.FloydSteinberg,
+		"JarvisJudiceNinke": dither.JarvisJudiceNinke,
+		"Atkinson":          dither.Atkinson,
+
+		// Rows don't wait for the whole row above them, so they can finish out of order
+		"SkipRow":   {{0, 0, 7.0 / 16}, {0, 0, 0}, {3.0 / 16, 5.0 / 16, 1.0 / 16}},
+		"RightOnly": {{0, 0, 1.0 / 2, 0}, {0, 0, 1.0 / 4, 1.0 / 4}},
+	}
+
+	for _, size := range [][2]int{{131, 47}, {65, 40}, {5, 40}, {64, 2}} {
+		img := randomImage(random, size[0], size[1])
+
+		for name, matrix := range matrices {
+			for _, serpentine := range []bool{false, true} {
+				d.Matrix, d.Serpentine = matrix, serpentine
+				expected := d.DitherCopy(img)
+
+				for _, workers := range []int{2, 3, 8} {
+					output := image.NewRGBA(img.Bounds())
+					engine.diffuseErrorsParallel(img, matrix, serpentine, workers, engine.rgbaWriter(output))
+
+					if string(expected.Pix) != string(output.Pix) {
+						t.Fatalf("%s, %dx%d image, %d workers: output differs from Ditherer's (serpentine: %v)", name, size[0], size[1], workers, serpentine)
+					}
+				}
+			}
+		}
+	}
+}
+
+func BenchmarkDiffuseErrors(b *testing.B) {
+	random := rand.New(rand.NewSource(6))
+	img := randomImage(random, 1024, 1024)
+	dst := image.NewRGBA(img.Bounds())
+
+	engine, err := NewEngine(dither.NewDitherer(randomPalette(random, 16)))
+	if err != nil {
+		b.Fatal(err)
+	}
+
+	matrix := dither.JarvisJudiceNinke
+
+	b.Run("sequential", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			engine.diffuseErrors(img, matrix, false, engine.rgbaWriter(dst))
+		}
+	})
+
+	for _, workers := range []int{2, 4, 8} {
+		b.Run(fmt.Sprintf("parallel/%d", workers), func(b *testing.B) {
+			for i := 0; i < b.N; i++ {
+				engine.diffuseErrorsParallel(img, matrix, false, workers, engine.rgbaWriter(dst))
+			}
+		})
+	}
+}
+
+func TestWorkerCount(t *testing.T) {
+	defer runtime.GOMAXPROCS(runtime.GOMAXPROCS(8))
+	defer SetDefaultWorkers(DefaultWorkers())
+
+	d := dither.NewDitherer(randomPalette(rand.New(rand.NewSource(9)), 4))
+	engine, err := NewEngine(d)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	thumbnail, large := image.Rect(0, 0, 128, 128), image.Rect(0, 0, 1024, 1024)
+
+	SetDefaultWorkers(WorkersDefault)
+	if workers := engine.workerCount(large); workers != 8 {
+		t.Errorf("got %d workers by default, expected GOMAXPROCS", workers)
+	}
+
+	SetDefaultWorkers(WorkersAuto)
+	if workers := engine.workerCount(thumbnail); workers != 1 {
+		t.Errorf("got %d workers for a thumbnail in auto mode", workers)
+	}
+
+	if workers := engine.workerCount(large); workers != 8 {
+		t.Errorf("got %d workers for a large image in auto mode", workers)
+	}
+
+	engine.SetWorkers(3)
+	if workers := engine.workerCount(large); workers != 3 {
+		t.Errorf("got %d workers, expected the Engine's own amount", workers)
+	}
+
+	d.SingleThreaded = true
+	if workers := engine.workerCount(large); workers != 1 {
+		t.Errorf("got %d workers with SingleThreaded set", workers)
+	}
+
+	if err := engine.SetWorkers(-2); err == nil {
+		t.Error("negative amount of workers was accepted")
+	}
+}
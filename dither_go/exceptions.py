@@ -7,3 +7,7 @@ class DitherGoError(Exception):
 
 class InvalidColorError(DitherGoError):
     """ Raised when there is an error during parsing/converting a color value. """
+
+
+class InvalidBufferError(DitherGoError):
+    """ Raised when provided binary data can't be passed to Go. """
@@ -5,6 +5,8 @@ package dither_go
 
 import (
 	"os"
+	"io"
+	"bytes"
 	"errors"
 )
 
@@ -18,6 +20,7 @@ import (
 	"golang.org/x/image/tiff"
 	_ "golang.org/x/image/webp"
 	"github.com/kolesa-team/go-webp/webp"
+	"github.com/tfuxu/dither-gopy"
 )
 
 // OpenImage opens image file and decodes its contents
@@ -37,14 +40,76 @@ func OpenImage(path string) (image.Image, error) {
 	return img, nil
 }
 
+// OpenImageBuffer decodes image data stored in memory block of provided
+// size, starting at the provided address, using image.Decode function.
+//
+// The data isn't copied before decoding, so the memory block must stay
+// valid and unchanged until the function returns.
+func OpenImageBuffer(address uintptr, size int) (image.Image, error) {
+	data, err := bytesFromAddress(address, size)
+	if err != nil {
+		return nil, err
+	}
+
+	img, _, err := image.Decode(bytes.NewReader(data))
+	if err != nil {
+		return nil, err
+	}
+
+	return img, nil
+}
+
 // SaveImage saves provided image data in specified output path and
 // encodes it to the supported format.
 func SaveImage(img_data image.Image, output_path string, encode_format string) error {
+	return SaveImageWithDitherer(img_data, output_path, encode_format, nil)
+}
+
+// SaveImageWithDitherer works like SaveImage, but uses provided Ditherer
+// to reduce colors of images encoded to formats with a limited palette (GIF).
+//
+// The Ditherer should only be provided for images that aren't dithered yet.
+func SaveImageWithDitherer(img_data image.Image, output_path string, encode_format string, d *dither.Ditherer) error {
 	writer, err := os.Create(output_path)
 	if err != nil {
 		return err
 	}
 
+	if encode_err := encodeImage(writer, img_data, encode_format, d); encode_err != nil {
+		writer.Close()
+		return encode_err
+	}
+
+	if err := writer.Close(); err != nil {
+		return err
+	}
+
+	return nil
+}
+
+// EncodeImage encodes provided image data to the supported format
+// and returns it as an in-memory buffer.
+func EncodeImage(img_data image.Image, encode_format string) (*Buffer, error) {
+	return EncodeImageWithDitherer(img_data, encode_format, nil)
+}
+
+// EncodeImageWithDitherer works like EncodeImage, but uses provided Ditherer
+// to reduce colors of images encoded to formats with a limited palette (GIF).
+//
+// The Ditherer should only be provided for images that aren't dithered yet.
+func EncodeImageWithDitherer(img_data image.Image, encode_format string, d *dither.Ditherer) (*Buffer, error) {
+	var writer bytes.Buffer
+
+	if err := encodeImage(&writer, img_data, encode_format, d); err != nil {
+		return nil, err
+	}
+
+	return &Buffer{data: writer.Bytes()}, nil
+}
+
+// encodeImage encodes provided image data to the supported format
+// and writes it to the writer.
+func encodeImage(writer io.Writer, img_data image.Image, encode_format string, d *dither.Ditherer) error {
 	var encode_err error
 
 	// TODO: Inmplement customization of output quality, lossless mode and other format-specific options in future
@@ -56,7 +121,7 @@ func SaveImage(img_data image.Image, output_path string, encode_format string) e
 	case "bmp":
 		encode_err = bmp.Encode(writer, img_data)
 	case "gif":
-		encode_err = gif.Encode(writer, img_data, nil)
+		encode_err = encodeGIF(writer, img_data, d)
 	case "jxl":
 		encode_err = errors.New("JXL format is currently unsupported")
 	case "webp":
@@ -73,16 +138,87 @@ func SaveImage(img_data image.Image, output_path string, encode_format string) e
 		encode_err = errors.New("unknown format name provided")
 	}
 
-	if encode_err != nil {
-		writer.Close()
-		return encode_err
+	return encode_err
+}
+
+// encodeGIF encodes provided image data to GIF, avoiding the second
+// quantization pass gif.Encode does with its own palette and drawer.
+//
+// Paletted images (eg. from Ditherer.DitherPaletted) are encoded as they are.
+// If a Ditherer is provided, it's used as the quantizer and drawer. Otherwise,
+// images with up to 256 colors (eg. from Ditherer.Dither) are encoded with
+// exactly the colors they use, and only the others are quantized by gif.Encode.
+func encodeGIF(writer io.Writer, img_data image.Image, d *dither.Ditherer) error {
+	if paletted, ok := img_data.(*image.Paletted); ok && len(paletted.Palette) <= 256 {
+		return gif.Encode(writer, paletted, nil)
 	}
 
-	if err := writer.Close(); err != nil {
-		return err
+	if d != nil {
+		palette := d.GetPalette()
+		if len(palette) > 256 {
+			return errors.New("palette has more than 256 colors")
+		}
+
+		return gif.Encode(writer, img_data, &gif.Options{NumColors: len(palette), Quantizer: d, Drawer: d})
 	}
 
-	return nil
+	if paletted := palettedFromColors(img_data); paletted != nil {
+		return gif.Encode(writer, paletted, nil)
+	}
+
+	return gif.Encode(writer, img_data, nil)
+}
+
+// palettedFromColors converts provided image to *image.Paletted with
+// a palette made of exactly the colors used in the image, or returns nil
+// if the image uses more than 256 colors.
+func palettedFromColors(img_data image.Image) *image.Paletted {
+	bounds := img_data.Bounds()
+
+	var palette color.Palette
+	indexes := make(map[color.RGBA]uint8)
+	paletted := image.NewPaletted(bounds, nil)
+
+	rgba, _ := img_data.(*image.RGBA)
+
+	// Dithered images have long runs of the same color, so remember the last one
+	var last color.RGBA
+	var last_index uint8
+	has_last := false
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			var c color.RGBA
+			if rgba != nil {
+				c = rgba.RGBAAt(x, y)
+			} else {
+				c = color.RGBAModel.Convert(img_data.At(x, y)).(color.RGBA)
+			}
+
+			if has_last && c == last {
+				paletted.SetColorIndex(x, y, last_index)
+				continue
+			}
+
+			index, ok := indexes[c]
+			if !ok {
+				if len(palette) == 256 {
+					return nil
+				}
+
+				index = uint8(len(palette))
+				indexes[c] = index
+				palette = append(palette, c)
+			}
+
+			last, last_index, has_last = c, index, true
+			paletted.SetColorIndex(x, y, index)
+		}
+	}
+
+	paletted.Palette = palette
+
+	return paletted
 }
 
 // CreateRGBA creates new color.RGBA structure with
@@ -105,3 +241,26 @@ func CreatePalette(colors ...color.Color) []color.Color {
 
 	return palette
 }
+
+// CreatePaletteFromBuffer creates a palette slice of color.RGBA structures
+// from a buffer of 8-bit RGBA quads in a single call.
+//
+// The buffer is read from provided memory address and is copied, so it can
+// be freed right after this function returns.
+func CreatePaletteFromBuffer(address uintptr, size int) ([]color.Color, error) {
+	data, err := bytesFromAddress(address, size)
+	if err != nil {
+		return nil, err
+	}
+
+	if len(data) == 0 || len(data)%4 != 0 {
+		return nil, errors.New("palette buffer doesn't consist of RGBA colors")
+	}
+
+	palette := make([]color.Color, len(data)/4)
+	for i := range palette {
+		palette[i] = color.RGBA{data[i*4], data[i*4+1], data[i*4+2], data[i*4+3]}
+	}
+
+	return palette, nil
+}
@@ -0,0 +1,175 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"bytes"
+	"image"
+	"image/color"
+	"image/gif"
+	"image/png"
+	"math/rand"
+	"testing"
+	"unsafe"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// bytesAddress returns the address of the data, as passed from the Python side.
+// The caller must keep the data alive while the address is used.
+func bytesAddress(data []byte) uintptr {
+	return uintptr(unsafe.Pointer(&data[0]))
+}
+
+// sameImages reports whether both images have the same bounds and colors.
+func sameImages(img1 image.Image, img2 image.Image) bool {
+	bounds := img1.Bounds()
+	if bounds != img2.Bounds() {
+		return false
+	}
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			if color.NRGBA64Model.Convert(img1.At(x, y)) != color.NRGBA64Model.Convert(img2.At(x, y)) {
+				return false
+			}
+		}
+	}
+
+	return true
+}
+
+func TestOpenImageBuffer(t *testing.T) {
+	img := randomImage(rand.New(rand.NewSource(20)), 13, 7)
+
+	var encoded bytes.Buffer
+	if err := png.Encode(&encoded, img); err != nil {
+		t.Fatal(err)
+	}
+
+	data := encoded.Bytes()
+
+	decoded, err := OpenImageBuffer(bytesAddress(data), len(data))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if !sameImages(decoded, img) {
+		t.Fatal("decoded image differs from the encoded one")
+	}
+
+	garbage := []byte("not an image")
+	if _, err := OpenImageBuffer(bytesAddress(garbage), len(garbage)); err == nil {
+		t.Fatal("invalid image data is decoded")
+	}
+
+	if _, err := OpenImageBuffer(0, 0); err == nil {
+		t.Fatal("empty buffer is decoded")
+	}
+}
+
+func TestEncodeImage(t *testing.T) {
+	img := randomImage(rand.New(rand.NewSource(21)), 17, 9)
+
+	for _, format := range []string{"png", "jpeg"} {
+		buffer, err := EncodeImage(img, format)
+		if err != nil {
+			t.Fatalf("%s: %v", format, err)
+		}
+
+		decoded, name, err := image.Decode(bytes.NewReader(buffer.data))
+		if err != nil {
+			t.Fatalf("%s: %v", format, err)
+		}
+
+		if name != format {
+			t.Fatalf("%s: encoded as %s", format, name)
+		}
+
+		// JPEG is lossy, so only its size is checked
+		if format == "jpeg" && decoded.Bounds() != img.Bounds() || format != "jpeg" && !sameImages(decoded, img) {
+			t.Fatalf("%s: decoded image differs from the encoded one", format)
+		}
+	}
+
+	for _, format := range []string{"jxl", "unknown"} {
+		if _, err := EncodeImage(img, format); err == nil {
+			t.Fatalf("%s: unsupported format is encoded", format)
+		}
+	}
+}
+
+func TestEncodeGIF(t *testing.T) {
+	random := rand.New(rand.NewSource(24))
+
+	d := dither.NewDitherer(randomPalette(random, 16))
+	d.Matrix = dither.FloydSteinberg
+
+	img := randomImage(random, 19, 8)
+	paletted := d.DitherPaletted(img)
+
+	// Dithered images keep their colors, instead of being quantized again
+	for _, test := range []struct {
+		name     string
+		img      image.Image
+		ditherer *dither.Ditherer
+	}{
+		{"paletted", paletted, nil},
+		{"rgba", d.DitherCopy(img), nil},
+		{"ditherer", img, d},
+	} {
+		buffer, err := EncodeImageWithDitherer(test.img, "gif", test.ditherer)
+		if err != nil {
+			t.Fatalf("%s: %v", test.name, err)
+		}
+
+		decoded, err := gif.Decode(bytes.NewReader(buffer.data))
+		if err != nil {
+			t.Fatalf("%s: %v", test.name, err)
+		}
+
+		if !sameImages(decoded, paletted) {
+			t.Fatalf("%s: decoded image differs from the dithered one", test.name)
+		}
+	}
+
+	// Paletted images are encoded with their own palette and indexes
+	buffer, err := EncodeImage(paletted, "gif")
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	decoded, err := gif.Decode(bytes.NewReader(buffer.data))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if string(decoded.(*image.Paletted).Pix) != string(paletted.Pix) {
+		t.Fatal("paletted image indexes are changed")
+	}
+}
+
+func TestPalettedFromColors(t *testing.T) {
+	img := image.NewRGBA(image.Rect(0, 0, 16, 17))
+	for i := 0; i < 16*17; i++ {
+		img.SetRGBA(i%16, i/16, color.RGBA{uint8(i), uint8(255 - i), 0, 255})
+	}
+
+	// The last row repeats the first colors, so the image uses exactly 256 colors
+	paletted := palettedFromColors(img)
+	if paletted == nil || len(paletted.Palette) != 256 {
+		t.Fatal("image with 256 colors isn't converted")
+	}
+
+	if !sameImages(paletted, img) {
+		t.Fatal("converted image differs from the original one")
+	}
+
+	img.SetRGBA(15, 16, color.RGBA{0, 0, 255, 255})
+	if palettedFromColors(img) != nil {
+		t.Fatal("image with 257 colors is converted")
+	}
+}
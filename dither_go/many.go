@@ -0,0 +1,79 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"image"
+	"sync"
+)
+
+// DitherMany dithers copies of the same image with several ditherers (or Engines),
+// eg. one per palette of each target device, concurrently, in a single call.
+// The src image remains unchanged.
+//
+// The returned slice holds the images dithered by each ditherer, in the same
+// order. If paletted is true, they are *image.Paletted images, like the ones
+// returned by DitherPaletted, otherwise they are *image.RGBA.
+//
+// If more than one ditherer is an Engine, the image is converted to linear RGB
+// once (see PrepareImage), instead of once per Engine.
+//
+// If any of the ditherers fails (eg. because it's misconfigured), the others
+// still dither the image, and an error listing the failed ones is returned.
+func DitherMany(src image.Image, ditherers []ImageDitherer, paletted bool) ([]image.Image, error) {
+	engines := 0
+	for i, d := range ditherers {
+		if d == nil {
+			return nil, fmt.Errorf("ditherer %d: no Ditherer provided", i)
+		}
+
+		if _, ok := d.(*Engine); ok {
+			engines++
+		}
+	}
+
+	prepared := src
+	if _, ok := src.(*PreparedImage); !ok && engines > 1 {
+		prepared = PrepareImage(src)
+	}
+
+	images := make([]image.Image, len(ditherers))
+	errs := make([]error, len(ditherers))
+
+	var wg sync.WaitGroup
+	for i, d := range ditherers {
+		wg.Add(1)
+		go func(i int, d ImageDitherer) {
+			defer wg.Done()
+
+			// Panics raised by Ditherer (eg. when it's misconfigured) are returned as errors
+			defer func() {
+				if r := recover(); r != nil {
+					errs[i] = fmt.Errorf("ditherer %d: dithering failed: %v", i, r)
+				}
+			}()
+
+			input := src
+			if _, ok := d.(*Engine); ok {
+				input = prepared
+			}
+
+			if paletted {
+				images[i] = d.DitherPaletted(input)
+			} else {
+				images[i] = d.DitherCopy(input)
+			}
+		}(i, d)
+	}
+
+	wg.Wait()
+
+	if err := errors.Join(errs...); err != nil {
+		return nil, err
+	}
+
+	return images, nil
+}
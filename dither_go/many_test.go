@@ -0,0 +1,71 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"math/rand"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// panickingDitherer panics like a misconfigured Ditherer.
+type panickingDitherer struct {
+	ImageDitherer
+}
+
+func (panickingDitherer) DitherPaletted(image.Image) *image.Paletted {
+	panic("no Matrix or Mapper set")
+}
+
+func TestDitherMany(t *testing.T) {
+	random := rand.New(rand.NewSource(12))
+	img := randomImage(random, 67, 45)
+
+	var ditherers []ImageDitherer
+	var engines []*Engine
+
+	for i, size := range []int{2, 8, 16} {
+		d := dither.NewDitherer(randomPalette(random, size))
+		if i%2 == 0 {
+			d.Matrix = dither.JarvisJudiceNinke
+		} else {
+			SetSeededRandomRGB(d, uint64(i), -0.5, 0.5, -0.5, 0.5, -0.5, 0.5)
+		}
+
+		engine, err := NewEngine(d)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		engines = append(engines, engine)
+		ditherers = append(ditherers, engine)
+	}
+
+	outputs, err := DitherMany(img, ditherers, true)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if len(outputs) != len(ditherers) {
+		t.Fatalf("got %d images for %d ditherers", len(outputs), len(ditherers))
+	}
+
+	for i, engine := range engines {
+		if string(outputs[i].(*image.Paletted).Pix) != string(engine.DitherPaletted(img).Pix) {
+			t.Fatalf("output of ditherer %d differs", i)
+		}
+	}
+
+	if _, err := DitherMany(img, append(ditherers, panickingDitherer{}), true); err == nil {
+		t.Fatal("panic of a ditherer wasn't returned as an error")
+	}
+
+	if _, err := DitherMany(img, []ImageDitherer{nil}, false); err == nil {
+		t.Fatal("nil ditherer was accepted")
+	}
+}
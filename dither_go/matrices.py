@@ -1,80 +1,146 @@
 # Copyright 2023, tfuxu <https://github.com/tfuxu>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from threading import Lock
+from typing import List
 
 from dither_go import ErrorDiffusionMatrix, OrderedDitherMatrix
 from dither_go.bindings import dither
 
+_lock = Lock()
+
+
+class _LazyMatrix:
+    """
+    A default factory of a matrix field, creating the matrix with a ``dither``
+    Golang function on first call, and returning the same matrix afterwards.
+    """
+
+    def __init__(self):
+        self.name = None
+        self.matrix = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __call__(self):
+        if self.matrix is None:
+            with _lock:
+                if self.matrix is None:
+                    self.matrix = getattr(dither, self.name)()
+
+        return self.matrix
+
+
+class _MatricesMeta(type):
+    """
+    Metaclass of matrix collections, creating a matrix when it's accessed
+    as an attribute of the collection class.
+    """
+
+    def __getattr__(cls, name):
+        matrix_field = cls.__dict__.get("__dataclass_fields__", {}).get(name)
+        if matrix_field is None:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+
+        return matrix_field.default_factory()
+
+
+class _Matrices(metaclass=_MatricesMeta):
+    """
+    Base class of matrix collections, whose matrices are created on first access.
+
+    Subclasses are frozen dataclasses, where each ``_LazyMatrix`` becomes
+    the default factory of a field. Creating an instance creates all matrices.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for name, value in list(cls.__dict__.items()):
+            if isinstance(value, _LazyMatrix):
+                setattr(cls, name, field(default_factory=value))
+
+    @classmethod
+    def names(cls) -> List[str]:
+        """
+        Returns names of the matrices in the collection, without creating them.
+
+        :rtype: List[str]
+        """
+
+        return [matrix_field.name for matrix_field in fields(cls)]
+
 
 @dataclass(frozen=True)
-class ErrorDiffusers:  # pylint: disable=R0902,C0103
+class ErrorDiffusers(_Matrices):  # pylint: disable=R0902,C0103
     """
     Error diffusion matrices
     """
 
-    Simple2D: ErrorDiffusionMatrix = dither.Simple2D()
+    Simple2D: ErrorDiffusionMatrix = _LazyMatrix()
     """Simple 2D"""
 
-    FloydSteinberg: ErrorDiffusionMatrix = dither.FloydSteinberg()
+    FloydSteinberg: ErrorDiffusionMatrix = _LazyMatrix()
     """Floyd-Steinberg"""
 
-    FalseFloydSteinberg: ErrorDiffusionMatrix = dither.FalseFloydSteinberg()
+    FalseFloydSteinberg: ErrorDiffusionMatrix = _LazyMatrix()
     """False Floyd-Steinberg"""
 
-    Stucki: ErrorDiffusionMatrix = dither.Stucki()
+    Stucki: ErrorDiffusionMatrix = _LazyMatrix()
     """Stucki"""
 
-    Burkes: ErrorDiffusionMatrix = dither.Burkes()
+    Burkes: ErrorDiffusionMatrix = _LazyMatrix()
     """Burkes"""
 
-    Atkinson: ErrorDiffusionMatrix = dither.Atkinson()
+    Atkinson: ErrorDiffusionMatrix = _LazyMatrix()
     """Atkinson"""
 
-    JarvisJudiceNinke: ErrorDiffusionMatrix = dither.JarvisJudiceNinke()
+    JarvisJudiceNinke: ErrorDiffusionMatrix = _LazyMatrix()
     """Jarvis, Judice & Ninke"""
 
-    Sierra: ErrorDiffusionMatrix = dither.Sierra()
+    Sierra: ErrorDiffusionMatrix = _LazyMatrix()
     """Sierra"""
 
-    Sierra2: ErrorDiffusionMatrix = dither.Sierra2()
+    Sierra2: ErrorDiffusionMatrix = _LazyMatrix()
     """
     Sierra2
 
     Sierra2 is another name for Two-Row Sierra.
     """
 
-    Sierra2_4A: ErrorDiffusionMatrix = dither.Sierra2_4A()
+    Sierra2_4A: ErrorDiffusionMatrix = _LazyMatrix()
     """
     Sierra2-4A
 
     Sierra2_4A (usually written as Sierra2-4A) is another name for Sierra Lite.
     """
 
-    Sierra3: ErrorDiffusionMatrix = dither.Sierra3()
+    Sierra3: ErrorDiffusionMatrix = _LazyMatrix()
     """
     Sierra3
 
     Sierra3 is another name for the original Sierra matrix.
     """
 
-    SierraLite: ErrorDiffusionMatrix = dither.SierraLite()
+    SierraLite: ErrorDiffusionMatrix = _LazyMatrix()
     """Sierra Lite"""
 
-    TwoRowSierra: ErrorDiffusionMatrix = dither.TwoRowSierra()
+    TwoRowSierra: ErrorDiffusionMatrix = _LazyMatrix()
     """Two-Row Sierra"""
 
-    StevenPigeon: ErrorDiffusionMatrix = dither.StevenPigeon()
+    StevenPigeon: ErrorDiffusionMatrix = _LazyMatrix()
     """Pigeon"""
 
 
 @dataclass(frozen=True)
-class OrderedDitherers:  # pylint: disable=R0902,C0103
+class OrderedDitherers(_Matrices):  # pylint: disable=R0902,C0103
     """
     Ordered dither matrices
     """
 
-    ClusteredDot4x4: OrderedDitherMatrix = dither.ClusteredDot4x4()
+    ClusteredDot4x4: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot 4x4
 
@@ -82,7 +148,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It is not diagonal, so the dots form a grid.
     """
 
-    ClusteredDot6x6: OrderedDitherMatrix = dither.ClusteredDot6x6()
+    ClusteredDot6x6: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot 6x6
 
@@ -90,7 +156,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     Robert Ulichney. It can represent "37 levels of gray". It is not diagonal.
     """
 
-    ClusteredDot6x6_2: OrderedDitherMatrix = dither.ClusteredDot6x6_2()
+    ClusteredDot6x6_2: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot 6x6-2
 
@@ -100,7 +166,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It is nearly identical to Clustered-Dot 6x6.
     """
 
-    ClusteredDot6x6_3: OrderedDitherMatrix = dither.ClusteredDot6x6_3()
+    ClusteredDot6x6_3: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot 6x6-3
 
@@ -110,7 +176,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It is nearly identical to Clustered-Dot 6x6.
     """
 
-    ClusteredDot8x8: OrderedDitherMatrix = dither.ClusteredDot8x8()
+    ClusteredDot8x8: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot 8x8
 
@@ -119,7 +185,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It is like Clustered-Dot Diagonal 8x8, but is not diagonal. It can represent "65 gray-levels".
     """
 
-    ClusteredDotDiagonal6x6: OrderedDitherMatrix = dither.ClusteredDotDiagonal6x6()
+    ClusteredDotDiagonal6x6: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Diagonal 6x6
 
@@ -130,7 +196,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     "Diagonal" because the resulting dot pattern is at a 45 degree angle.
     """
 
-    ClusteredDotDiagonal8x8: OrderedDitherMatrix = dither.ClusteredDotDiagonal8x8()
+    ClusteredDotDiagonal8x8: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Diagonal 8x8
 
@@ -139,7 +205,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     "Diagonal" because the resulting dot pattern is at a 45 degree angle.
     """
 
-    ClusteredDotDiagonal8x8_2: OrderedDitherMatrix = dither.ClusteredDotDiagonal8x8_2()
+    ClusteredDotDiagonal8x8_2: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Diagonal 8x8-2
 
@@ -153,7 +219,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     represent fewer gray levels. There is not much point in using it.
     """
 
-    ClusteredDotDiagonal8x8_3: OrderedDitherMatrix = dither.ClusteredDotDiagonal8x8_3()
+    ClusteredDotDiagonal8x8_3: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Diagonal 8x8-3
 
@@ -166,7 +232,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It is called "Diagonal" because the resulting dot pattern is at a 45 degree angle.
     """
 
-    ClusteredDotDiagonal16x16: OrderedDitherMatrix = dither.ClusteredDotDiagonal16x16()
+    ClusteredDotDiagonal16x16: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Diagonal 16x16
 
@@ -177,14 +243,14 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     "Diagonal" because the resulting dot pattern is at a 45 degree angle.
     """
 
-    Horizontal3x5: OrderedDitherMatrix = dither.Horizontal3x5()
+    Horizontal3x5: OrderedDitherMatrix = _LazyMatrix()
     """
     Horizontal 3x5
 
     Horizontal 3x5 is a custom rotated version of Vertical 5x3.
     """
 
-    Vertical5x3: OrderedDitherMatrix = dither.Vertical5x3()
+    Vertical5x3: OrderedDitherMatrix = _LazyMatrix()
     """
     Vertical 5x3
 
@@ -192,7 +258,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     They say it "creates artistic vertical line artifacts".
     """
 
-    ClusteredDotSpiral5x5: OrderedDitherMatrix = dither.ClusteredDotSpiral5x5()
+    ClusteredDotSpiral5x5: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Spiral 5x5
 
@@ -203,7 +269,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     matrices, the dark parts grow to fill the area.
     """
 
-    ClusteredDotHorizontalLine: OrderedDitherMatrix = dither.ClusteredDotHorizontalLine()
+    ClusteredDotHorizontalLine: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Horizontal Line
 
@@ -213,7 +279,7 @@ class OrderedDitherers:  # pylint: disable=R0902,C0103
     It "clusters pixels about horizontal lines".
     """
 
-    ClusteredDotVerticalLine: OrderedDitherMatrix = dither.ClusteredDotVerticalLine()
+    ClusteredDotVerticalLine: OrderedDitherMatrix = _LazyMatrix()
     """
     Clustered-Dot Vertical Line
 
@@ -0,0 +1,57 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// SetSeededRandomGrayscale sets random noise dithering in grayscale, like
+// Ditherer.SetRandomGrayscale, but with noise generated from the seed and
+// the coordinates of each pixel, instead of a shared random number generator.
+//
+// The same seed always gives the same output, no matter in which order the
+// pixels are processed, so SingleThreaded doesn't have to be set to get
+// reproducible images.
+func SetSeededRandomGrayscale(d *dither.Ditherer, seed uint64, min float32, max float32) {
+	d.Mapper = dither.PixelMapper(func(x, y int, r, g, b uint16) (uint16, uint16, uint16) {
+		noise := 65535 * (min + pixelNoise(seed, x, y, 0)*(max-min))
+
+		return dither.RoundClamp(float32(r) + noise),
+			dither.RoundClamp(float32(g) + noise),
+			dither.RoundClamp(float32(b) + noise)
+	})
+}
+
+// SetSeededRandomRGB sets random noise dithering in RGB, like Ditherer.SetRandomRGB,
+// but with noise generated from the seed and the coordinates of each pixel.
+// See SetSeededRandomGrayscale for details.
+func SetSeededRandomRGB(d *dither.Ditherer, seed uint64, minR, maxR, minG, maxG, minB, maxB float32) {
+	d.Mapper = dither.PixelMapper(func(x, y int, r, g, b uint16) (uint16, uint16, uint16) {
+		return dither.RoundClamp(float32(r) + 65535*(minR+pixelNoise(seed, x, y, 0)*(maxR-minR))),
+			dither.RoundClamp(float32(g) + 65535*(minG+pixelNoise(seed, x, y, 1)*(maxG-minG))),
+			dither.RoundClamp(float32(b) + 65535*(minB+pixelNoise(seed, x, y, 2)*(maxB-minB)))
+	})
+}
+
+// pixelNoise returns a pseudo-random number in [0, 1) for the channel of
+// the pixel. It's a counter-based generator: the seed, coordinates and
+// channel are hashed together, so it has no state to share between goroutines.
+func pixelNoise(seed uint64, x int, y int, channel uint64) float32 {
+	counter := uint64(uint32(x)) | uint64(uint32(y))<<32
+
+	h := mix64(seed ^ mix64(counter+channel*0x9e3779b97f4a7c15))
+
+	// The top 24 bits fill the mantissa of float32 exactly
+	return float32(h>>40) / (1 << 24)
+}
+
+// mix64 is the finalizer of the SplitMix64 generator, which turns similar
+// numbers into unrelated ones.
+func mix64(z uint64) uint64 {
+	z = (z ^ z>>30) * 0xbf58476d1ce4e5b9
+	z = (z ^ z>>27) * 0x94d049bb133111eb
+
+	return z ^ z>>31
+}
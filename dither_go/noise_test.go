@@ -0,0 +1,73 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"math/rand"
+	"runtime"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestPixelNoise(t *testing.T) {
+	var sum float64
+	var buckets [16]int
+
+	for y := 0; y < 256; y++ {
+		for x := 0; x < 256; x++ {
+			v := pixelNoise(1, x, y, 0)
+			if v < 0 || v >= 1 {
+				t.Fatalf("noise %f is out of range", v)
+			}
+
+			sum += float64(v)
+			buckets[int(v*16)]++
+		}
+	}
+
+	if mean := sum / (256 * 256); mean < 0.49 || mean > 0.51 {
+		t.Errorf("mean of noise is %f", mean)
+	}
+
+	for i, count := range buckets {
+		if count < 256*256/16*9/10 || count > 256*256/16*11/10 {
+			t.Errorf("bucket %d has %d values", i, count)
+		}
+	}
+
+	if pixelNoise(1, 3, 4, 0) == pixelNoise(2, 3, 4, 0) || pixelNoise(1, 3, 4, 0) == pixelNoise(1, 3, 4, 1) {
+		t.Error("noise doesn't depend on the seed or channel")
+	}
+}
+
+func TestSeededNoiseIsReproducible(t *testing.T) {
+	defer runtime.GOMAXPROCS(runtime.GOMAXPROCS(4))
+
+	random := rand.New(rand.NewSource(8))
+	img := randomImage(random, 61, 97)
+
+	d := dither.NewDitherer(randomPalette(random, 8))
+	engine, err := NewEngine(d)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	SetSeededRandomRGB(d, 42, -0.5, 0.5, -0.5, 0.5, -0.5, 0.5)
+
+	d.SingleThreaded = true
+	expected := engine.DitherCopy(img)
+
+	d.SingleThreaded = false
+	if string(engine.DitherCopy(img).Pix) != string(expected.Pix) {
+		t.Fatal("output of concurrent workers differs from the single-threaded one")
+	}
+
+	SetSeededRandomRGB(d, 43, -0.5, 0.5, -0.5, 0.5, -0.5, 0.5)
+	if string(engine.DitherCopy(img).Pix) == string(expected.Pix) {
+		t.Fatal("output doesn't depend on the seed")
+	}
+}
@@ -0,0 +1,506 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"image"
+	"image/color"
+	"runtime"
+	"sort"
+	"sync"
+)
+
+// Methods of generating palettes, used by GeneratePalette.
+const (
+	// PaletteMedianCut splits the colors of the image into boxes of similar colors,
+	// always cutting the box with the widest range of a channel in half.
+	PaletteMedianCut = "median_cut"
+
+	// PaletteKMeans refines the median cut palette with k-means clustering.
+	PaletteKMeans = "kmeans"
+
+	// PaletteOctree builds an octree of the colors of the image and merges
+	// its least used leaves.
+	PaletteOctree = "octree"
+)
+
+const (
+	// histogramBits is the amount of most significant bits of each channel
+	// used to group similar colors of the image.
+	histogramBits = 5
+
+	histogramShift = 8 - histogramBits
+
+	// kmeansIterations is the maximum amount of k-means iterations.
+	kmeansIterations = 16
+)
+
+// colorBin is a group of similar colors of the image.
+type colorBin struct {
+	sum   [3]uint64
+	count uint64
+}
+
+// weightedColor is an average color of a group of pixels.
+type weightedColor struct {
+	color [3]uint8
+	count uint64
+}
+
+// GeneratePalette generates a palette of at most size colors, representing
+// the colors of provided image, for use in NewDitherer.
+//
+// The image is first reduced to a histogram of similar colors, built
+// concurrently by all available CPUs. If sample is a positive number, at most
+// that many pixels, spread evenly across the image, are read. Fully transparent
+// pixels are skipped. Palettes can have fewer colors than requested, if the
+// image doesn't have enough distinct colors.
+func GeneratePalette(img_data image.Image, size int, method string, sample int) ([]color.Color, error) {
+	if img_data == nil {
+		return nil, errors.New("no image provided")
+	}
+
+	if size <= 0 {
+		return nil, errors.New("palette size must be a positive number")
+	}
+
+	switch method {
+	case PaletteMedianCut, PaletteKMeans, PaletteOctree:
+	default:
+		return nil, fmt.Errorf("unknown palette generation method: %s", method)
+	}
+
+	colors := colorHistogram(img_data, sample)
+	if len(colors) == 0 {
+		return nil, errors.New("image has no opaque pixels")
+	}
+
+	var palette [][3]uint8
+	switch method {
+	case PaletteMedianCut:
+		palette = medianCut(colors, size)
+	case PaletteKMeans:
+		palette = kMeans(colors, medianCut(colors, size))
+	case PaletteOctree:
+		palette = octreePalette(colors, size)
+	}
+
+	result := make([]color.Color, 0, len(palette))
+	seen := make(map[[3]uint8]bool, len(palette))
+
+	for _, c := range palette {
+		if seen[c] {
+			continue
+		}
+
+		seen[c] = true
+		result = append(result, color.RGBA{c[0], c[1], c[2], 255})
+	}
+
+	return result, nil
+}
+
+// colorHistogram groups the colors of the image and returns their average colors.
+func colorHistogram(img_data image.Image, sample int) []weightedColor {
+	bounds := img_data.Bounds()
+	width := bounds.Dx()
+	total := width * bounds.Dy()
+
+	if total == 0 {
+		return nil
+	}
+
+	step := 1
+	if sample > 0 && sample < total {
+		step = (total + sample - 1) / sample
+	}
+
+	count := (total + step - 1) / step
+
+	workers := runtime.GOMAXPROCS(0)
+	chunk := (count + workers - 1) / workers
+
+	histograms := make([][]colorBin, 0, workers)
+	var mutex sync.Mutex
+	var wg sync.WaitGroup
+
+	for start := 0; start < count; start += chunk {
+		end := start + chunk
+		if end > count {
+			end = count
+		}
+
+		wg.Add(1)
+		go func(start int, end int) {
+			defer wg.Done()
+
+			bins := make([]colorBin, 1<<(3*histogramBits))
+
+			for i := start; i < end; i++ {
+				// Pick a pseudo-random pixel of each step, so that sampled pixels
+				// don't line up in columns when the width is a multiple of the step
+				pixel := i*step + int(uint32(i)*2654435761%uint32(step))
+				if pixel >= total {
+					pixel = i * step
+				}
+
+				r, g, b, a := nrgbaAt(img_data, bounds.Min.X+pixel%width, bounds.Min.Y+pixel/width)
+				if a == 0 {
+					continue
+				}
+
+				bin := &bins[int(r>>histogramShift)<<(2*histogramBits)|int(g>>histogramShift)<<histogramBits|int(b>>histogramShift)]
+				bin.sum[0] += uint64(r)
+				bin.sum[1] += uint64(g)
+				bin.sum[2] += uint64(b)
+				bin.count++
+			}
+
+			mutex.Lock()
+			histograms = append(histograms, bins)
+			mutex.Unlock()
+		}(start, end)
+	}
+
+	wg.Wait()
+
+	var colors []weightedColor
+	for i := 0; i < 1<<(3*histogramBits); i++ {
+		var bin colorBin
+		for _, bins := range histograms {
+			bin.sum[0] += bins[i].sum[0]
+			bin.sum[1] += bins[i].sum[1]
+			bin.sum[2] += bins[i].sum[2]
+			bin.count += bins[i].count
+		}
+
+		if bin.count == 0 {
+			continue
+		}
+
+		colors = append(colors, weightedColor{
+			color: [3]uint8{averageChannel(bin.sum[0], bin.count), averageChannel(bin.sum[1], bin.count), averageChannel(bin.sum[2], bin.count)},
+			count: bin.count,
+		})
+	}
+
+	return colors
+}
+
+// nrgbaAt returns unpremultiplied 8-bit channels of the image pixel.
+func nrgbaAt(img_data image.Image, x int, y int) (uint8, uint8, uint8, uint8) {
+	switch img := img_data.(type) {
+	case *image.NRGBA:
+		c := img.NRGBAAt(x, y)
+		return c.R, c.G, c.B, c.A
+	case *image.RGBA:
+		c := img.RGBAAt(x, y)
+		if c.A == 255 || c.A == 0 {
+			return c.R, c.G, c.B, c.A
+		}
+	case *image.YCbCr:
+		c := img.YCbCrAt(x, y)
+		r, g, b := color.YCbCrToRGB(c.Y, c.Cb, c.Cr)
+		return r, g, b, 255
+	}
+
+	c := color.NRGBAModel.Convert(img_data.At(x, y)).(color.NRGBA)
+	return c.R, c.G, c.B, c.A
+}
+
+// averageChannel returns the rounded average of channel values.
+func averageChannel(sum uint64, count uint64) uint8 {
+	return uint8((sum + count/2) / count)
+}
+
+// averageColor returns the average color of weighted colors.
+func averageColor(colors []weightedColor) [3]uint8 {
+	var sum [3]uint64
+	var count uint64
+
+	for _, c := range colors {
+		sum[0] += uint64(c.color[0]) * c.count
+		sum[1] += uint64(c.color[1]) * c.count
+		sum[2] += uint64(c.color[2]) * c.count
+		count += c.count
+	}
+
+	return [3]uint8{averageChannel(sum[0], count), averageChannel(sum[1], count), averageChannel(sum[2], count)}
+}
+
+// medianCut splits the colors into at most size boxes and returns their average colors.
+func medianCut(colors []weightedColor, size int) [][3]uint8 {
+	boxes := [][]weightedColor{append([]weightedColor(nil), colors...)}
+
+	for len(boxes) < size {
+		// Cut the box with the widest range of a channel
+		widest, channel, width := -1, 0, 0
+		for i, box := range boxes {
+			if len(box) < 2 {
+				continue
+			}
+
+			c, w := widestChannel(box)
+			if w > width {
+				widest, channel, width = i, c, w
+			}
+		}
+
+		if widest < 0 {
+			break
+		}
+
+		box := boxes[widest]
+		sort.Slice(box, func(i, j int) bool {
+			return box[i].color[channel] < box[j].color[channel]
+		})
+
+		var total uint64
+		for _, c := range box {
+			total += c.count
+		}
+
+		// Cut at the median pixel, keeping at least one color in each half
+		cut, half := 1, uint64(0)
+		for cut < len(box)-1 {
+			half += box[cut-1].count
+			if half*2 >= total {
+				break
+			}
+
+			cut++
+		}
+
+		boxes[widest] = box[:cut]
+		boxes = append(boxes, box[cut:])
+	}
+
+	palette := make([][3]uint8, len(boxes))
+	for i, box := range boxes {
+		palette[i] = averageColor(box)
+	}
+
+	return palette
+}
+
+// widestChannel returns the channel with the widest range of values in the box.
+func widestChannel(box []weightedColor) (int, int) {
+	channel, width := 0, -1
+
+	for c := 0; c < 3; c++ {
+		least, most := 255, 0
+		for _, wc := range box {
+			if int(wc.color[c]) < least {
+				least = int(wc.color[c])
+			}
+
+			if int(wc.color[c]) > most {
+				most = int(wc.color[c])
+			}
+		}
+
+		if most-least > width {
+			channel, width = c, most-least
+		}
+	}
+
+	return channel, width
+}
+
+// kMeans refines the palette with k-means clustering of the colors. Colors are
+// assigned to the closest palette colors concurrently by all available CPUs.
+func kMeans(colors []weightedColor, palette [][3]uint8) [][3]uint8 {
+	workers := runtime.GOMAXPROCS(0)
+	chunk := (len(colors) + workers - 1) / workers
+
+	assigned := make([]int, len(colors))
+	for i := range assigned {
+		assigned[i] = -1
+	}
+
+	for iteration := 0; iteration < kmeansIterations; iteration++ {
+		changed := make([]bool, workers)
+
+		var wg sync.WaitGroup
+		for worker := 0; worker*chunk < len(colors); worker++ {
+			wg.Add(1)
+			go func(worker int) {
+				defer wg.Done()
+
+				end := (worker + 1) * chunk
+				if end > len(colors) {
+					end = len(colors)
+				}
+
+				for i := worker * chunk; i < end; i++ {
+					closest := closestColor(palette, colors[i].color)
+					if closest != assigned[i] {
+						assigned[i] = closest
+						changed[worker] = true
+					}
+				}
+			}(worker)
+		}
+
+		wg.Wait()
+
+		converged := true
+		for _, c := range changed {
+			if c {
+				converged = false
+			}
+		}
+
+		if converged {
+			break
+		}
+
+		sums := make([][4]uint64, len(palette))
+		for i, c := range colors {
+			sum := &sums[assigned[i]]
+			sum[0] += uint64(c.color[0]) * c.count
+			sum[1] += uint64(c.color[1]) * c.count
+			sum[2] += uint64(c.color[2]) * c.count
+			sum[3] += c.count
+		}
+
+		for i, sum := range sums {
+			// Clusters without any colors keep their previous color
+			if sum[3] == 0 {
+				continue
+			}
+
+			palette[i] = [3]uint8{averageChannel(sum[0], sum[3]), averageChannel(sum[1], sum[3]), averageChannel(sum[2], sum[3])}
+		}
+	}
+
+	return palette
+}
+
+// closestColor returns the index of the palette color closest to provided
+// color, using squared Euclidean distance.
+func closestColor(palette [][3]uint8, c [3]uint8) int {
+	index, best := 0, -1
+
+	for i, p := range palette {
+		dr, dg, db := int(c[0])-int(p[0]), int(c[1])-int(p[1]), int(c[2])-int(p[2])
+
+		dist := dr*dr + dg*dg + db*db
+		if best < 0 || dist < best {
+			index, best = i, dist
+		}
+	}
+
+	return index
+}
+
+// octreeNode is a node of the color octree. Leaves hold the sum of colors
+// inserted into them.
+type octreeNode struct {
+	children [8]*octreeNode
+	sum      [3]uint64
+	count    uint64
+	leaf     bool
+}
+
+// octreePalette inserts the colors into an octree and merges its least used
+// leaves, until there are at most size of them.
+func octreePalette(colors []weightedColor, size int) [][3]uint8 {
+	const depth = 8
+
+	root := &octreeNode{}
+	// Nodes with children, by their level
+	var levels [depth][]*octreeNode
+	leaves := 0
+
+	for _, c := range colors {
+		node := root
+
+		for level := 0; level < depth; level++ {
+			node.count += c.count
+
+			shift := 7 - level
+			index := int(c.color[0]>>shift&1)<<2 | int(c.color[1]>>shift&1)<<1 | int(c.color[2]>>shift&1)
+
+			if node.children[index] == nil {
+				if !hasChildren(node) {
+					levels[level] = append(levels[level], node)
+				}
+
+				node.children[index] = &octreeNode{}
+				if level == depth-1 {
+					node.children[index].leaf = true
+					leaves++
+				}
+			}
+
+			node = node.children[index]
+		}
+
+		node.sum[0] += uint64(c.color[0]) * c.count
+		node.sum[1] += uint64(c.color[1]) * c.count
+		node.sum[2] += uint64(c.color[2]) * c.count
+		node.count += c.count
+	}
+
+	// Merge the children of the least used nodes of the deepest level first
+	for level := depth - 1; level >= 0 && leaves > size; level-- {
+		nodes := levels[level]
+		sort.SliceStable(nodes, func(i, j int) bool {
+			return nodes[i].count < nodes[j].count
+		})
+
+		for _, node := range nodes {
+			if leaves <= size {
+				break
+			}
+
+			for i, child := range node.children {
+				if child == nil {
+					continue
+				}
+
+				node.sum[0] += child.sum[0]
+				node.sum[1] += child.sum[1]
+				node.sum[2] += child.sum[2]
+				node.children[i] = nil
+				leaves--
+			}
+
+			node.leaf = true
+			leaves++
+		}
+	}
+
+	var palette [][3]uint8
+	var collect func(node *octreeNode)
+	collect = func(node *octreeNode) {
+		if node.leaf {
+			palette = append(palette, [3]uint8{averageChannel(node.sum[0], node.count), averageChannel(node.sum[1], node.count), averageChannel(node.sum[2], node.count)})
+			return
+		}
+
+		for _, child := range node.children {
+			if child != nil {
+				collect(child)
+			}
+		}
+	}
+	collect(root)
+
+	return palette
+}
+
+// hasChildren reports whether the octree node has any children.
+func hasChildren(node *octreeNode) bool {
+	for _, child := range node.children {
+		if child != nil {
+			return true
+		}
+	}
+
+	return false
+}
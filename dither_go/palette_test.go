@@ -0,0 +1,71 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"image/color"
+	"math/rand"
+	"testing"
+)
+
+func TestGeneratePalette(t *testing.T) {
+	random := rand.New(rand.NewSource(5))
+
+	// An image made of four flat colors, with a bit of noise
+	base := []color.NRGBA{{200, 24, 24, 255}, {24, 200, 24, 255}, {24, 24, 200, 255}, {240, 240, 240, 255}}
+
+	img := image.NewNRGBA(image.Rect(0, 0, 64, 64))
+	for y := 0; y < 64; y++ {
+		for x := 0; x < 64; x++ {
+			c := base[(y/32)*2+x/32]
+			c.R += uint8(random.Intn(3))
+			img.SetNRGBA(x, y, c)
+		}
+	}
+
+	for _, method := range []string{PaletteMedianCut, PaletteKMeans, PaletteOctree} {
+		for _, sample := range []int{0, 500} {
+			palette, err := GeneratePalette(img, 4, method, sample)
+			if err != nil {
+				t.Fatal(err)
+			}
+
+			if len(palette) != 4 {
+				t.Fatalf("%s: got %d colors, want 4", method, len(palette))
+			}
+
+			// Each of the base colors has a close palette color
+			for _, want := range base {
+				found := false
+				for _, c := range palette {
+					got := c.(color.RGBA)
+					if absDiff(got.R, want.R) <= 8 && absDiff(got.G, want.G) <= 8 && absDiff(got.B, want.B) <= 8 {
+						found = true
+					}
+				}
+
+				if !found {
+					t.Fatalf("%s (sample %d): no palette color close to %v in %v", method, sample, want, palette)
+				}
+			}
+		}
+	}
+
+	if palette, _ := GeneratePalette(img, 256, PaletteMedianCut, 0); len(palette) > 256 {
+		t.Fatalf("got %d colors, want at most 256", len(palette))
+	}
+
+	if _, err := GeneratePalette(img, 4, "popularity", 0); err == nil {
+		t.Fatal("unknown method didn't return an error")
+	}
+}
+
+func absDiff(a uint8, b uint8) uint8 {
+	if a > b {
+		return a - b
+	}
+
+	return b - a
+}
@@ -0,0 +1,217 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"image"
+	"image/color"
+	"image/draw"
+)
+
+// PixelBuffer exposes the pixel plane of an image stored in Go memory.
+//
+// Rows of pixels are Stride bytes apart, with Channels bytes per pixel.
+// Mode holds a name of the pixel format in terms used by Pillow:
+//   - "L": 8-bit grayscale,
+//   - "P": 8-bit indexes into the image palette,
+//   - "RGBA": 8-bit RGBA,
+//   - "RGBa": 8-bit RGBA with premultiplied alpha.
+type PixelBuffer struct {
+	Width    int
+	Height   int
+	Stride   int
+	Channels int
+	Mode     string
+	buffer   *Buffer
+}
+
+// Buffer returns the buffer holding the pixel data.
+func (p *PixelBuffer) Buffer() *Buffer {
+	return p.buffer
+}
+
+// ImageFromBuffer creates an image of provided dimensions from raw 8-bit pixel
+// data stored in memory block starting at the provided address. Rows of
+// pixels are expected to be tightly packed, one after another.
+//
+// Depending on the number of channels, the following images are created:
+//   - 1: *image.Gray,
+//   - 3: *image.RGBA, with RGB channels copied and alpha set to opaque,
+//   - 4: *image.NRGBA, or *image.RGBA if the data has its alpha
+//     already premultiplied.
+//
+// Unless copy_data is set, grayscale and RGBA images share memory with the
+// buffer, so dithering them in place writes the result straight back to it.
+// In that case the memory must stay valid for as long as the image is used.
+func ImageFromBuffer(address uintptr, width int, height int, channels int, premultiplied bool, copy_data bool) (image.Image, error) {
+	if width <= 0 || height <= 0 {
+		return nil, errors.New("invalid image dimensions provided")
+	}
+
+	data, err := bytesFromAddress(address, width*height*channels)
+	if err != nil {
+		return nil, err
+	}
+
+	if copy_data && channels != 3 {
+		data = append([]byte(nil), data...)
+	}
+
+	rect := image.Rect(0, 0, width, height)
+
+	switch channels {
+	case 1:
+		return &image.Gray{Pix: data, Stride: width, Rect: rect}, nil
+	case 3:
+		img := image.NewRGBA(rect)
+		for i, j := 0, 0; i < len(data); i, j = i+3, j+4 {
+			img.Pix[j+0] = data[i+0]
+			img.Pix[j+1] = data[i+1]
+			img.Pix[j+2] = data[i+2]
+			img.Pix[j+3] = 0xff
+		}
+		return img, nil
+	case 4:
+		if premultiplied {
+			return &image.RGBA{Pix: data, Stride: width * 4, Rect: rect}, nil
+		}
+		return &image.NRGBA{Pix: data, Stride: width * 4, Rect: rect}, nil
+	default:
+		return nil, errors.New("unsupported number of color channels provided")
+	}
+}
+
+// PalettedImageFromBuffer creates an *image.Paletted image of provided
+// dimensions from 8-bit palette indexes stored in memory block starting
+// at the provided address, and a palette of packed 8-bit RGBA colors
+// (without premultiplied alpha) stored at the palette address.
+//
+// Both the indexes and the palette are copied into the created image.
+func PalettedImageFromBuffer(address uintptr, width int, height int, palette_address uintptr, palette_size int) (*image.Paletted, error) {
+	if width <= 0 || height <= 0 {
+		return nil, errors.New("invalid image dimensions provided")
+	}
+
+	data, err := bytesFromAddress(address, width*height)
+	if err != nil {
+		return nil, err
+	}
+
+	palette, err := paletteFromAddress(palette_address, palette_size)
+	if err != nil {
+		return nil, err
+	}
+
+	for _, index := range data {
+		if int(index) >= len(palette) {
+			return nil, errors.New("palette index out of range")
+		}
+	}
+
+	img := image.NewPaletted(image.Rect(0, 0, width, height), palette)
+	copy(img.Pix, data)
+
+	return img, nil
+}
+
+// paletteFromAddress creates a palette from packed 8-bit RGBA colors
+// (without premultiplied alpha) stored in memory block of provided size,
+// starting at the provided address.
+func paletteFromAddress(address uintptr, size int) (color.Palette, error) {
+	data, err := bytesFromAddress(address, size)
+	if err != nil {
+		return nil, err
+	}
+
+	if len(data)%4 != 0 {
+		return nil, errors.New("palette buffer doesn't consist of RGBA colors")
+	}
+
+	palette := make(color.Palette, 0, len(data)/4)
+	for i := 0; i < len(data); i += 4 {
+		palette = append(palette, color.NRGBA{data[i], data[i+1], data[i+2], data[i+3]})
+	}
+
+	return palette, nil
+}
+
+// ImagePixels returns the pixel plane of provided image.
+//
+// Pixels of *image.Gray, *image.Paletted, *image.NRGBA and *image.RGBA images
+// are exposed as they're stored, without copying them. Images of other types
+// are first copied into a new *image.RGBA image.
+func ImagePixels(img_data image.Image) (*PixelBuffer, error) {
+	bounds := img_data.Bounds()
+	if bounds.Empty() {
+		return nil, errors.New("empty image provided")
+	}
+
+	var pix []uint8
+	var offset, stride, channels int
+	var mode string
+
+	switch img := img_data.(type) {
+	case *image.Gray:
+		pix, offset, stride, channels, mode = img.Pix, img.PixOffset(bounds.Min.X, bounds.Min.Y), img.Stride, 1, "L"
+	case *image.Paletted:
+		pix, offset, stride, channels, mode = img.Pix, img.PixOffset(bounds.Min.X, bounds.Min.Y), img.Stride, 1, "P"
+	case *image.NRGBA:
+		pix, offset, stride, channels, mode = img.Pix, img.PixOffset(bounds.Min.X, bounds.Min.Y), img.Stride, 4, "RGBA"
+	case *image.RGBA:
+		pix, offset, stride, channels, mode = img.Pix, img.PixOffset(bounds.Min.X, bounds.Min.Y), img.Stride, 4, "RGBa"
+	default:
+		rgba := image.NewRGBA(bounds)
+		draw.Draw(rgba, bounds, img_data, bounds.Min, draw.Src)
+
+		pix, offset, stride, channels, mode = rgba.Pix, 0, rgba.Stride, 4, "RGBa"
+	}
+
+	length := (bounds.Dy()-1)*stride + bounds.Dx()*channels
+
+	return &PixelBuffer{
+		Width:    bounds.Dx(),
+		Height:   bounds.Dy(),
+		Stride:   stride,
+		Channels: channels,
+		Mode:     mode,
+		buffer:   &Buffer{data: pix[offset : offset+length]},
+	}, nil
+}
+
+// ImageMode returns the Mode of the pixels ImagePixels returns for provided
+// image, without copying them.
+func ImageMode(img_data image.Image) (string, error) {
+	if img_data.Bounds().Empty() {
+		return "", errors.New("empty image provided")
+	}
+
+	switch img_data.(type) {
+	case *image.Gray:
+		return "L", nil
+	case *image.Paletted:
+		return "P", nil
+	case *image.NRGBA:
+		return "RGBA", nil
+	default:
+		return "RGBa", nil
+	}
+}
+
+// ImagePalette returns the palette of provided *image.Paletted image
+// as a buffer of packed 8-bit RGBA colors, without premultiplied alpha.
+func ImagePalette(img_data image.Image) (*Buffer, error) {
+	img, ok := img_data.(*image.Paletted)
+	if !ok {
+		return nil, errors.New("provided image doesn't have a palette")
+	}
+
+	data := make([]byte, 0, len(img.Palette)*4)
+	for _, c := range img.Palette {
+		nrgba := color.NRGBAModel.Convert(c).(color.NRGBA)
+		data = append(data, nrgba.R, nrgba.G, nrgba.B, nrgba.A)
+	}
+
+	return &Buffer{data: data}, nil
+}
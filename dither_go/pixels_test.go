@@ -0,0 +1,204 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"image/color"
+	"testing"
+)
+
+func TestImageFromBuffer(t *testing.T) {
+	data := []byte{
+		10, 20, 30, 255, 40, 50, 60, 128,
+		70, 80, 90, 0, 100, 110, 120, 255,
+	}
+
+	expected := map[bool]color.Color{
+		false: color.NRGBA{40, 50, 60, 128},
+		true:  color.RGBA{40, 50, 60, 128},
+	}
+
+	for _, premultiplied := range []bool{false, true} {
+		for _, copy_data := range []bool{false, true} {
+			img, err := ImageFromBuffer(bytesAddress(data), 2, 2, 4, premultiplied, copy_data)
+			if err != nil {
+				t.Fatal(err)
+			}
+
+			if img.Bounds() != image.Rect(0, 0, 2, 2) || img.At(1, 0) != expected[premultiplied] {
+				t.Fatalf("premultiplied: %v, copy: %v: got pixel %v", premultiplied, copy_data, img.At(1, 0))
+			}
+
+			// Shared images write straight back to the buffer
+			img.(interface{ Set(int, int, color.Color) }).Set(0, 0, color.Gray{0})
+			if shared := data[0] == 0; shared == copy_data {
+				t.Fatalf("premultiplied: %v, copy: %v: memory shared: %v", premultiplied, copy_data, shared)
+			}
+
+			data[0], data[1], data[2], data[3] = 10, 20, 30, 255
+		}
+	}
+
+	gray, err := ImageFromBuffer(bytesAddress(data), 4, 2, 1, false, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if gray.At(1, 1) != (color.Gray{50}) {
+		t.Fatalf("got gray pixel %v", gray.At(1, 1))
+	}
+
+	// RGB data is always copied, as Go has no packed RGB image type
+	rgb, err := ImageFromBuffer(bytesAddress(data), 2, 2, 3, false, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	if rgb.At(1, 0) != (color.RGBA{255, 40, 50, 255}) || rgb.At(1, 1) != (color.RGBA{80, 90, 0, 255}) {
+		t.Fatalf("got RGB pixels %v and %v", rgb.At(1, 0), rgb.At(1, 1))
+	}
+
+	for _, size := range [][3]int{{0, 2, 4}, {2, -1, 4}, {2, 2, 2}} {
+		if _, err := ImageFromBuffer(bytesAddress(data), size[0], size[1], size[2], false, false); err == nil {
+			t.Fatalf("%dx%d image with %d channels is accepted", size[0], size[1], size[2])
+		}
+	}
+}
+
+func TestPalettedImageFromBuffer(t *testing.T) {
+	indexes := []byte{0, 1, 1, 0, 2, 1}
+	palette := []byte{255, 0, 0, 255, 0, 255, 0, 128, 0, 0, 255, 0}
+
+	img, err := PalettedImageFromBuffer(bytesAddress(indexes), 3, 2, bytesAddress(palette), len(palette))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	expected := color.Palette{color.NRGBA{255, 0, 0, 255}, color.NRGBA{0, 255, 0, 128}, color.NRGBA{0, 0, 255, 0}}
+	if len(img.Palette) != len(expected) {
+		t.Fatalf("got %d palette colors", len(img.Palette))
+	}
+
+	for i, c := range expected {
+		if img.Palette[i] != c {
+			t.Fatalf("palette color %d is %v, expected %v", i, img.Palette[i], c)
+		}
+	}
+
+	if string(img.Pix) != string(indexes) {
+		t.Fatalf("got indexes %v", img.Pix)
+	}
+
+	// Indexes are copied
+	indexes[0] = 2
+	if img.Pix[0] != 0 {
+		t.Fatal("image shares memory with the buffer")
+	}
+
+	indexes[0] = 3
+	if _, err := PalettedImageFromBuffer(bytesAddress(indexes), 3, 2, bytesAddress(palette), len(palette)); err == nil {
+		t.Fatal("index out of the palette is accepted")
+	}
+
+	if _, err := PalettedImageFromBuffer(bytesAddress(indexes), 3, 2, bytesAddress(palette), 6); err == nil {
+		t.Fatal("palette of incomplete colors is accepted")
+	}
+}
+
+func TestImagePixels(t *testing.T) {
+	rgba := image.NewRGBA(image.Rect(0, 0, 5, 4))
+	for i := range rgba.Pix {
+		rgba.Pix[i] = uint8(i)
+	}
+
+	ycbcr := image.NewYCbCr(image.Rect(0, 0, 5, 4), image.YCbCrSubsampleRatio444)
+	for i := range ycbcr.Y {
+		ycbcr.Y[i], ycbcr.Cb[i], ycbcr.Cr[i] = uint8(10*i), 128, 128
+	}
+
+	tests := []struct {
+		img      image.Image
+		mode     string
+		channels int
+		shared   bool
+	}{
+		{image.NewGray(image.Rect(0, 0, 5, 4)), "L", 1, true},
+		{image.NewPaletted(image.Rect(0, 0, 5, 4), color.Palette{color.Black, color.White}), "P", 1, true},
+		{image.NewNRGBA(image.Rect(0, 0, 5, 4)), "RGBA", 4, true},
+		{rgba, "RGBa", 4, true},
+		{rgba.SubImage(image.Rect(1, 1, 4, 3)), "RGBa", 4, true},
+		{ycbcr, "RGBa", 4, false},
+	}
+
+	for _, test := range tests {
+		bounds := test.img.Bounds()
+
+		pixels, err := ImagePixels(test.img)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		mode, err := ImageMode(test.img)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		if mode != test.mode || pixels.Mode != test.mode || pixels.Channels != test.channels || pixels.Width != bounds.Dx() || pixels.Height != bounds.Dy() {
+			t.Fatalf("%T: got %dx%d %s (%s) pixels with %d channels", test.img, pixels.Width, pixels.Height, pixels.Mode, mode, pixels.Channels)
+		}
+
+		// The buffer ends with the last pixel, not with the end of the last row
+		data := pixels.Buffer().data
+		if len(data) != (pixels.Height-1)*pixels.Stride+pixels.Width*pixels.Channels {
+			t.Fatalf("%T: got buffer of %d bytes", test.img, len(data))
+		}
+
+		if test.shared {
+			// Shared pixels are the ones of the image
+			before := test.img.At(bounds.Min.X, bounds.Min.Y)
+			data[0]++
+
+			if test.img.At(bounds.Min.X, bounds.Min.Y) == before {
+				t.Fatalf("%T: pixels are copied", test.img)
+			}
+		} else {
+			// Copied pixels hold the colors of the image
+			for y := 0; y < pixels.Height; y++ {
+				for x := 0; x < pixels.Width; x++ {
+					p := data[y*pixels.Stride+4*x:]
+					if c := (color.RGBA{p[0], p[1], p[2], p[3]}); c != color.RGBAModel.Convert(test.img.At(bounds.Min.X+x, bounds.Min.Y+y)) {
+						t.Fatalf("%T: pixel (%d, %d) is %v", test.img, x, y, c)
+					}
+				}
+			}
+		}
+	}
+
+	if _, err := ImagePixels(image.NewRGBA(image.Rect(0, 0, 0, 3))); err == nil {
+		t.Fatal("empty image is accepted")
+	}
+
+	if _, err := ImageMode(image.NewRGBA(image.Rect(0, 0, 0, 3))); err == nil {
+		t.Fatal("mode of an empty image is returned")
+	}
+}
+
+func TestImagePalette(t *testing.T) {
+	img := image.NewPaletted(image.Rect(0, 0, 1, 1), color.Palette{color.RGBA{128, 64, 0, 128}, color.White})
+
+	palette, err := ImagePalette(img)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	// Colors are unpremultiplied, like the ones PalettedImageFromBuffer reads
+	if string(palette.data) != string([]byte{255, 127, 0, 128, 255, 255, 255, 255}) {
+		t.Fatalf("got palette %v", palette.data)
+	}
+
+	if _, err := ImagePalette(image.NewRGBA(img.Bounds())); err == nil {
+		t.Fatal("image without a palette is accepted")
+	}
+}
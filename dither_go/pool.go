@@ -0,0 +1,244 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"image"
+	"image/color"
+	"image/draw"
+	"runtime"
+	"sync"
+	"unsafe"
+)
+
+// imagePoolKey identifies images with pixel buffers of the same size.
+type imagePoolKey struct {
+	paletted bool
+	width    int
+	height   int
+}
+
+// imagePools holds a *sync.Pool of released images for each imagePoolKey.
+var imagePools sync.Map
+
+func imagePool(key imagePoolKey) *sync.Pool {
+	pool, _ := imagePools.LoadOrStore(key, &sync.Pool{})
+	return pool.(*sync.Pool)
+}
+
+// pooledImages holds the addresses of images allocated by acquireRGBA and
+// acquirePaletted, mapped to whether they're acquired. Only these images are
+// taken back by ReleaseImage, and only once per acquisition, so a pool never
+// holds an image backed by memory it doesn't own (eg. one of ImageFromBuffer),
+// or the same image twice. Images are forgotten once they're garbage collected.
+var (
+	pooledMutex  sync.Mutex
+	pooledImages = map[uintptr]bool{}
+)
+
+// setAcquired marks the pooled image at provided address as acquired or released,
+// and reports whether it was in the opposite state before. Images which aren't
+// pooled are never marked.
+func setAcquired(address uintptr, acquired bool) bool {
+	pooledMutex.Lock()
+	defer pooledMutex.Unlock()
+
+	if was, ok := pooledImages[address]; !ok || was == acquired {
+		return false
+	}
+
+	pooledImages[address] = acquired
+	return true
+}
+
+// trackImage adds a newly allocated image at provided address to pooledImages
+// as acquired.
+func trackImage(address uintptr) {
+	pooledMutex.Lock()
+	pooledImages[address] = true
+	pooledMutex.Unlock()
+}
+
+func forgetImage(address uintptr) {
+	pooledMutex.Lock()
+	delete(pooledImages, address)
+	pooledMutex.Unlock()
+}
+
+// imageAddress returns the address of an *image.RGBA or *image.Paletted image,
+// which identifies it in pooledImages, or 0 for images of other types.
+func imageAddress(img image.Image) uintptr {
+	switch img := img.(type) {
+	case *image.RGBA:
+		return uintptr(unsafe.Pointer(img))
+	case *image.Paletted:
+		return uintptr(unsafe.Pointer(img))
+	}
+
+	return 0
+}
+
+// isPooled reports whether provided image was allocated by acquireRGBA or
+// acquirePaletted, and is acquired.
+func isPooled(img image.Image) bool {
+	address := imageAddress(img)
+
+	pooledMutex.Lock()
+	defer pooledMutex.Unlock()
+
+	return address != 0 && pooledImages[address]
+}
+
+// AcquireRGBA returns an *image.RGBA with the same bounds as provided image,
+// reusing the pixel buffer of a released image of the same size if there's one.
+// Its pixels are not cleared, so it should be used as a destination of DitherInto,
+// which sets all of them.
+func AcquireRGBA(like image.Image) *image.RGBA {
+	return acquireRGBA(like.Bounds())
+}
+
+// AcquirePaletted returns an *image.Paletted with the same bounds as provided
+// image and provided palette, like AcquireRGBA.
+func AcquirePaletted(like image.Image, palette []color.Color) *image.Paletted {
+	return acquirePaletted(like.Bounds(), palette)
+}
+
+// ReleaseImage gives the pixel buffer of an image returned by AcquireRGBA or
+// AcquirePaletted (or by DitherCopy and DitherPaletted methods of Notifier)
+// back for reuse. The image must not be used after it's released.
+//
+// Other images, including ones sharing memory with Python objects (see
+// ImageFromBuffer) and images already released, are ignored.
+//
+// Released images are kept in a sync.Pool for each size, so they're freed
+// by the garbage collector if they're not acquired again.
+func ReleaseImage(img image.Image) {
+	switch img := img.(type) {
+	case *image.RGBA:
+		bounds := img.Bounds()
+		if len(img.Pix) == 4*bounds.Dx()*bounds.Dy() && setAcquired(imageAddress(img), false) {
+			imagePool(imagePoolKey{false, bounds.Dx(), bounds.Dy()}).Put(img)
+		}
+	case *image.Paletted:
+		bounds := img.Bounds()
+		if len(img.Pix) == bounds.Dx()*bounds.Dy() && setAcquired(imageAddress(img), false) {
+			img.Palette = nil
+			imagePool(imagePoolKey{true, bounds.Dx(), bounds.Dy()}).Put(img)
+		}
+	}
+}
+
+// PooledMemory returns the pixel buffer of provided image, without copying it,
+// if ReleaseImage would give it back for reuse. For other images, it returns
+// an empty Buffer.
+func PooledMemory(img image.Image) *Buffer {
+	if !isPooled(img) {
+		return &Buffer{}
+	}
+
+	switch img := img.(type) {
+	case *image.RGBA:
+		return &Buffer{data: img.Pix}
+	case *image.Paletted:
+		return &Buffer{data: img.Pix}
+	}
+
+	return &Buffer{}
+}
+
+func acquireRGBA(bounds image.Rectangle) *image.RGBA {
+	if img, ok := imagePool(imagePoolKey{false, bounds.Dx(), bounds.Dy()}).Get().(*image.RGBA); ok {
+		img.Rect, img.Stride = bounds, 4*bounds.Dx()
+		setAcquired(imageAddress(img), true)
+		return img
+	}
+
+	img := image.NewRGBA(bounds)
+	trackImage(imageAddress(img))
+	runtime.SetFinalizer(img, func(img *image.RGBA) {
+		forgetImage(imageAddress(img))
+	})
+
+	return img
+}
+
+func acquirePaletted(bounds image.Rectangle, palette color.Palette) *image.Paletted {
+	if img, ok := imagePool(imagePoolKey{true, bounds.Dx(), bounds.Dy()}).Get().(*image.Paletted); ok {
+		img.Rect, img.Stride, img.Palette = bounds, bounds.Dx(), palette
+		setAcquired(imageAddress(img), true)
+		return img
+	}
+
+	img := image.NewPaletted(bounds, palette)
+	trackImage(imageAddress(img))
+	runtime.SetFinalizer(img, func(img *image.Paletted) {
+		forgetImage(imageAddress(img))
+	})
+
+	return img
+}
+
+// DitherInto dithers the src image using provided Ditherer (or Engine) and
+// writes the result to the dst image, which must have the same bounds.
+// The src image remains unchanged, unless it's the dst image.
+//
+// An Engine writes the pixels straight to dst, without allocating a new image.
+// If dst is *image.Paletted, its palette must be equal to the Engine's palette.
+// Other ditherers draw src onto dst and dither it in place with Ditherer.Dither,
+// so dst can't be *image.Paletted, as drawing onto it would map the colors
+// to the palette before dithering.
+func DitherInto(d ImageDitherer, dst draw.Image, src image.Image) error {
+	if engine, ok := d.(*Engine); ok {
+		return engine.DitherInto(dst, src)
+	}
+
+	if dst.Bounds() != src.Bounds() {
+		return fmt.Errorf("destination bounds %v differ from source bounds %v", dst.Bounds(), src.Bounds())
+	}
+
+	return ditherInPlace(d, dst, src)
+}
+
+// ditherInPlace draws the src image onto dst and dithers it in place.
+func ditherInPlace(d ImageDitherer, dst draw.Image, src image.Image) error {
+	if _, ok := dst.(*image.Paletted); ok {
+		return errors.New("only an Engine can dither into an *image.Paletted image")
+	}
+
+	bounds := dst.Bounds()
+	if image.Image(dst) != src {
+		draw.Draw(dst, bounds, src, bounds.Min, draw.Src)
+	}
+
+	// Dither returns a copy if it can't change the image in place
+	if img := d.Dither(dst); img != nil && img != image.Image(dst) {
+		draw.Draw(dst, bounds, img, bounds.Min, draw.Src)
+	}
+
+	return nil
+}
+
+// dithersInto reports whether provided ditherer can write the pixels of the
+// src image straight to an *image.Paletted image with DitherInto.
+func dithersInto(d ImageDitherer, src image.Image) bool {
+	engine, ok := d.(*Engine)
+	return ok && engine.handles(src)
+}
+
+// samePalette reports whether both palettes have the same colors, in the same order.
+func samePalette(p1 []color.Color, p2 []color.Color) bool {
+	if len(p1) != len(p2) {
+		return false
+	}
+
+	for i := range p1 {
+		if color.RGBAModel.Convert(p1[i]) != color.RGBAModel.Convert(p2[i]) {
+			return false
+		}
+	}
+
+	return true
+}
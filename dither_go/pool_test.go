@@ -0,0 +1,164 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"math/rand"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestDitherIntoIsEqual(t *testing.T) {
+	random := rand.New(rand.NewSource(12))
+
+	img := randomImage(random, 73, 41).SubImage(image.Rect(5, 3, 70, 40))
+	palette := randomPalette(random, 8)
+
+	d := dither.NewDitherer(palette)
+	d.Matrix = dither.FloydSteinberg
+
+	engine, err := NewEngine(d)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	// Fill the destinations with garbage, as a reused buffer would be
+	rgba := AcquireRGBA(img)
+	random.Read(rgba.Pix)
+
+	if err := engine.DitherInto(rgba, img); err != nil {
+		t.Fatal(err)
+	}
+
+	if string(rgba.Pix) != string(engine.DitherCopy(img).Pix) {
+		t.Fatal("DitherInto output differs from DitherCopy")
+	}
+
+	paletted := AcquirePaletted(img, d.GetPalette())
+	random.Read(paletted.Pix)
+
+	if err := DitherInto(engine, paletted, img); err != nil {
+		t.Fatal(err)
+	}
+
+	if string(paletted.Pix) != string(engine.DitherPaletted(img).Pix) {
+		t.Fatal("DitherInto output differs from DitherPaletted")
+	}
+
+	if err := engine.DitherInto(image.NewRGBA(image.Rect(0, 0, 65, 37)), img); err == nil {
+		t.Fatal("different bounds are accepted")
+	}
+
+	if err := engine.DitherInto(image.NewPaletted(img.Bounds(), randomPalette(random, 8)), img); err == nil {
+		t.Fatal("different palette is accepted")
+	}
+}
+
+func TestDitherIntoDithersInPlace(t *testing.T) {
+	random := rand.New(rand.NewSource(14))
+
+	img := randomImage(random, 59, 33)
+	original := string(img.Pix)
+
+	d := dither.NewDitherer(randomPalette(random, 8))
+	d.Matrix = dither.FloydSteinberg
+
+	rgba := AcquireRGBA(img)
+	random.Read(rgba.Pix)
+
+	if err := DitherInto(d, rgba, img); err != nil {
+		t.Fatal(err)
+	}
+
+	if string(rgba.Pix) != string(d.DitherCopy(img).Pix) {
+		t.Fatal("DitherInto output differs from DitherCopy")
+	}
+
+	if string(img.Pix) != original {
+		t.Fatal("DitherInto changed the source image")
+	}
+
+	if err := DitherInto(d, AcquirePaletted(img, d.GetPalette()), img); err == nil {
+		t.Fatal("*image.Paletted destination is accepted")
+	}
+}
+
+func TestReleasedImageIsReused(t *testing.T) {
+	img := image.NewRGBA(image.Rect(0, 0, 31, 17))
+
+	first := AcquireRGBA(img)
+	ReleaseImage(first)
+
+	// sync.Pool may drop released images, so only the returned one is checked
+	second := AcquireRGBA(image.NewRGBA(image.Rect(10, 10, 41, 27)))
+	if second.Bounds() != image.Rect(10, 10, 41, 27) || len(second.Pix) != 4*31*17 {
+		t.Fatalf("acquired image has bounds %v and %d bytes", second.Bounds(), len(second.Pix))
+	}
+
+	if second.PixOffset(10, 11) != second.Stride {
+		t.Fatal("acquired image is addressed incorrectly")
+	}
+}
+
+func TestReleaseImageOnlyTakesPooledImages(t *testing.T) {
+	bounds := image.Rect(0, 0, 23, 19)
+
+	foreign := image.NewRGBA(bounds)
+	ReleaseImage(foreign)
+
+	if isPooled(foreign) || PooledMemory(foreign).Len() != 0 {
+		t.Fatal("image not allocated by the pool is taken back")
+	}
+
+	acquired := AcquirePaletted(foreign, randomPalette(rand.New(rand.NewSource(15)), 4))
+	if !isPooled(acquired) || PooledMemory(acquired).Len() != len(acquired.Pix) {
+		t.Fatal("acquired image isn't tracked")
+	}
+
+	ReleaseImage(acquired)
+	ReleaseImage(acquired)
+
+	if isPooled(acquired) || PooledMemory(acquired).Len() != 0 {
+		t.Fatal("released image is still acquired")
+	}
+
+	// A double release would hand the same buffer out twice
+	if AcquirePaletted(foreign, nil) == AcquirePaletted(foreign, nil) {
+		t.Fatal("image released twice is acquired twice")
+	}
+}
+
+func BenchmarkDitherInto(b *testing.B) {
+	random := rand.New(rand.NewSource(13))
+	img := randomImage(random, 1024, 1024)
+
+	engine, err := NewEngine(dither.NewDitherer(randomPalette(random, 4)))
+	if err != nil {
+		b.Fatal(err)
+	}
+
+	SetSeededRandomGrayscale(engine.ditherer, 1, -0.5, 0.5)
+
+	b.Run("copy", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			engine.DitherCopy(img)
+		}
+	})
+
+	b.Run("into", func(b *testing.B) {
+		b.ReportAllocs()
+		for i := 0; i < b.N; i++ {
+			dst := AcquireRGBA(img)
+			if err := engine.DitherInto(dst, img); err != nil {
+				b.Fatal(err)
+			}
+			ReleaseImage(dst)
+		}
+	})
+}
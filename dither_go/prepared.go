@@ -0,0 +1,98 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"image/color"
+	"runtime"
+	"sync"
+	"sync/atomic"
+)
+
+// PreparedImage is an image converted once to the linear RGB channels
+// used by Engine, so it can be dithered with many palettes without
+// converting it again each time. Create it with PrepareImage.
+//
+// It also implements image.Image by reading the pixels of the source image,
+// so it can be passed to a Ditherer, which doesn't use the prepared channels.
+// The source image shouldn't be changed while PreparedImage is used.
+type PreparedImage struct {
+	src    image.Image
+	linear []uint16
+}
+
+// PrepareImage converts provided image to linear RGB channels, with rows
+// converted concurrently by all available CPUs.
+func PrepareImage(img image.Image) *PreparedImage {
+	bounds := img.Bounds()
+	width, height := bounds.Dx(), bounds.Dy()
+
+	prepared := &PreparedImage{
+		src:    img,
+		linear: make([]uint16, 3*width*height),
+	}
+
+	if width == 0 || height == 0 {
+		return prepared
+	}
+
+	reader := newLinearReader(img)
+	workers := runtime.GOMAXPROCS(0)
+	if workers > height {
+		workers = height
+	}
+
+	next := int64(-1)
+
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			for {
+				row := int(atomic.AddInt64(&next, 1))
+				if row >= height {
+					return
+				}
+
+				reader.readRow(bounds.Min.Y+row, prepared.linear[3*width*row:3*width*(row+1)])
+			}
+		}()
+	}
+
+	wg.Wait()
+
+	return prepared
+}
+
+// Source returns the image PreparedImage was created from.
+func (p *PreparedImage) Source() image.Image {
+	return p.src
+}
+
+// ColorModel returns the color model of the source image.
+func (p *PreparedImage) ColorModel() color.Model {
+	return p.src.ColorModel()
+}
+
+// Bounds returns the bounds of the source image.
+func (p *PreparedImage) Bounds() image.Rectangle {
+	return p.src.Bounds()
+}
+
+// At returns the color of the source image's pixel at (x, y).
+func (p *PreparedImage) At(x, y int) color.Color {
+	return p.src.At(x, y)
+}
+
+// readRow copies the prepared row to lin.
+func (p *PreparedImage) readRow(y int, lin []uint16) {
+	bounds := p.src.Bounds()
+	width := bounds.Dx()
+	row := y - bounds.Min.Y
+
+	copy(lin, p.linear[3*width*row:3*width*(row+1)])
+}
@@ -0,0 +1,78 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"image"
+	"math/rand"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+func TestPreparedImageOutputIsEqual(t *testing.T) {
+	random := rand.New(rand.NewSource(10))
+
+	// Bounds not starting at (0, 0), to check rows are addressed correctly
+	img := randomImage(random, 73, 41).SubImage(image.Rect(5, 3, 70, 40))
+	prepared := PrepareImage(img)
+
+	if prepared.Bounds() != img.Bounds() || prepared.At(10, 10) != img.At(10, 10) {
+		t.Fatal("PreparedImage doesn't match the source image")
+	}
+
+	for _, size := range []int{4, 32} {
+		d := dither.NewDitherer(randomPalette(random, size))
+
+		engine, err := NewEngine(d)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		d.Matrix = dither.FloydSteinberg
+		if string(engine.DitherCopy(img).Pix) != string(engine.DitherCopy(prepared).Pix) {
+			t.Fatalf("palette of %d colors: error diffusion output differs", size)
+		}
+
+		d.Matrix = nil
+		SetSeededRandomGrayscale(d, 1, -0.5, 0.5)
+		if string(engine.DitherPaletted(img).Pix) != string(engine.DitherPaletted(prepared).Pix) {
+			t.Fatalf("palette of %d colors: pixel mapper output differs", size)
+		}
+	}
+}
+
+func BenchmarkPreparedImage(b *testing.B) {
+	random := rand.New(rand.NewSource(11))
+	img := randomImage(random, 1024, 1024)
+
+	engine, err := NewEngine(dither.NewDitherer(randomPalette(random, 4)))
+	if err != nil {
+		b.Fatal(err)
+	}
+
+	SetSeededRandomGrayscale(engine.ditherer, 1, -0.5, 0.5)
+
+	b.Run("source", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			engine.DitherPaletted(img)
+		}
+	})
+
+	prepared := PrepareImage(img)
+
+	b.Run("prepared", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			engine.DitherPaletted(prepared)
+		}
+	})
+
+	b.Run("prepare", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			PrepareImage(img)
+		}
+	})
+}
@@ -0,0 +1,353 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"errors"
+	"fmt"
+	"math"
+	"runtime"
+	"sort"
+	"sync"
+)
+
+// Strategies of finding the closest palette color, used by Engine.SetSearch.
+const (
+	// SearchScan compares every color with the whole palette.
+	SearchScan = "scan"
+
+	// SearchLUT looks colors up in a 3D table of candidate palette colors,
+	// built once per palette.
+	SearchLUT = "lut"
+
+	// SearchKDTree searches a k-d tree of the palette colors.
+	SearchKDTree = "kdtree"
+)
+
+// colorFinder finds the index of the palette color closest to provided
+// linear RGB color.
+//
+// All implementations must return the same index as paletteScan, including
+// the choice between equally close colors (the first one wins).
+type colorFinder interface {
+	closest(r, g, b uint16) int
+}
+
+// newColorFinder creates a colorFinder of provided strategy for the linear palette.
+func newColorFinder(strategy string, linear [][3]uint16) (colorFinder, error) {
+	switch strategy {
+	case SearchScan:
+		return paletteScan(linear), nil
+	case SearchLUT:
+		return newColorLUT(linear)
+	case SearchKDTree:
+		return newColorTree(linear)
+	default:
+		return nil, fmt.Errorf("unknown search strategy: %s", strategy)
+	}
+}
+
+// sqDiff returns the square of the difference between two channel values,
+// divided by 4, which is the distance Ditherer compares colors with. It's
+// small enough for a sum of three to fit in uint32, and grows with
+// the difference, so it can be bounded like the exact square.
+func sqDiff(v1 uint16, v2 uint16) uint32 {
+	d := uint32(v1) - uint32(v2)
+	return (d * d) >> 2
+}
+
+// paletteScan finds the closest color by comparing it with every palette
+// color, using the sum of sqDiff of the linear RGB channels.
+type paletteScan [][3]uint16
+
+func (p paletteScan) closest(r, g, b uint16) int {
+	index, best := 0, uint32(math.MaxUint32)
+
+	for i, c := range p {
+		dist := sqDiff(r, c[0]) + sqDiff(g, c[1]) + sqDiff(b, c[2])
+		if dist < best {
+			if dist == 0 {
+				return i
+			}
+
+			index, best = i, dist
+		}
+	}
+
+	return index
+}
+
+const (
+	// lutBits is the amount of most significant bits of each linear channel
+	// used to address a cell of colorLUT.
+	lutBits = 5
+
+	lutLevels = 1 << lutBits
+	lutShift  = 16 - lutBits
+)
+
+// colorLUT divides linear RGB space into lutLevels^3 cells and stores, for each
+// cell, the palette colors which can be the closest one to any color inside it.
+//
+// A palette color is a candidate of the cell if its smallest possible distance
+// to the cell isn't greater than the largest possible distance between the cell
+// and the palette color closest to it. Candidates are kept in palette order,
+// so scanning them gives the same result as scanning the whole palette.
+type colorLUT struct {
+	linear     [][3]uint16
+	offsets    []uint32
+	candidates []uint16
+}
+
+func newColorLUT(linear [][3]uint16) (*colorLUT, error) {
+	if len(linear) == 0 {
+		return nil, errors.New("empty palette provided")
+	}
+
+	if len(linear) > math.MaxUint16+1 {
+		return nil, errors.New("palette has too many colors for a lookup table")
+	}
+
+	// Smallest and largest squared distances of each palette color channel
+	// to each level of that channel
+	var minDist, maxDist [3][]uint32
+	for channel := 0; channel < 3; channel++ {
+		minDist[channel] = make([]uint32, len(linear)*lutLevels)
+		maxDist[channel] = make([]uint32, len(linear)*lutLevels)
+
+		for i, c := range linear {
+			for level := 0; level < lutLevels; level++ {
+				low := uint16(level << lutShift)
+				high := low + (1<<lutShift - 1)
+				value := c[channel]
+
+				near, far := value, low
+				switch {
+				case value < low:
+					near, far = low, high
+				case value > high:
+					near, far = high, low
+				case value-low < high-value:
+					far = high
+				}
+
+				minDist[channel][i*lutLevels+level] = sqDiff(value, near)
+				maxDist[channel][i*lutLevels+level] = sqDiff(value, far)
+			}
+		}
+	}
+
+	// Each level of red channel is built separately, in parallel
+	levelOffsets := make([][]uint32, lutLevels)
+	levelCandidates := make([][]uint16, lutLevels)
+
+	workers := runtime.GOMAXPROCS(0)
+	levels := make(chan int)
+
+	var wg sync.WaitGroup
+	for i := 0; i < workers && i < lutLevels; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			farthest := make([]uint32, len(linear))
+			for red := range levels {
+				offsets := make([]uint32, 0, lutLevels*lutLevels)
+				var candidates []uint16
+
+				for green := 0; green < lutLevels; green++ {
+					for blue := 0; blue < lutLevels; blue++ {
+						limit := uint32(math.MaxUint32)
+						for i := range linear {
+							base := i * lutLevels
+							farthest[i] = maxDist[0][base+red] + maxDist[1][base+green] + maxDist[2][base+blue]
+							if farthest[i] < limit {
+								limit = farthest[i]
+							}
+						}
+
+						offsets = append(offsets, uint32(len(candidates)))
+						for i := range linear {
+							base := i * lutLevels
+							if minDist[0][base+red]+minDist[1][base+green]+minDist[2][base+blue] <= limit {
+								candidates = append(candidates, uint16(i))
+							}
+						}
+					}
+				}
+
+				levelOffsets[red] = offsets
+				levelCandidates[red] = candidates
+			}
+		}()
+	}
+
+	for red := 0; red < lutLevels; red++ {
+		levels <- red
+	}
+	close(levels)
+
+	wg.Wait()
+
+	lut := &colorLUT{
+		linear:  linear,
+		offsets: make([]uint32, 0, lutLevels*lutLevels*lutLevels+1),
+	}
+
+	for red := 0; red < lutLevels; red++ {
+		base := uint32(len(lut.candidates))
+		for _, offset := range levelOffsets[red] {
+			lut.offsets = append(lut.offsets, base+offset)
+		}
+
+		lut.candidates = append(lut.candidates, levelCandidates[red]...)
+	}
+	lut.offsets = append(lut.offsets, uint32(len(lut.candidates)))
+
+	return lut, nil
+}
+
+func (l *colorLUT) closest(r, g, b uint16) int {
+	cell := int(r>>lutShift)<<(2*lutBits) | int(g>>lutShift)<<lutBits | int(b>>lutShift)
+	candidates := l.candidates[l.offsets[cell]:l.offsets[cell+1]]
+
+	if len(candidates) == 1 {
+		return int(candidates[0])
+	}
+
+	index, best := 0, uint32(math.MaxUint32)
+
+	for _, i := range candidates {
+		c := l.linear[i]
+
+		dist := sqDiff(r, c[0]) + sqDiff(g, c[1]) + sqDiff(b, c[2])
+		if dist < best {
+			if dist == 0 {
+				return int(i)
+			}
+
+			index, best = int(i), dist
+		}
+	}
+
+	return index
+}
+
+// colorTree is a k-d tree of the palette colors in linear RGB.
+//
+// The tree is stored implicitly: the node of each range of points is the
+// point in the middle of it, and its children are the ranges on both sides.
+// Each node splits its range along the channel with the largest spread.
+type colorTree struct {
+	points  [][3]uint16
+	indexes []int
+	axes    []uint8
+}
+
+func newColorTree(linear [][3]uint16) (*colorTree, error) {
+	if len(linear) == 0 {
+		return nil, errors.New("empty palette provided")
+	}
+
+	order := make([]int, len(linear))
+	for i := range order {
+		order[i] = i
+	}
+
+	tree := &colorTree{
+		points:  make([][3]uint16, len(linear)),
+		indexes: order,
+		axes:    make([]uint8, len(linear)),
+	}
+
+	tree.build(linear, 0, len(linear))
+
+	for i, index := range order {
+		tree.points[i] = linear[index]
+	}
+
+	return tree, nil
+}
+
+// build sorts the range of points so that it forms a subtree.
+func (t *colorTree) build(linear [][3]uint16, low int, high int) {
+	if high-low <= 0 {
+		return
+	}
+
+	var axis uint8
+	var spread int
+
+	for channel := uint8(0); channel < 3; channel++ {
+		least, most := math.MaxInt, 0
+
+		for _, index := range t.indexes[low:high] {
+			value := int(linear[index][channel])
+			if value < least {
+				least = value
+			}
+
+			if value > most {
+				most = value
+			}
+		}
+
+		if most-least > spread {
+			axis, spread = channel, most-least
+		}
+	}
+
+	points := t.indexes[low:high]
+	sort.Slice(points, func(i, j int) bool {
+		a, b := linear[points[i]][axis], linear[points[j]][axis]
+		if a != b {
+			return a < b
+		}
+
+		return points[i] < points[j]
+	})
+
+	middle := (low + high) / 2
+	t.axes[middle] = axis
+
+	t.build(linear, low, middle)
+	t.build(linear, middle+1, high)
+}
+
+func (t *colorTree) closest(r, g, b uint16) int {
+	best, _ := t.search([3]uint16{r, g, b}, 0, len(t.points), len(t.points), math.MaxUint32)
+	return best
+}
+
+// search finds the closest point in the range, returning the best palette
+// index and distance found so far.
+func (t *colorTree) search(color [3]uint16, low int, high int, best int, bestDist uint32) (int, uint32) {
+	for low < high {
+		middle := (low + high) / 2
+		point := t.points[middle]
+
+		dist := sqDiff(color[0], point[0]) + sqDiff(color[1], point[1]) + sqDiff(color[2], point[2])
+		if dist < bestDist || (dist == bestDist && t.indexes[middle] < best) {
+			best, bestDist = t.indexes[middle], dist
+		}
+
+		axis := t.axes[middle]
+
+		// Points on the far side are at least as far away along the axis as the
+		// splitting plane, so it's searched only if it can hold an equally close point
+		if color[axis] < point[axis] {
+			best, bestDist = t.search(color, low, middle, best, bestDist)
+			low = middle + 1
+		} else {
+			best, bestDist = t.search(color, middle+1, high, best, bestDist)
+			high = middle
+		}
+
+		if sqDiff(color[axis], point[axis]) > bestDist {
+			break
+		}
+	}
+
+	return best, bestDist
+}
@@ -0,0 +1,289 @@
+// Copyright 2023, tfuxu <https://github.com/tfuxu>
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+package dither_go
+
+import (
+	"fmt"
+	"image"
+	"image/color"
+	"math/rand"
+	"testing"
+)
+
+import (
+	"github.com/tfuxu/dither-gopy"
+)
+
+// randomPalette returns a palette of random opaque colors, with some
+// duplicates to check that ties are broken the same way.
+func randomPalette(random *rand.Rand, size int) []color.Color {
+	palette := make([]color.Color, size)
+	for i := range palette {
+		if i > 0 && random.Intn(8) == 0 {
+			palette[i] = palette[random.Intn(i)]
+			continue
+		}
+
+		palette[i] = color.RGBA{uint8(random.Intn(256)), uint8(random.Intn(256)), uint8(random.Intn(256)), 255}
+	}
+
+	return palette
+}
+
+// randomImage returns an image filled with random colors.
+func randomImage(random *rand.Rand, width int, height int) *image.NRGBA {
+	img := image.NewNRGBA(image.Rect(0, 0, width, height))
+	random.Read(img.Pix)
+
+	for i := 3; i < len(img.Pix); i += 4 {
+		img.Pix[i] = 255
+	}
+
+	return img
+}
+
+func TestSearchMatchesScan(t *testing.T) {
+	random := rand.New(rand.NewSource(1))
+
+	for _, size := range []int{1, 2, 3, 16, 64, 256, 300} {
+		engine, err := NewEngine(dither.NewDitherer(randomPalette(random, size)))
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		scan := paletteScan(engine.linear)
+
+		for _, strategy := range []string{SearchLUT, SearchKDTree} {
+			finder, err := newColorFinder(strategy, engine.linear)
+			if err != nil {
+				t.Fatal(err)
+			}
+
+			check := func(r, g, b uint16) {
+				if got, want := finder.closest(r, g, b), scan.closest(r, g, b); got != want {
+					t.Fatalf("%s, palette of %d colors: closest(%d, %d, %d) = %d, want %d", strategy, size, r, g, b, got, want)
+				}
+			}
+
+			// Edges of the lookup table cells, where the candidates are the most likely to be wrong
+			for level := 0; level < lutLevels; level++ {
+				low := uint16(level << lutShift)
+				high := low + (1<<lutShift - 1)
+
+				check(low, high, uint16(random.Intn(1<<16)))
+				check(high, low, uint16(random.Intn(1<<16)))
+				check(uint16(random.Intn(1<<16)), low, high)
+			}
+
+			for i := 0; i < 100000; i++ {
+				check(uint16(random.Intn(1<<16)), uint16(random.Intn(1<<16)), uint16(random.Intn(1<<16)))
+			}
+
+			// Palette colors themselves, including the duplicated ones
+			for _, c := range engine.linear {
+				check(c[0], c[1], c[2])
+			}
+		}
+	}
+}
+
+func TestEngineSearchOutputIsEqual(t *testing.T) {
+	random := rand.New(rand.NewSource(2))
+	img := randomImage(random, 97, 61)
+
+	mapper := func(x, y int, r, g, b uint16) (uint16, uint16, uint16) {
+		offset := uint16((x*7 + y*13) % 64 * 256)
+		return r/2 + offset, g/2 + offset, b/2 + offset
+	}
+
+	for _, size := range []int{2, 16, 256} {
+		d := dither.NewDitherer(randomPalette(random, size))
+
+		scan, err := NewEngine(d)
+		if err != nil {
+			t.Fatal(err)
+		}
+
+		for _, strategy := range []string{SearchLUT, SearchKDTree} {
+			engine, _ := NewEngine(d)
+			if err := engine.SetSearch(strategy); err != nil {
+				t.Fatal(err)
+			}
+
+			for _, serpentine := range []bool{false, true} {
+				d.Matrix = dither.FloydSteinberg
+				d.Mapper = nil
+				d.Serpentine = serpentine
+
+				if string(scan.DitherCopy(img).Pix) != string(engine.DitherCopy(img).Pix) {
+					t.Fatalf("%s, palette of %d colors: error diffusion output differs (serpentine: %v)", strategy, size, serpentine)
+				}
+			}
+
+			d.Matrix = nil
+			d.Mapper = mapper
+
+			if string(scan.DitherCopy(img).Pix) != string(engine.DitherCopy(img).Pix) {
+				t.Fatalf("%s, palette of %d colors: pixel mapper output differs", strategy, size)
+			}
+		}
+	}
+}
+
+// testImages returns images of all types Engine reads itself, and of some
+// it leaves to the Ditherer.
+func testImages(random *rand.Rand, width int, height int) map[string]image.Image {
+	nrgba := randomImage(random, width, height)
+	bounds := nrgba.Bounds()
+
+	rgba := image.NewRGBA(bounds)
+	gray := image.NewGray(bounds)
+	rgba64 := image.NewRGBA64(bounds)
+	paletted := image.NewPaletted(bounds, randomPalette(random, 64))
+
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			c := nrgba.At(x, y)
+			rgba.Set(x, y, c)
+			gray.Set(x, y, c)
+			rgba64.Set(x, y, c)
+			paletted.SetColorIndex(x, y, uint8(random.Intn(len(paletted.Palette))))
+		}
+	}
+
+	ycbcr := image.NewYCbCr(bounds, image.YCbCrSubsampleRatio420)
+	random.Read(ycbcr.Y)
+	random.Read(ycbcr.Cb)
+	random.Read(ycbcr.Cr)
+
+	transparent := randomImage(random, width, height)
+	transparent.Pix[3] = 128
+
+	return map[string]image.Image{
+		"NRGBA":       nrgba,
+		"RGBA":        rgba,
+		"Gray":        gray,
+		"Paletted":    paletted,
+		"YCbCr":       ycbcr,
+		"Prepared":    PrepareImage(ycbcr),
+		"SubImage":    rgba.SubImage(image.Rect(3, 2, width-1, height)),
+		"OddSubImage": rgba.SubImage(image.Rect(1, 1, width, height)),
+		"RGBA64":      rgba64,
+		"Transparent": transparent,
+	}
+}
+
+func TestEngineMatchesDitherer(t *testing.T) {
+	random := rand.New(rand.NewSource(10))
+	images := testImages(random, 61, 37)
+
+	matrices := map[string]dither.ErrorDiffusionMatrix{
+		"FloydSteinberg":    dither.FloydSteinberg,
+		"JarvisJudiceNinke": dither.JarvisJudiceNinke,
+		"Atkinson":          dither.Atkinson,
+	}
+
+	mapper := func(x, y int, r, g, b uint16) (uint16, uint16, uint16) {
+		offset := uint16((x*7 + y*13) % 64 * 256)
+		return r/2 + offset, g/2 + offset, b/2 + offset
+	}
+
+	for _, size := range []int{2, 16, 256} {
+		d := dither.NewDitherer(randomPalette(random, size))
+
+		for _, strategy := range []string{SearchScan, SearchLUT, SearchKDTree} {
+			engine, _ := NewEngine(d)
+			if err := engine.SetSearch(strategy); err != nil {
+				t.Fatal(err)
+			}
+
+			check := func(mode string) {
+				for name, img := range images {
+					if string(engine.DitherCopy(img).Pix) != string(d.DitherCopy(img).Pix) {
+						t.Fatalf("%s, palette of %d colors, %s: %s image differs from Ditherer's", strategy, size, mode, name)
+					}
+
+					if string(engine.DitherPaletted(img).Pix) != string(d.DitherPaletted(img).Pix) {
+						t.Fatalf("%s, palette of %d colors, %s: paletted %s image differs from Ditherer's", strategy, size, mode, name)
+					}
+				}
+			}
+
+			d.Mapper = nil
+			for name, matrix := range matrices {
+				for _, serpentine := range []bool{false, true} {
+					d.Matrix = matrix
+					d.Serpentine = serpentine
+					check(fmt.Sprintf("%s (serpentine: %v)", name, serpentine))
+				}
+			}
+
+			d.Matrix = nil
+			d.Mapper = mapper
+			check("pixel mapper")
+		}
+	}
+}
+
+func TestEngineDitherInPlace(t *testing.T) {
+	random := rand.New(rand.NewSource(3))
+	img := randomImage(random, 40, 30)
+
+	d := dither.NewDitherer(randomPalette(random, 8))
+	d.Matrix = dither.JarvisJudiceNinke
+
+	engine, err := NewEngine(d)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	want := engine.DitherCopy(img)
+	paletted := engine.DitherPaletted(img)
+
+	if engine.Dither(img) != image.Image(img) {
+		t.Fatal("image wasn't dithered in place")
+	}
+
+	bounds := img.Bounds()
+	for y := bounds.Min.Y; y < bounds.Max.Y; y++ {
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			c := color.RGBAModel.Convert(img.At(x, y))
+			if c != want.At(x, y) || c != color.RGBAModel.Convert(paletted.At(x, y)) {
+				t.Fatalf("pixel (%d, %d) differs", x, y)
+			}
+		}
+	}
+}
+
+// BenchmarkSearch compares search strategies across palette sizes,
+// by finding the closest palette colors of random colors.
+func BenchmarkSearch(b *testing.B) {
+	random := rand.New(rand.NewSource(4))
+
+	colors := make([][3]uint16, 4096)
+	for i := range colors {
+		colors[i] = [3]uint16{uint16(random.Intn(1 << 16)), uint16(random.Intn(1 << 16)), uint16(random.Intn(1 << 16))}
+	}
+
+	for _, size := range []int{16, 64, 256, 1024, 4096} {
+		engine, err := NewEngine(dither.NewDitherer(randomPalette(random, size)))
+		if err != nil {
+			b.Fatal(err)
+		}
+
+		for _, strategy := range []string{SearchScan, SearchLUT, SearchKDTree} {
+			finder, err := newColorFinder(strategy, engine.linear)
+			if err != nil {
+				b.Fatal(err)
+			}
+
+			b.Run(fmt.Sprintf("%s/%d", strategy, size), func(b *testing.B) {
+				for i := 0; i < b.N; i++ {
+					c := colors[i%len(colors)]
+					finder.closest(c[0], c[1], c[2])
+				}
+			})
+		}
+	}
+}
@@ -0,0 +1,192 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import ctypes
+from typing import Any, List, Tuple
+
+from dither_go.exceptions import InvalidBufferError
+
+
+class BufferUtils:
+    """
+    A class for internal utility methods used to pass binary data between
+    Python and Go without copying it element by element.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_address(self, data: Any) -> Tuple[int, int, Any]:
+        """
+        Resolves the memory address and size of an object supporting
+        the buffer protocol (eg. `bytes`, `bytearray` or `memoryview`).
+
+        Writable buffers are exposed directly, read-only `bytes` objects are
+        addressed in-place and other read-only buffers are copied once into
+        a new `bytes` object.
+
+        The returned owner object keeps the memory alive, so it has to be
+        referenced for as long as the address is in use.
+
+        :param data: An object supporting the buffer protocol.
+        :type data: Any
+
+        :raises InvalidBufferError: When provided object doesn't support
+        the buffer protocol, or its memory isn't contiguous.
+
+        :returns: A tuple consisting of the memory address, its size in bytes
+        and the object owning the memory.
+        :rtype: Tuple[int, int, Any]
+        """
+
+        try:
+            view = memoryview(data)
+        except TypeError as exc:
+            raise InvalidBufferError("Provided object doesn't support the buffer protocol") from exc
+
+        if not view.c_contiguous:
+            raise InvalidBufferError("Provided buffer isn't C-contiguous")
+
+        view = view.cast("B")
+
+        if view.readonly:
+            if not isinstance(data, bytes):
+                data = view.tobytes()
+
+            address = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value or 0
+            return address, len(data), data
+
+        array = (ctypes.c_ubyte * view.nbytes).from_buffer(view)
+
+        return ctypes.addressof(array), view.nbytes, array
+
+    def get_image_shape(self, data: Any) -> Tuple[int, int, int]:
+        """
+        Reads dimensions of an image stored as an array of 8-bit pixels
+        (eg. NumPy `uint8` array) in `HxW`, `HxWx1`, `HxWx3` or `HxWx4` shape.
+
+        :param data: An object supporting the buffer protocol.
+        :type data: Any
+
+        :raises InvalidBufferError: When provided object doesn't support the buffer
+        protocol, or it doesn't represent an array of 8-bit pixels.
+
+        :returns: A tuple consisting of image height, width and number of channels.
+        :rtype: Tuple[int, int, int]
+        """
+
+        try:
+            view = memoryview(data)
+        except TypeError as exc:
+            raise InvalidBufferError("Provided object doesn't support the buffer protocol") from exc
+
+        if view.itemsize != 1 or view.format not in ("B", "b", "c"):
+            raise InvalidBufferError(f"Provided array doesn't contain 8-bit values: {view.format}")
+
+        if view.ndim == 2:
+            height, width = view.shape
+            channels = 1
+        elif view.ndim == 3:
+            height, width, channels = view.shape
+        else:
+            raise InvalidBufferError(f"Provided array has an invalid number of dimensions: {view.ndim}")
+
+        if channels not in [1, 3, 4]:
+            raise InvalidBufferError(f"Provided array has an unsupported number of channels: {channels}")
+
+        return height, width, channels
+
+    def read_bytes(self, buffer) -> bytes:
+        """
+        Copies the contents of a `Buffer` Golang object into a new `bytes`
+        object in a single operation.
+
+        :param buffer: A `Buffer` Golang object.
+
+        :returns: A copy of the data stored in the buffer.
+        :rtype: :class:`bytes`
+        """
+
+        size = buffer.Len()
+        if size == 0:
+            return b""
+
+        return ctypes.string_at(buffer.Address(), size)
+
+    def view_memory(self, address: int, size: int, owner: Any) -> memoryview:
+        """
+        Creates a writable `memoryview` of a memory block, without copying it.
+
+        The view keeps a reference to the owner object, so the memory
+        stays alive for as long as the view (or objects created from it,
+        like NumPy arrays) is used.
+
+        :param address: A memory address of the block.
+        :type address: :class:`int`
+
+        :param size: A size of the memory block in bytes.
+        :type size: :class:`int`
+
+        :param owner: An object owning the memory block.
+        :type owner: Any
+
+        :rtype: :class:`memoryview`
+        """
+
+        array = (ctypes.c_ubyte * size).from_address(address)
+        array.owner = owner
+
+        return memoryview(array).cast("B")
+
+    def view_pixels(self, pixels) -> memoryview:
+        """
+        Creates a `memoryview` of a `PixelBuffer` Golang object in `HxW`
+        (for single-channel images) or `HxWxC` shape.
+
+        Tightly packed pixels are viewed without copying them. If there is
+        padding between the rows (eg. in sub-images), the rows are copied into
+        a new contiguous buffer.
+
+        :param pixels: A `PixelBuffer` Golang object.
+
+        :rtype: :class:`memoryview`
+        """
+
+        buffer = pixels.Buffer()
+        width, height, channels, stride = pixels.Width, pixels.Height, pixels.Channels, pixels.Stride
+
+        view = self.view_memory(buffer.Address(), buffer.Len(), pixels)
+
+        if stride != width * channels:
+            row_size = width * channels
+            view = memoryview(bytearray().join(view[y*stride:y*stride + row_size] for y in range(height)))
+
+        shape: List[int] = [height, width]
+        if channels > 1:
+            shape.append(channels)
+
+        return view.cast("B", shape)
+
+    def pack_colors(self, colors: List[List[int]]) -> bytes:
+        """
+        Packs a list of RGBA color channel lists into a sequence of 8-bit RGBA quads.
+
+        :param colors: A list of RGBA color channel lists.
+        :type colors: List[List[int]]
+
+        :rtype: :class:`bytes`
+        """
+
+        return bytes(channel for color in colors for channel in color)
+
+    def unpack_colors(self, data: bytes) -> List[List[int]]:
+        """
+        Unpacks a sequence of 8-bit RGBA quads into a list of RGBA color channel lists.
+
+        :param data: Packed RGBA colors.
+        :type data: :class:`bytes`
+
+        :rtype: List[List[int]]
+        """
+
+        return [list(data[i:i+4]) for i in range(0, len(data), 4)]
@@ -0,0 +1,115 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of the ``LRUCache``.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe cache discarding the least recently used values first.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("Cache size can't be negative")
+
+        self._maxsize = maxsize
+        self._values: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the value cached under provided key, creating it with ``factory``
+        on a miss.
+
+        ``factory`` is called without holding the lock, so slow factories don't
+        block lookups of other keys. If two threads miss the same key at once,
+        the value created first is kept and returned to both of them.
+
+        :param key: A hashable key of the value.
+        :type key: Hashable
+
+        :param factory: A function creating the value.
+        :type factory: Callable[[], Any]
+        """
+
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return self._values[key]
+
+            self._misses += 1
+
+        value = factory()
+
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+
+            if self._maxsize == 0:
+                return value
+
+            self._values[key] = value
+            self._evict()
+
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Changes the maximum amount of cached values, evicting the least
+        recently used values that don't fit anymore.
+
+        :param maxsize: A new maximum amount of cached values.
+        :type maxsize: :class:`int`
+        """
+
+        if maxsize < 0:
+            raise ValueError("Cache size can't be negative")
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes all cached values and resets the statistics.
+        """
+
+        with self._lock:
+            self._values.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the statistics of the cache.
+
+        :rtype: CacheInfo
+        """
+
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._values), self._maxsize)
+
+    def _evict(self) -> None:
+        while len(self._values) > self._maxsize:
+            self._values.popitem(last=False)
+            self._evictions += 1
@@ -29,20 +29,37 @@ class ColorUtils:
         :returns: An `color.RGBA` Golang object for use in color palettes.
         """
 
+        r, g, b, a = self.color_to_channels(color_value)
+
+        return dither_go.CreateRGBA(r, g, b, a)
+
+    def color_to_channels(self, color_value: Union[List[int], str]) -> List[int]:
+        """
+        Converts either an list of RGB color channels or hexadecimal representation
+        to the list of four RGBA color channels, without creating any Golang objects.
+
+        :param color_value: Either an list of RGB color channels or hex color code.
+        :type color_value: Union[List[int], str]
+
+        :raises InvalidColorError: When there is an error during color code parsing or
+        reading a color representation type.
+
+        :returns: An list of RGBA color channels.
+        :rtype: List[int]
+        """
+
         if not isinstance(color_value, list) and not isinstance(color_value, str):
             raise InvalidColorError("Invalid format of color value provided")
 
         if isinstance(color_value, list):
-            rgba_list = self.is_valid_rgba(color_value)
+            rgba_list = [int(channel) for channel in self.is_valid_rgba(color_value)]
         elif isinstance(color_value, str):
             rgba_list = self.is_valid_hex(color_value)
 
         if len(rgba_list) == 3:
             rgba_list.append(255)
 
-        r, g, b, a = rgba_list
-
-        return dither_go.CreateRGBA(r, g, b, a)
+        return rgba_list
 
     def is_valid_hex(self, hex_value: str) -> List[int]:
         """
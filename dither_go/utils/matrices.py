@@ -1,13 +1,10 @@
 # Copyright 2023, tfuxu <https://github.com/tfuxu>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from dataclasses import asdict
 from typing import List, Tuple
 
-from simple_parsing.docstring import get_attribute_docstring
-
 from dither_go import ErrorDiffusionMatrix, OrderedDitherMatrix
-from dither_go.matrices import ErrorDiffusers, OrderedDitherers
+from dither_go.algorithms import ERROR_DIFFUSION, ORDERED, get_matrix, list_algorithms
 
 
 class MatrixUtils:  # pylint: disable=R0903
@@ -26,21 +23,12 @@ class MatrixUtils:  # pylint: disable=R0903
         :rtype: Tuple[List[Tuple[str, ErrorDiffusionMatrix]], List[Tuple[str, OrderedDitherMatrix]]]
         """
 
-        error_diffusers = asdict(ErrorDiffusers())
-        ordered_ditherers = asdict(OrderedDitherers())
-
-        error_matrices = []
-        for key in error_diffusers:
-            field_docstring = get_attribute_docstring(ErrorDiffusers, key).docstring_below
-            display_name = field_docstring.strip().partition("\n")[0]
-
-            error_matrices.append((display_name, error_diffusers[key]))
-
-        ordered_matrices = []
-        for key in ordered_ditherers:
-            field_docstring = get_attribute_docstring(OrderedDitherers, key).docstring_below
-            display_name = field_docstring.strip().partition("\n")[0]
+        error_matrices = [
+            (info.display_name, get_matrix(info.name)) for info in list_algorithms(ERROR_DIFFUSION)
+        ]
 
-            ordered_matrices.append((display_name, ordered_ditherers[key]))
+        ordered_matrices = [
+            (info.display_name, get_matrix(info.name)) for info in list_algorithms(ORDERED)
+        ]
 
         return error_matrices, ordered_matrices
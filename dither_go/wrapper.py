@@ -1,10 +1,16 @@
 # Copyright 2023, tfuxu <https://github.com/tfuxu>
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import List, Union
+import os
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+from dither_go.algorithms import ORDERED, get_algorithm, get_matrix
+from dither_go.exceptions import DitherGoError, InvalidColorError
+from dither_go.utils.buffer import BufferUtils
+from dither_go.utils.cache import CacheInfo, LRUCache
 from dither_go.utils.color import ColorUtils
-from dither_go.bindings import dither, dither_go
+from dither_go.bindings import dither, dither_go, go
 
 
 # ---- Classes ---
@@ -25,6 +31,269 @@ class Ditherer(dither.Ditherer):
     Read the docs before using!
     """
 
+    # `Engine` Golang object used for dithering, once a search strategy is set
+    _engine = None
+
+    def UseEngine(self) -> None:
+        """
+        Makes images be dithered by an ``Engine`` Golang object, which implements
+        error diffusion and pixel mapper dithering on its own. It does nothing if
+        the ``Engine`` is already used.
+
+        Unlike the ``Ditherer``, ``Engine`` spreads error diffusion over
+        ``runtime.GOMAXPROCS(0)`` workers, unless ``SingleThreaded`` is set.
+        Rows are processed in a skewed wavefront, each one a few pixels behind
+        the row above it, and errors are spread and rounded in the same order
+        as the ``Ditherer`` does, so the output is exactly the same as the
+        ``Ditherer``'s. In ``Serpentine`` mode each row has to wait for the
+        whole row above it, so only reading and writing pixels is parallel.
+
+        :rtype: :class:`None`
+        """
+
+        if self._engine is None:
+            self._engine = dither_go.NewEngine(self)
+
+    def SetSearch(self, strategy: str) -> None:
+        """
+        Sets the strategy of finding the closest palette colors, used when
+        dithering with an error diffusion matrix or a pixel mapper.
+
+        ``"scan"`` compares each pixel with every palette color, which is fast
+        enough for small palettes. ``"lut"`` builds a lookup table of candidate
+        colors once, which makes dithering with large palettes (eg. 64 colors
+        and more) several times faster. ``"kdtree"`` searches a k-d tree of the
+        palette colors, which is slower than the lookup table, but is built
+        almost instantly and uses little memory, even for palettes of thousands
+        of colors.
+
+        Once a strategy is set, images are dithered by an ``Engine`` Golang
+        object (see ``UseEngine``), which converts, compares and rounds colors
+        exactly like the ``Ditherer``, so all strategies produce the same images
+        as the ``Ditherer`` itself. Images with transparent pixels or 16-bit
+        channels are still dithered by the ``Ditherer``.
+
+        :param strategy: A name of the strategy: ``"scan"``, ``"lut"`` or ``"kdtree"``.
+        :type strategy: :class:`str`
+
+        :raises Exception: If the strategy is unknown.
+
+        :rtype: :class:`None`
+        """
+
+        self.UseEngine()
+
+        try:
+            self._engine.SetSearch(strategy)
+        except Exception as exc:
+            raise exc
+
+    def SetRandomGrayscale(self, min, max, seed: Optional[int] = None) -> None:  # pylint: disable=W0622
+        """
+        Sets grayscale random noise dithering, see ``dither.Ditherer.SetRandomGrayscale``.
+
+        If a seed is provided, noise of each pixel is generated from the seed
+        and the pixel's coordinates, so the same seed always gives the same
+        image, even when pixels are processed concurrently.
+
+        :param min: The lowest value of noise, eg. ``-0.5``.
+        :type min: :class:`float`
+
+        :param max: The highest value of noise, eg. ``0.5``.
+        :type max: :class:`float`
+
+        :param seed: An optional seed of the noise.
+        :type seed: Optional[int]
+
+        :rtype: :class:`None`
+        """
+
+        if seed is None:
+            super().SetRandomGrayscale(min, max)
+            return
+
+        dither_go.SetSeededRandomGrayscale(self, seed & 0xFFFFFFFFFFFFFFFF, min, max)
+
+    def SetRandomRGB(self, minR, maxR, minG, maxG, minB, maxB, seed: Optional[int] = None) -> None:  # pylint: disable=R0913
+        """
+        Sets RGB random noise dithering, see ``dither.Ditherer.SetRandomRGB``.
+
+        If a seed is provided, noise of each pixel is generated from the seed
+        and the pixel's coordinates, so the same seed always gives the same
+        image, even when pixels are processed concurrently.
+
+        :param seed: An optional seed of the noise.
+        :type seed: Optional[int]
+
+        :rtype: :class:`None`
+        """
+
+        if seed is None:
+            super().SetRandomRGB(minR, maxR, minG, maxG, minB, maxB)
+            return
+
+        dither_go.SetSeededRandomRGB(self, seed & 0xFFFFFFFFFFFFFFFF, minR, maxR, minG, maxG, minB, maxB)
+
+    def SetBlueNoise(self, strength: float = 1.0, size: int = 64) -> None:
+        """
+        Sets ordered dithering with a tileable blue noise texture, like ``SetOrdered``.
+
+        Thresholds of the texture are spread evenly, without visible patterns,
+        so images look similar to error diffusion, but pixels are still mapped
+        independently, using all CPUs. The texture is generated once per size,
+        and cached in memory and in the user's cache directory (or in
+        ``DITHER_GO_CACHE_DIR``, if it's set).
+
+        :param strength: A strength of the matrix, usually from 0 to 1.0.
+        :type strength: :class:`float`
+
+        :param size: A width and height of the texture, from 4 to 256.
+        Generating large textures for the first time takes a moment
+        (under a second for 128, about ten seconds for 256).
+        :type size: :class:`int`
+
+        :raises Exception: If the size is out of range.
+
+        :rtype: :class:`None`
+        """
+
+        self.SetOrdered(dither_go.BlueNoise(size), strength)
+
+    def SetWorkers(self, workers: int) -> None:
+        """
+        Sets the maximum amount of goroutines dithering each image with error
+        diffusion or a pixel mapper. Images are then dithered by an ``Engine``
+        Golang object (see ``UseEngine``).
+
+        :param workers: A positive number, ``WORKERS_DEFAULT`` to use the
+        process-wide default (see ``set_default_workers``), or ``WORKERS_AUTO``
+        to pick the amount from the area of each image, so small images are
+        dithered by a single goroutine. ``SingleThreaded`` still makes it use one.
+        :type workers: :class:`int`
+
+        :raises Exception: If the amount is negative.
+
+        :rtype: :class:`None`
+        """
+
+        self.UseEngine()
+
+        try:
+            self._engine.SetWorkers(workers)
+        except Exception as exc:
+            raise exc
+
+    def GetWorkers(self) -> int:
+        """
+        Returns the amount of workers set with ``SetWorkers``, or ``WORKERS_DEFAULT``.
+
+        :rtype: :class:`int`
+        """
+
+        if self._engine is None:
+            return WORKERS_DEFAULT
+
+        return self._engine.Workers()
+
+    def GetSearch(self) -> Optional[str]:
+        """
+        Returns the name of the strategy of finding the closest palette colors,
+        or ``None`` if it wasn't set with ``SetSearch``.
+
+        :rtype: Optional[str]
+        """
+
+        if self._engine is None:
+            return None
+
+        return self._engine.Search()
+
+    def _engine_for(self, src):
+        """
+        Returns the ``Engine`` dithering provided image, or ``None`` if the
+        ``Ditherer`` dithers it itself.
+
+        A ``PreparedImage`` is always dithered by an ``Engine``, as the ``Ditherer``
+        would convert the pixels of its source image again. The ``Engine`` is
+        kept, like one set up with ``UseEngine``.
+        """
+
+        if self._engine is None and isinstance(src, dither_go.PreparedImage):
+            # Bypasses FrozenDitherer's guard, the Engine doesn't change the output
+            object.__setattr__(self, "_engine", dither_go.NewEngine(self))
+
+        return self._engine
+
+    def Dither(self, src):
+        """Dithers the provided image, see ``dither.Ditherer.Dither``."""
+
+        engine = self._engine_for(src)
+        if engine is None:
+            return super().Dither(src)
+
+        return engine.Dither(src)
+
+    def DitherCopy(self, src):
+        """Dithers a copy of the provided image, see ``dither.Ditherer.DitherCopy``."""
+
+        engine = self._engine_for(src)
+        if engine is None:
+            return super().DitherCopy(src)
+
+        return engine.DitherCopy(src)
+
+    def DitherPaletted(self, src):
+        """Dithers a copy of the provided image to ``image.Paletted``, see ``dither.Ditherer.DitherPaletted``."""
+
+        engine = self._engine_for(src)
+        if engine is None:
+            return super().DitherPaletted(src)
+
+        return engine.DitherPaletted(src)
+
+    def DitherInto(self, dst, src) -> None:
+        """Dithers the provided image into ``dst``, see ``dither_into``."""
+
+        dither_into(self, dst, src)
+
+    def GetColorModel(self):
+        """Returns a ``color.Model`` converting colors to the closest palette color."""
+
+        if self._engine is None:
+            return super().GetColorModel()
+
+        return self._engine.GetColorModel()
+
+
+class FrozenDitherer(Ditherer):
+    """
+    FrozenDitherer is a ``Ditherer`` which settings can't be changed from Python.
+    It's returned by ``get_ditherer``, where the same object is shared by all
+    callers asking for the same settings.
+
+    Setting any of its members, or calling any of its ``Set*`` and ``ClearMapper``
+    methods raises ``DitherGoError``.
+
+    .. warning:: Only the Python side is frozen. ``Matrix`` returns a handle to
+       the Golang matrix the ditherer uses (which is also the one in ``ErrorDiffusers``
+       when no strength is applied), not a copy, so changing its values changes
+       the output of every caller. Copy the matrix and create a new ``Ditherer``
+       with it instead. ``GetPalette`` returns a copy of the palette, so changing
+       it doesn't change the ditherer.
+    """
+
+    def __setattr__(self, name, value):
+        if name == "handle" and "handle" not in self.__dict__:
+            super().__setattr__(name, value)
+            return
+
+        raise DitherGoError(f"Can't set {name} of a shared FrozenDitherer, create a new Ditherer instead")
+
+    def _frozen(self, *_args, **_kwargs):
+        raise DitherGoError("Can't change a shared FrozenDitherer, create a new Ditherer instead")
+
+    SetBayer = SetOrdered = SetRandomGrayscale = SetRandomRGB = ClearMapper = SetSearch = UseEngine = SetBlueNoise = SetWorkers = _frozen
+
 
 class OrderedDitherMatrix(dither.OrderedDitherMatrix):
     """
@@ -59,7 +328,7 @@ class ErrorDiffusionMatrix(dither.ErrorDiffusionMatrix):
 
 
 # ---- Constructors ---
-def new_ditherer(palette):
+def new_ditherer(palette, search: Optional[str] = None):
     """
     Creates a new ``Ditherer`` object that uses a copy of the provided palette.
     If the palette is None, then None will be returned.
@@ -68,11 +337,186 @@ def new_ditherer(palette):
 
     :param palette: A color palette created using ``create_palette`` function.
 
-    :returns: A new ``Ditherer`` Golang object with provided color palette.
+    :param search: An optional strategy of finding the closest palette colors,
+    prepared once for the palette (see ``Ditherer.SetSearch``).
+    :type search: Optional[str]
+
+    :raises Exception: If the search strategy is unknown.
+
+    :returns: A new ``Ditherer`` object with provided color palette.
+    """
+
+    if palette is None:
+        return None
+
+    ditherer = Ditherer(handle=dither.NewDitherer(palette).handle)
+
+    if search is not None:
+        ditherer.SetSearch(search)
+
+    return ditherer
+
+def _go_ditherer(ditherer, src=None):
+    """
+    Returns the Golang object dithering images (or provided image) for provided
+    ``Ditherer``, which is its ``Engine`` if one is used (see ``Ditherer.UseEngine``)
+    or if the image is a ``PreparedImage``.
+    """
+
+    if isinstance(ditherer, Ditherer):
+        engine = ditherer._engine_for(src)  # pylint: disable=W0212
+    else:
+        engine = getattr(ditherer, "_engine", None)
+    if engine is None:
+        return ditherer
+
+    return engine
+
+
+# ---- Ditherer Cache ---
+DITHERER_CACHE_SIZE = 32
+"""Default maximum amount of ditherers kept by ``get_ditherer``."""
+
+_ditherer_cache = LRUCache(DITHERER_CACHE_SIZE)
+
+def get_ditherer(
+    palette_spec: Union[List[Union[str, List[int]]], bytes, bytearray, memoryview],
+    algorithm: str = "FloydSteinberg",
+    strength: float = 1.0,
+    serpentine: bool = False
+) -> FrozenDitherer:
+    """
+    Returns a ready to use ``Ditherer`` with provided settings, creating it only
+    if the same settings weren't requested recently.
+
+    Ditherers are kept in a process-wide cache discarding the least recently
+    used ones first, so applications dithering images with a small set of
+    palettes don't need to create and linearize the same palette for every image.
+    Returned ditherers are shared between all callers, and can be used concurrently,
+    but can't be changed (see ``FrozenDitherer``).
+
+    :param palette_spec: A palette in any form accepted by ``create_palette``.
+    Colors written in different forms (eg. ``"#000000"`` and ``[0, 0, 0]``)
+    are considered equal.
+    :type palette_spec: Union[List[Union[str, List[int]]], bytes, bytearray, memoryview]
+
+    :param algorithm: A name of the matrix from ``ErrorDiffusers`` or ``OrderedDitherers``.
+    :type algorithm: :class:`str`
+
+    :param strength: A strength of the matrix, usually from 0 to 1.0.
+    :type strength: :class:`float`
+
+    :param serpentine: Whether to apply error diffusion in a serpentine manner.
+    It's ignored by ordered dithering matrices.
+    :type serpentine: :class:`bool`
+
+    :raises InvalidColorError: When there is an error during color parsing/conversion.
+    :raises DitherGoError: When there is no matrix with provided name.
+
+    :returns: A shared ``FrozenDitherer`` object.
+    """
+
+    if isinstance(palette_spec, (bytes, bytearray, memoryview)):
+        palette_key = bytes(palette_spec)
+    else:
+        color_utils = ColorUtils()
+        palette_key = BufferUtils().pack_colors(
+            [color_utils.color_to_channels(value) for value in palette_spec]
+        )
+
+    is_ordered = get_algorithm(algorithm).kind == ORDERED
+
+    strength = float(strength)
+    serpentine = bool(serpentine) and not is_ordered
+
+    def create_ditherer() -> FrozenDitherer:
+        ditherer = new_ditherer(create_palette(palette_key))
+
+        if is_ordered:
+            ditherer.SetOrdered(get_matrix(algorithm), strength)
+        else:
+            matrix = get_matrix(algorithm)
+            if strength != 1.0:
+                matrix = error_diffusion_strength(matrix, strength)
+
+            ditherer.Matrix = matrix
+            ditherer.Serpentine = serpentine
+
+        return FrozenDitherer(handle=ditherer.handle)
+
+    key = (palette_key, algorithm, strength, serpentine)
+    return _ditherer_cache.get_or_create(key, create_ditherer)
+
+def ditherer_cache_info() -> CacheInfo:
+    """
+    Returns the statistics of the cache used by ``get_ditherer``.
+
+    Use them to size the cache with ``set_ditherer_cache_size``: many
+    evictions with few hits mean that the cache is too small for the
+    amount of palettes used by the application.
+
+    :returns: A named tuple with ``hits``, ``misses``, ``evictions``,
+    current ``size`` and ``maxsize`` of the cache.
+    :rtype: CacheInfo
+    """
+
+    return _ditherer_cache.info()
+
+def set_ditherer_cache_size(maxsize: int) -> None:
+    """
+    Changes the maximum amount of ditherers kept by ``get_ditherer``.
+    Setting it to 0 disables the cache.
+
+    :param maxsize: A new maximum amount of cached ditherers.
+    :type maxsize: :class:`int`
+    """
+
+    _ditherer_cache.resize(maxsize)
+
+def clear_ditherer_cache() -> None:
+    """
+    Removes all ditherers kept by ``get_ditherer`` and resets the statistics.
+    """
+
+    _ditherer_cache.clear()
+
+
+# ---- Workers ---
+WORKERS_DEFAULT = 0
+"""Use the process-wide default amount of workers, same as ``WorkersDefault`` Golang constant."""
+
+WORKERS_AUTO = -1
+"""Pick the amount of workers from the area of each image, same as ``WorkersAuto`` Golang constant."""
+
+def set_default_workers(workers: int) -> None:
+    """
+    Sets the maximum amount of goroutines dithering each image, for all
+    ditherers using an ``Engine`` (see ``Ditherer.UseEngine``) that don't
+    have their own amount set with ``Ditherer.SetWorkers``.
+
+    When several images are dithered at once, limiting the amount of workers
+    of each one prevents them from starting more goroutines than there are CPUs.
+
+    :param workers: A positive number, ``WORKERS_DEFAULT`` for one worker per
+    CPU (the initial value) or ``WORKERS_AUTO``.
+    :type workers: :class:`int`
+
+    :raises Exception: If the amount is negative.
+    """
+
+    try:
+        dither_go.SetDefaultWorkers(workers)
+    except Exception as exc:
+        raise exc
+
+def get_default_workers() -> int:
+    """
+    Returns the process-wide default amount of workers.
+
+    :rtype: :class:`int`
     """
 
-    # TODO: Use inherited Dither class instead
-    return dither.NewDitherer(palette)
+    return dither_go.DefaultWorkers()
 
 
 # ---- Library Functions ---
@@ -131,11 +575,47 @@ def open_image(path: str):
     else:
         return img_data
 
-def save_image(img_data, output_path: str, encode_format: str) -> None:
+def open_image_bytes(data):
+    """
+    Decodes image data stored in memory using ``image.Decode`` Golang function.
+
+    Provided data is passed to Go without writing it to the disk. ``bytes`` and
+    writable buffers (eg. ``bytearray``) aren't copied, while other read-only
+    buffers are copied once.
+
+    .. note:: Check ``format_matrix.md`` document for information about
+    supported image formats.
+
+    :param data: An object supporting the buffer protocol (eg. ``bytes``,
+    ``bytearray`` or ``memoryview``) with encoded image contents.
+
+    :raises InvalidBufferError: If provided object can't be passed to Go.
+    :raises Exception: If there is a failure in image decoding.
+
+    :returns: An ``image.Image`` Golang object containing image data.
+    """
+
+    # `_owner` keeps the memory alive until Go is done with it
+    address, size, _owner = BufferUtils().get_address(data)
+
+    try:
+        img_data = dither_go.OpenImageBuffer(address, size)
+    except Exception as exc:
+        raise exc
+    else:
+        return img_data
+
+def save_image(img_data, output_path: str, encode_format: str, ditherer=None) -> None:
     """
     Saves provided image data in specified output path and
     encodes it to the supported format.
 
+    Images saved as GIF are encoded with the colors they already use, if
+    there are at most 256 of them (eg. images dithered by ``Ditherer.Dither``),
+    or with their own palette (eg. images from ``Ditherer.DitherPaletted``).
+    To save an image that isn't dithered yet as GIF, provide a ``Ditherer``,
+    which is then used to reduce its colors.
+
     .. note:: Check ``format_matrix.md`` document for information about
     supported image formats and their names used in ``encode_format``.
 
@@ -145,36 +625,688 @@ def save_image(img_data, output_path: str, encode_format: str) -> None:
     :param encode_format: A name of the image format used in encoding.
     :type encode_format: :class:`str`
 
+    :param ditherer: An optional ``Ditherer`` object used to reduce colors
+    of images encoded to GIF.
+
     :raises Exception: If there is a failure in I/O operations or image encoding.
 
     :rtype: :class:`None`
     """
 
     try:
-        dither_go.SaveImage(img_data, output_path, encode_format)
+        if ditherer is None:
+            dither_go.SaveImage(img_data, output_path, encode_format)
+        else:
+            dither_go.SaveImageWithDitherer(img_data, output_path, encode_format, ditherer)
     except Exception as exc:
         raise exc
 
-def create_palette(color_list: List[Union[str, List[int]]]):
+def encode_image(img_data, encode_format: str, ditherer=None) -> bytes:
+    """
+    Encodes provided image data to the supported format in memory,
+    without writing it to the disk.
+
+    See ``save_image`` for the details on encoding GIF images.
+
+    .. note:: Check ``format_matrix.md`` document for information about
+    supported image formats and their names used in ``encode_format``.
+
+    :param encode_format: A name of the image format used in encoding.
+    :type encode_format: :class:`str`
+
+    :param ditherer: An optional ``Ditherer`` object used to reduce colors
+    of images encoded to GIF.
+
+    :raises Exception: If there is a failure in image encoding.
+
+    :returns: The encoded image contents.
+    :rtype: :class:`bytes`
+    """
+
+    try:
+        if ditherer is None:
+            buffer = dither_go.EncodeImage(img_data, encode_format)
+        else:
+            buffer = dither_go.EncodeImageWithDitherer(img_data, encode_format, ditherer)
+    except Exception as exc:
+        raise exc
+    else:
+        return BufferUtils().read_bytes(buffer)
+
+def image_from_array(array, premultiplied: bool = False):
+    """
+    Creates a new ``image.Image`` Golang object from an array of 8-bit pixels,
+    like a C-contiguous NumPy ``uint8`` array in ``HxW``, ``HxWx1``, ``HxWx3``
+    or ``HxWx4`` shape.
+
+    Writable grayscale and RGBA arrays are shared with Go without copying,
+    so an ``image.Gray`` or ``image.NRGBA`` (``image.RGBA`` if ``premultiplied``
+    is set) image is backed by the array memory, and dithering it in place
+    using ``Ditherer.Dither`` writes the result straight into the array.
+    Read-only arrays are copied once, as well as RGB arrays which are stored
+    in a new ``image.RGBA`` image, as Go doesn't have a type for images
+    without alpha channel.
+
+    .. warning:: Shared arrays must be kept alive and can't be resized
+    for as long as the image is in use.
+
+    :param array: An object supporting the buffer protocol with pixel data.
+
+    :param premultiplied: Whether RGB channels of RGBA arrays are already
+    multiplied by the alpha channel.
+    :type premultiplied: :class:`bool`
+
+    :raises InvalidBufferError: If provided array can't be passed to Go.
+
+    :returns: An ``image.Image`` Golang object containing image data.
+    """
+
+    buffer_utils = BufferUtils()
+
+    height, width, channels = buffer_utils.get_image_shape(array)
+    address, _size, owner = buffer_utils.get_address(array)
+
+    # Never let Go write into read-only memory
+    copy_data = memoryview(array).readonly
+
+    try:
+        img_data = dither_go.ImageFromBuffer(address, width, height, channels, premultiplied, copy_data)
+    except Exception as exc:
+        raise exc
+
+    # Keep the shared memory alive together with the Golang object
+    img_data.buffer_owner = owner
+
+    return img_data
+
+# Pixel buffers of views sharing memory with images, by the address and
+# length of the memory. Handles can't be used, as gopy creates a new one
+# for each Python object wrapping the same image.
+_pixel_views: Dict[Tuple[int, int], "weakref.WeakSet"] = {}
+
+def _track_view(pixels) -> None:
+    """
+    Remembers that a view keeping provided ``PixelBuffer`` alive shares its
+    memory, so ``release_image`` can refuse to release the image while the view
+    is used. Pixel buffers are forgotten once all views of them are deleted.
+    """
+
+    for memory in [memory for memory, views in _pixel_views.items() if not views]:
+        del _pixel_views[memory]
+
+    buffer = pixels.Buffer()
+    _pixel_views.setdefault((buffer.Address(), buffer.Len()), weakref.WeakSet()).add(pixels)
+
+def image_to_array(img_data) -> memoryview:
+    """
+    Exposes pixels of provided image (eg. returned from ``Ditherer`` methods)
+    as a ``memoryview`` in ``HxW`` shape for single-channel images, or ``HxWx4``
+    shape for RGBA images.
+
+    Pixels of ``image.Gray``, ``image.Paletted``, ``image.NRGBA`` and
+    ``image.RGBA`` images are shared with Go without copying them, so the
+    returned view stays valid even after the Golang object is gone, but not
+    after it's given back with ``release_image``. For ``image.Paletted``
+    images the view holds palette indexes, use ``image_palette`` to get
+    the palette itself. Images of other types are copied into a new
+    ``image.RGBA`` image first.
+
+    .. note:: ``image.RGBA`` images store colors with premultiplied alpha.
+    Use ``image_mode`` to check how the returned pixels are stored.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If provided image is empty.
+
+    :rtype: :class:`memoryview`
+    """
+
+    try:
+        pixels = dither_go.ImagePixels(img_data)
+    except Exception as exc:
+        raise exc
+    else:
+        _track_view(pixels)
+        return BufferUtils().view_pixels(pixels)
+
+def image_to_numpy(img_data):
+    """
+    Exposes pixels of provided image as a NumPy ``uint8`` array, without
+    copying them. See ``image_to_array`` for the details.
+
+    .. note:: This function requires NumPy to be installed.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises ImportError: If NumPy isn't installed.
+    :raises Exception: If provided image is empty.
+
+    :returns: A ``numpy.ndarray`` object sharing memory with the image.
+    """
+
+    import numpy  # pylint: disable=C0415
+
+    return numpy.asarray(image_to_array(img_data))
+
+def image_mode(img_data) -> str:
+    """
+    Returns the name of the format pixels of provided image are exposed in
+    by ``image_to_array``, using the mode names known from Pillow:
+    ``L`` (grayscale), ``P`` (palette indexes), ``RGBA`` and ``RGBa``
+    (RGBA with premultiplied alpha). Unlike ``image_to_array``, it doesn't copy
+    pixels of images stored in other formats.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If provided image is empty.
+
+    :rtype: :class:`str`
+    """
+
+    try:
+        mode = dither_go.ImageMode(img_data)
+    except Exception as exc:
+        raise exc
+    else:
+        return mode
+
+def image_palette(img_data) -> List[List[int]]:
+    """
+    Returns the palette of provided ``image.Paletted`` image (eg. returned from
+    ``Ditherer.DitherPaletted``) as a list of RGBA color channel lists.
+
+    :param img_data: An ``image.Paletted`` Golang object.
+
+    :raises Exception: If provided image doesn't have a palette.
+
+    :rtype: List[List[int]]
+    """
+
+    try:
+        buffer = dither_go.ImagePalette(img_data)
+    except Exception as exc:
+        raise exc
+    else:
+        buffer_utils = BufferUtils()
+        return buffer_utils.unpack_colors(buffer_utils.read_bytes(buffer))
+
+def from_pil(image):
+    """
+    Creates a new ``image.Image`` Golang object from a Pillow image,
+    moving its pixels to Go in a single bulk copy.
+
+    ``L``, ``RGB``, ``RGBA`` and ``RGBa`` images are transferred as they are,
+    and ``P`` images (without transparency) are transferred together with
+    their palette as an ``image.Paletted`` image. Images in other modes are
+    converted to ``RGBA`` first.
+
+    .. note:: This function requires Pillow to be installed.
+
+    :param image: A ``PIL.Image.Image`` object.
+
+    :raises Exception: If there is a failure in transferring image data.
+
+    :returns: An ``image.Image`` Golang object containing image data.
+    """
+
+    buffer_utils = BufferUtils()
+    width, height = image.size
+
+    palette = image.getpalette() if image.mode == "P" else None
+
+    if palette is not None and "transparency" not in image.info:
+        palette_data = buffer_utils.pack_colors([palette[i:i+3] + [255] for i in range(0, len(palette), 3)])
+
+        address, _size, _owner = buffer_utils.get_address(image.tobytes())
+        palette_address, palette_size, _palette_owner = buffer_utils.get_address(palette_data)
+
+        try:
+            img_data = dither_go.PalettedImageFromBuffer(address, width, height, palette_address, palette_size)
+        except Exception as exc:
+            raise exc
+        else:
+            return img_data
+
+    if image.mode not in ["L", "RGB", "RGBA", "RGBa"]:
+        image = image.convert("RGBA")
+
+    channels = len(image.getbands())
+    address, _size, _owner = buffer_utils.get_address(image.tobytes())
+
+    try:
+        img_data = dither_go.ImageFromBuffer(address, width, height, channels, image.mode == "RGBa", True)
+    except Exception as exc:
+        raise exc
+    else:
+        return img_data
+
+def to_pil(img_data):
+    """
+    Creates a new Pillow image from an ``image.Image`` Golang object
+    (eg. returned from ``Ditherer`` methods), moving its pixels in a single
+    bulk operation.
+
+    ``image.Paletted`` images (like the ones returned from ``Ditherer.DitherPaletted``)
+    are returned as ``P`` images with their palette attached, ``image.Gray``
+    as ``L`` images and all the other ones as ``RGBA`` images.
+
+    .. note:: Grayscale and palette images share memory with the Golang object
+    until they're modified, so avoid dithering the source image in place
+    while the returned image is used.
+
+    .. note:: This function requires Pillow to be installed.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises Exception: If provided image is empty.
+
+    :returns: A ``PIL.Image.Image`` object.
+    """
+
+    from PIL import Image  # pylint: disable=C0415
+
+    try:
+        pixels = dither_go.ImagePixels(img_data)
+    except Exception as exc:
+        raise exc
+
+    _track_view(pixels)
+
+    buffer_utils = BufferUtils()
+
+    buffer = pixels.Buffer()
+    data = buffer_utils.view_memory(buffer.Address(), buffer.Len(), pixels)
+
+    mode = "RGBA" if pixels.Mode == "RGBa" else pixels.Mode
+    size = (pixels.Width, pixels.Height)
+
+    image = Image.frombuffer(mode, size, data, "raw", pixels.Mode, pixels.Stride, 1)
+
+    if pixels.Mode == "P":
+        palette = image_palette(img_data)
+
+        image.putpalette([channel for color in palette for channel in color[:3]])
+
+        transparent = [index for index, color in enumerate(palette) if color[3] == 0]
+        if transparent:
+            image.info["transparency"] = transparent[0]
+
+    return image
+
+def dither_batch(
+    inputs: Sequence[Union[str, os.PathLike]],
+    outputs: Sequence[Union[str, os.PathLike]],
+    ditherer,
+    encode_format: str,
+    workers: int = 0
+) -> List[Optional[DitherGoError]]:
+    """
+    Opens images from input paths, dithers them using provided ``Ditherer``
+    and saves them in output paths, encoded to the supported format.
+
+    The whole batch is processed in Go by a pool of worker goroutines, without
+    holding the GIL, so images are decoded, dithered and encoded concurrently.
+    This is the fastest way to process many images, especially with error
+    diffusion dithering, which can only use one CPU core per image.
+
+    A failure in processing one image doesn't stop the others from being processed.
+
+    .. note:: Check ``format_matrix.md`` document for information about
+    supported image formats and their names used in ``encode_format``.
+
+    :param inputs: Paths to the images to dither.
+    :type inputs: Sequence[Union[str, os.PathLike]]
+
+    :param outputs: Output paths for the dithered images, in the same order as ``inputs``.
+    :type outputs: Sequence[Union[str, os.PathLike]]
+
+    :param ditherer: A ``Ditherer`` object used to dither all the images.
+
+    :param encode_format: A name of the image format used in encoding.
+    :type encode_format: :class:`str`
+
+    :param workers: An amount of images processed at once. Defaults to the number of CPUs.
+    :type workers: :class:`int`
+
+    :raises Exception: If the amount of input and output paths differs.
+
+    :returns: A list with ``None`` for each successfully processed image,
+    or an error describing why the image at the same position failed.
+    :rtype: List[Optional[DitherGoError]]
+    """
+
+    input_paths = go.Slice_string([os.fspath(path) for path in inputs])
+    output_paths = go.Slice_string([os.fspath(path) for path in outputs])
+
+    try:
+        errors = dither_go.DitherBatch(input_paths, output_paths, _go_ditherer(ditherer), encode_format, workers)
+    except Exception as exc:
+        raise exc
+
+    return [DitherGoError(error) if error else None for error in errors]
+
+def dither_many(img_data, ditherers: Sequence, paletted: bool = False) -> List:
+    """
+    Dithers copies of the same image with several ditherers (eg. one per
+    palette of each target device), concurrently, in a single call to Go.
+    The image remains unchanged.
+
+    Only the dithering itself is done in that call. Passing the ditherers to
+    Go and reading the returned images still takes one (cheap) call to Go per
+    ditherer, so the speedup comes from dithering concurrently, not from
+    fewer calls.
+
+    If more than one of the ditherers uses an ``Engine`` (see ``Ditherer.UseEngine``),
+    the image is converted to linear RGB only once (see ``prepare_image``).
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :param ditherers: ``Ditherer`` objects to dither the image with.
+    :type ditherers: Sequence
+
+    :param paletted: Whether to return ``image.Paletted`` images, like
+    ``DitherPaletted`` does, instead of ``image.RGBA`` ones.
+    :type paletted: :class:`bool`
+
+    :raises Exception: If any of the ditherers fails.
+
+    :returns: A list of dithered images, in the same order as ``ditherers``.
+    """
+
+    group = dither_go.Slice_dither_go_ImageDitherer([_go_ditherer(ditherer, img_data) for ditherer in ditherers])
+
+    try:
+        images = dither_go.DitherMany(img_data, group, paletted)
+    except Exception as exc:
+        raise exc
+
+    return list(images)
+
+def open_animation(path: str):
+    """
+    Opens a GIF file and decodes all of its frames using ``gif.DecodeAll``
+    Golang function.
+
+    :param path: An path to the location of the animation.
+    :type path: :class:`str`
+
+    :raises Exception: If there is a failure in I/O operations or GIF decoding.
+
+    :returns: A ``gif.GIF`` Golang object containing animation frames.
+    """
+
+    try:
+        animation = dither_go.OpenAnimation(path)
+    except Exception as exc:
+        raise exc
+    else:
+        return animation
+
+def open_animation_bytes(data):
+    """
+    Decodes all frames of GIF data stored in memory using ``gif.DecodeAll``
+    Golang function. See ``open_image_bytes`` for the details.
+
+    :param data: An object supporting the buffer protocol (eg. ``bytes``,
+    ``bytearray`` or ``memoryview``) with GIF contents.
+
+    :raises InvalidBufferError: If provided object can't be passed to Go.
+    :raises Exception: If there is a failure in GIF decoding.
+
+    :returns: A ``gif.GIF`` Golang object containing animation frames.
+    """
+
+    # `_owner` keeps the memory alive until Go is done with it
+    address, size, _owner = BufferUtils().get_address(data)
+
+    try:
+        animation = dither_go.OpenAnimationBuffer(address, size)
+    except Exception as exc:
+        raise exc
+    else:
+        return animation
+
+def dither_animation(ditherer, animation, workers: int = 0):
+    """
+    Dithers all frames of provided animation and returns them as a new
+    animation, keeping frame delays, disposal methods and loop count.
+
+    Frames are dithered concurrently in Go, all using the same ``Ditherer``.
+    Transparent pixels stay transparent, by extending the ``Ditherer`` palette
+    with a transparent color, so the palette can have at most 255 colors if the
+    animation uses transparency, and 256 colors otherwise.
+
+    :param ditherer: A ``Ditherer`` object used to dither all the frames.
+
+    :param animation: A ``gif.GIF`` Golang object.
+
+    :param workers: An amount of frames dithered at once. Defaults to the number of CPUs.
+    :type workers: :class:`int`
+
+    :raises Exception: If the palette is too big, or dithering failed.
+
+    :returns: A ``gif.GIF`` Golang object containing dithered frames.
+    """
+
+    try:
+        dithered = dither_go.DitherAnimation(_go_ditherer(ditherer), animation, workers)
+    except Exception as exc:
+        raise exc
+    else:
+        return dithered
+
+def save_animation(animation, output_path: str) -> None:
+    """
+    Saves all frames of provided animation as a GIF file in specified output path.
+
+    :param animation: A ``gif.GIF`` Golang object.
+
+    :param output_path: An path to the output location of the animation.
+    :type output_path: :class:`str`
+
+    :raises Exception: If there is a failure in I/O operations or GIF encoding.
+
+    :rtype: :class:`None`
+    """
+
+    try:
+        dither_go.SaveAnimation(animation, output_path)
+    except Exception as exc:
+        raise exc
+
+def encode_animation(animation) -> bytes:
+    """
+    Encodes all frames of provided animation as GIF in memory.
+
+    :param animation: A ``gif.GIF`` Golang object.
+
+    :raises Exception: If there is a failure in GIF encoding.
+
+    :returns: The encoded GIF contents.
+    :rtype: :class:`bytes`
+    """
+
+    try:
+        buffer = dither_go.EncodeAnimation(animation)
+    except Exception as exc:
+        raise exc
+    else:
+        return BufferUtils().read_bytes(buffer)
+
+def create_palette(color_list: Union[List[Union[str, List[int]]], bytes, bytearray, memoryview]):
     """
     Creates a new color palette for use in dithered images.
 
     It supports mixing hexadecimal color codes (in short, normal and extended forms),
     with lists of RGB color channels (with and without alpha channel provided).
 
+    Colors can be also provided as a bytes-like object of packed 8-bit RGBA quads.
+    In both cases, the whole palette is created in a single call to Go.
+
     :param color_list: A list with hex color values and/or lists of RGBA channel
-    value representations written using integers.
-    :type color_list: List[Union[str, List[int]]]
+    value representations written using integers, or packed RGBA quads.
+    :type color_list: Union[List[Union[str, List[int]]], bytes, bytearray, memoryview]
 
     :raises InvalidColorError: When there is an error during color parsing/conversion.
 
     :returns: An list of ``color.RGBA`` Golang objects for use in image dithering.
     """
 
-    color_utils = ColorUtils()
+    if isinstance(color_list, (bytes, bytearray, memoryview)):
+        data = color_list
+    else:
+        color_utils = ColorUtils()
+        data = BufferUtils().pack_colors(
+            [color_utils.color_to_channels(value) for value in color_list]
+        )
+
+    # `_owner` keeps the memory alive until Go is done with it
+    address, size, _owner = BufferUtils().get_address(data)
+
+    if size == 0 or size % 4 != 0:
+        raise InvalidColorError("Provided palette doesn't consist of RGBA colors")
+
+    try:
+        palette = dither_go.CreatePaletteFromBuffer(address, size)
+    except Exception as exc:
+        raise exc
+    else:
+        return palette
+
+def generate_palette(img_data, size: int, method: str = "median_cut", sample: int = 0):
+    """
+    Generates a color palette of at most ``size`` colors, representing the colors
+    of provided image, for use in ``new_ditherer``.
+
+    Palettes are generated in Go, using all available CPUs. Supported methods are:
+
+    - ``"median_cut"`` - splits the colors into boxes of similar colors, always
+      cutting the box with the widest range of a channel at its median pixel
+    - ``"kmeans"`` - refines the median cut palette with k-means clustering,
+      which is slower, but usually represents the image better
+    - ``"octree"`` - builds an octree of the colors and merges its least used leaves
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :param size: The maximum amount of colors in the palette. It can have fewer
+    colors if the image doesn't have enough distinct colors.
+    :type size: :class:`int`
+
+    :param method: A name of the palette generation method.
+    :type method: :class:`str`
+
+    :param sample: If a positive number, at most that many pixels, spread evenly
+    across the image, are used, which speeds up generating palettes of large images.
+    :type sample: :class:`int`
+
+    :raises Exception: If the method is unknown or the image has no opaque pixels.
+
+    :returns: An list of ``color.RGBA`` Golang objects for use in image dithering.
+    """
+
+    try:
+        palette = dither_go.GeneratePalette(img_data, size, method, sample)
+    except Exception as exc:
+        raise exc
+    else:
+        return palette
+
+def prepare_image(img_data):
+    """
+    Converts provided image once to the linear RGB channels used for dithering,
+    so it can be dithered with many palettes without converting it again for
+    each one. Pass the returned object to ``Dither``, ``DitherCopy`` or
+    ``DitherPaletted`` methods of a ``Ditherer`` instead of the image.
+
+    The prepared channels are read by an ``Engine``, so a ``Ditherer`` given
+    a prepared image switches to one (see ``Ditherer.UseEngine``), which gives
+    the same output. The source image shouldn't be changed while the prepared
+    image is used.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :returns: A ``PreparedImage`` Golang object.
+    """
+
+    return dither_go.PrepareImage(img_data)
+
+def dither_into(ditherer, dst, src) -> None:
+    """
+    Dithers provided image and writes the result to the ``dst`` image, which
+    must have the same bounds, eg. one returned by ``acquire_image``. The ``src``
+    image remains unchanged, unless it's the ``dst`` image.
+
+    A ditherer using an ``Engine`` (see ``Ditherer.UseEngine``) writes the
+    pixels straight to ``dst``, so dithering many images of the same size
+    (eg. frames of a video) into the same buffer doesn't allocate a new image
+    for each one. Other ditherers draw ``src`` onto ``dst`` and dither it in place,
+    so ``dst`` can't be an ``image.Paletted`` then.
+
+    :param ditherer: A ``Ditherer`` object.
+    :param dst: An ``image.RGBA``, ``image.NRGBA``, ``image.Paletted`` or other
+    ``draw.Image`` Golang object. Palette of ``image.Paletted`` must be equal to
+    the ditherer's palette, and the ditherer must use an ``Engine``.
+    :param src: An ``image.Image`` Golang object.
+
+    :raises Exception: If the bounds or palettes of the images differ, or
+    ``dst`` is an ``image.Paletted`` and the ditherer doesn't use an ``Engine``.
+
+    :rtype: :class:`None`
+    """
+
+    try:
+        dither_go.DitherInto(_go_ditherer(ditherer, src), dst, src)
+    except Exception as exc:
+        raise exc
+
+def acquire_image(like, ditherer=None):
+    """
+    Returns an image with the same bounds as provided image, to be used as
+    a destination of ``dither_into``. A pixel buffer of an image given back
+    with ``release_image`` is reused if there's one of the same size, so its
+    pixels are not cleared.
+
+    :param like: An ``image.Image`` Golang object.
+
+    :param ditherer: If provided, an ``image.Paletted`` with its palette
+    is returned, instead of an ``image.RGBA``.
+
+    :returns: An ``image.RGBA`` or ``image.Paletted`` Golang object.
+    """
+
+    if ditherer is None:
+        return dither_go.AcquireRGBA(like)
+
+    return dither_go.AcquirePaletted(like, ditherer.GetPalette())
+
+def release_image(img_data) -> None:
+    """
+    Gives the pixel buffer of provided image back for reuse by ``acquire_image``,
+    and by images dithered with ``dither_batch`` and ``dither_go.aio``. The image
+    must not be used afterwards. Only images returned by ``acquire_image`` (or
+    dithered by ``dither_go.aio``) are given back, once; other images,
+    including ones sharing memory with Python objects (eg. created with
+    ``image_from_array``), are ignored.
+
+    .. warning:: Views returned from ``image_to_array``, ``image_to_numpy`` and
+    ``to_pil`` share memory with the image, so they would show (and change)
+    pixels of the next image reusing the buffer. Delete them before releasing
+    the image, or copy the pixels (eg. with ``numpy.array``) if they're needed
+    afterwards.
+
+    :param img_data: An ``image.Image`` Golang object.
+
+    :raises BufferError: If a view of the image's pixels is still alive.
+
+    :rtype: :class:`None`
+    """
+
+    memory = dither_go.PooledMemory(img_data)
+    start, end = memory.Address(), memory.Address() + memory.Len()
 
-    palette = []
-    for value in color_list:
-        palette.append(color_utils.color_to_rgba(value))
+    views = sum(len(views) for (address, length), views in _pixel_views.items()
+                if address < end and start < address + length)
+    if views:
+        raise BufferError(f"Image has {views} pixel view(s) still alive, delete them before releasing it")
 
-    return dither_go.CreatePalette(*palette)
+    dither_go.ReleaseImage(img_data)
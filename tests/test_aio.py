@@ -0,0 +1,58 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import asyncio
+import os
+import struct
+import threading
+
+from dither_go import aio
+
+
+class FakeJob:  # pylint: disable=C0115,C0116
+    def __init__(self, job_id, result):
+        self.ID = job_id  # pylint: disable=C0103
+        self.result = result
+
+    def Image(self):  # pylint: disable=C0103
+        return self.result
+
+
+class FakeNotifier:  # pylint: disable=C0115,C0116
+    """ Mimics the Go `Notifier`, finishing jobs from other threads. """
+
+    def __init__(self):
+        self.reader, self.writer = os.pipe()
+        self.last_id = 0
+
+    def Fd(self):  # pylint: disable=C0103
+        return self.reader
+
+    def Close(self):  # pylint: disable=C0103
+        os.close(self.reader)
+        os.close(self.writer)
+
+    def OpenImage(self, path):  # pylint: disable=C0103
+        self.last_id += 1
+        job = FakeJob(self.last_id, path)
+
+        threading.Timer(0.01, os.write, (self.writer, struct.pack("<q", job.ID))).start()
+
+        return job
+
+
+def test_open_image(monkeypatch):
+    """
+    Tests if coroutines resolve with results of the jobs reported
+    as finished through the notifier pipe, in any order.
+    """
+
+    monkeypatch.setattr(aio.dither_go, "NewNotifier", FakeNotifier, raising=False)
+
+    async def main():
+        paths = [f"image_{i}.png" for i in range(32)]
+        return paths, await asyncio.gather(*(aio.open_image(path) for path in paths))
+
+    paths, results = asyncio.run(main())
+
+    assert results == paths
@@ -0,0 +1,151 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import ctypes
+
+import pytest
+
+from dither_go.exceptions import InvalidBufferError
+from dither_go.utils.buffer import BufferUtils
+
+
+def test_get_address():
+    """
+    Tests if `get_address()` helper method resolves memory of the objects
+    supporting the buffer protocol to the address containing the same data.
+    """
+
+    buffer_utils = BufferUtils()
+
+    data = b"\x89PNG\r\n\x1a\n"
+    test_buffers = [data, bytearray(data), memoryview(data), memoryview(bytearray(data))[:4]]
+
+    for value in test_buffers:
+        address, size, _owner = buffer_utils.get_address(value)
+        assert ctypes.string_at(address, size) == bytes(value)
+
+def test_get_address_writable():
+    """
+    Tests if `get_address()` helper method exposes writable buffers
+    without copying them.
+    """
+
+    buffer_utils = BufferUtils()
+
+    data = bytearray(4)
+    address, size, _owner = buffer_utils.get_address(data)
+    ctypes.memset(address, 255, size)
+
+    assert data == bytearray(b"\xff" * 4)
+
+def test_get_address_invalid():
+    """
+    Tests if `get_address()` helper method rejects objects which can't be
+    passed to Go.
+    """
+
+    buffer_utils = BufferUtils()
+
+    with pytest.raises(InvalidBufferError):
+        buffer_utils.get_address("not a buffer")
+
+    with pytest.raises(InvalidBufferError):
+        buffer_utils.get_address(memoryview(bytearray(8))[::2])
+
+def test_read_bytes():
+    """
+    Tests if `read_bytes()` helper method copies the whole memory block
+    described by a buffer object.
+    """
+
+    class FakeBuffer:  # pylint: disable=C0115,C0116
+        def __init__(self, data):
+            self.data = ctypes.create_string_buffer(data, len(data))
+
+        def Address(self):  # pylint: disable=C0103
+            return ctypes.addressof(self.data)
+
+        def Len(self):  # pylint: disable=C0103
+            return len(self.data)
+
+    buffer_utils = BufferUtils()
+
+    assert buffer_utils.read_bytes(FakeBuffer(b"GIF89a")) == b"GIF89a"
+    assert buffer_utils.read_bytes(FakeBuffer(b"")) == b""
+
+def test_get_image_shape():
+    """
+    Tests if `get_image_shape()` helper method reads dimensions of the supported
+    pixel arrays and rejects the unsupported ones.
+    """
+
+    buffer_utils = BufferUtils()
+
+    data = bytearray(2 * 3 * 4)
+    test_arrays = [
+        memoryview(data).cast("B", [2, 12]),
+        memoryview(data).cast("B", [2, 3, 4]),
+        memoryview(data)[:18].cast("B", [2, 3, 3]),
+    ]
+    valid_results = [(2, 12, 1), (2, 3, 4), (2, 3, 3)]
+
+    for value, result in zip(test_arrays, valid_results):
+        assert buffer_utils.get_image_shape(value) == result
+
+    with pytest.raises(InvalidBufferError):
+        buffer_utils.get_image_shape(memoryview(data).cast("B", [2, 6, 2]))
+
+    with pytest.raises(InvalidBufferError):
+        buffer_utils.get_image_shape(memoryview(data).cast("I"))
+
+def test_view_pixels():
+    """
+    Tests if `view_pixels()` helper method shapes the pixel plane of an image,
+    sharing tightly packed pixels and copying padded ones.
+    """
+
+    class FakePixelBuffer:  # pylint: disable=C0115,C0116
+        def __init__(self, data, width, height, channels, stride):
+            self.data = data
+            self.Width, self.Height, self.Channels, self.Stride = width, height, channels, stride  # pylint: disable=C0103
+
+        def Buffer(self):  # pylint: disable=C0103
+            address, size, _owner = BufferUtils().get_address(self.data)
+            return type("FakeBuffer", (), {"Address": lambda _: address, "Len": lambda _: size})()
+
+    buffer_utils = BufferUtils()
+
+    data = bytearray(range(16))
+    view = buffer_utils.view_pixels(FakePixelBuffer(data, 2, 2, 4, 8))
+    assert view.shape == (2, 2, 4)
+
+    view[0, 0, 0] = 255
+    assert data[0] == 255
+
+    data = bytearray(range(7))
+    view = buffer_utils.view_pixels(FakePixelBuffer(data, 3, 2, 1, 4))
+    assert view.shape == (2, 3)
+    assert view.tolist() == [[0, 1, 2], [4, 5, 6]]
+
+def test_unpack_colors():
+    """
+    Tests if `unpack_colors()` helper method splits packed colors into RGBA lists.
+    """
+
+    buffer_utils = BufferUtils()
+
+    assert buffer_utils.unpack_colors(bytes([0, 0, 0, 255, 255, 255, 255, 255])) == [[0, 0, 0, 255], [255, 255, 255, 255]]
+    assert buffer_utils.unpack_colors(b"") == []
+
+def test_pack_colors():
+    """
+    Tests if `pack_colors()` helper method joins RGBA lists into packed colors,
+    that can be unpacked back by `unpack_colors()`.
+    """
+
+    buffer_utils = BufferUtils()
+
+    test_colors = [[0, 0, 0, 255], [171, 223, 190, 255], [222, 173, 190, 239]]
+
+    assert buffer_utils.pack_colors(test_colors) == bytes([0, 0, 0, 255, 171, 223, 190, 255, 222, 173, 190, 239])
+    assert buffer_utils.unpack_colors(buffer_utils.pack_colors(test_colors)) == test_colors
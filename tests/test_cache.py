@@ -0,0 +1,61 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dither_go.utils.cache import CacheInfo, LRUCache
+
+
+def test_get_or_create():
+    """
+    Tests if `get_or_create()` method creates values only on misses
+    and counts hits and misses.
+    """
+
+    cache = LRUCache(2)
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    first = cache.get_or_create("a", factory)
+    assert cache.get_or_create("a", factory) is first
+    assert len(created) == 1
+
+    assert cache.info() == CacheInfo(hits=1, misses=1, evictions=0, size=1, maxsize=2)
+
+def test_eviction():
+    """
+    Tests if the least recently used values are evicted first,
+    both on inserts and when the cache is resized.
+    """
+
+    cache = LRUCache(2)
+
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("b", lambda: 2)
+    cache.get_or_create("a", lambda: 3)
+    cache.get_or_create("c", lambda: 4)
+
+    # "b" was used least recently, so it's created again
+    assert cache.get_or_create("b", lambda: 5) == 5
+    assert cache.get_or_create("c", lambda: 6) == 4
+    assert cache.info().evictions == 2
+
+    cache.resize(1)
+    assert cache.info().size == 1
+    assert cache.get_or_create("c", lambda: 7) == 4
+
+    cache.resize(0)
+    assert cache.get_or_create("c", lambda: 8) == 8
+    assert cache.info().size == 0
+
+def test_clear():
+    """
+    Tests if `clear()` method removes all values and resets the statistics.
+    """
+
+    cache = LRUCache(4)
+    cache.get_or_create("a", lambda: 1)
+    cache.clear()
+
+    assert cache.info() == CacheInfo(hits=0, misses=0, evictions=0, size=0, maxsize=4)
@@ -0,0 +1,72 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+
+import pytest
+
+from dither_go import cli
+from dither_go.exceptions import DitherGoError
+
+
+def test_find_images(tmp_path):
+    """
+    Tests if `_find_images()` finds images in directories recursively, keeping
+    their structure in the output, and passes image files through.
+    """
+
+    (tmp_path / "album" / "nested").mkdir(parents=True)
+    for name in ["album/first.jpg", "album/notes.txt", "album/nested/second.PNG", "single.webp"]:
+        (tmp_path / name).touch()
+
+    inputs = [str(tmp_path / "album"), str(tmp_path / "single.webp")]
+    output = str(tmp_path / "output")
+
+    assert sorted(cli._find_images(inputs, output, ".png")) == sorted([  # pylint: disable=W0212
+        (str(tmp_path / "album" / "first.jpg"), os.path.join(output, "first.png")),
+        (str(tmp_path / "album" / "nested" / "second.PNG"), os.path.join(output, "nested", "second.png")),
+        (str(tmp_path / "single.webp"), os.path.join(output, "single.png")),
+    ])
+
+def test_find_images_collision(tmp_path, monkeypatch):
+    """
+    Tests if `_find_images()` rejects images which would be written to the same
+    output path, and `main()` exits before dithering any of them.
+    """
+
+    for name in ["first/photo.jpg", "first/photo.png", "second/photo.png"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+
+    output = str(tmp_path / "output")
+
+    with pytest.raises(DitherGoError):
+        cli._find_images([str(tmp_path / "first")], output, ".png")  # pylint: disable=W0212
+
+    with pytest.raises(DitherGoError):
+        cli._find_images([str(tmp_path / "first" / "photo.png"), str(tmp_path / "second")], output, ".png")  # pylint: disable=W0212
+
+    batches = []
+    monkeypatch.setattr(cli, "get_ditherer", lambda *args: object())
+    monkeypatch.setattr(cli, "dither_batch", lambda *args: batches.append(args))
+
+    assert cli.main([str(tmp_path / "first"), "-o", output, "-p", "#000,#fff"]) == 2
+    assert not batches and not os.path.exists(output)
+
+def test_is_up_to_date(tmp_path):
+    """
+    Tests if `_is_up_to_date()` only reports outputs newer than their inputs.
+    """
+
+    input_path, output_path = tmp_path / "input.jpg", tmp_path / "output.png"
+
+    input_path.touch()
+    assert not cli._is_up_to_date(str(input_path), str(output_path))  # pylint: disable=W0212
+
+    output_path.touch()
+    os.utime(input_path, (0, 0))
+    assert cli._is_up_to_date(str(input_path), str(output_path))  # pylint: disable=W0212
+
+    os.utime(output_path, (0, 0))
+    os.utime(input_path, None)
+    assert not cli._is_up_to_date(str(input_path), str(output_path))  # pylint: disable=W0212
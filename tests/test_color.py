@@ -30,3 +30,17 @@ def test_is_valid_rgba():
 
     for value, result in zip(test_rgba_lists, valid_results):
         assert color_utils.is_valid_rgba(value) == result
+
+def test_color_to_channels():
+    """
+    Tests if `color_to_channels()` helper method converts both color
+    representations to lists of four RGBA color channels.
+    """
+
+    color_utils = ColorUtils()
+
+    test_colors = ["#fff", "#deadbeef", [132, 247, 89], [0, 0, 0, 32]]
+    valid_results = [[15, 15, 15, 255], [222, 173, 190, 239], [132, 247, 89, 255], [0, 0, 0, 32]]
+
+    for value, result in zip(test_colors, valid_results):
+        assert color_utils.color_to_channels(value) == result
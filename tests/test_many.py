@@ -0,0 +1,50 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+import dither_go
+from dither_go import wrapper
+
+
+class FakeDitherer:  # pylint: disable=C0115,R0903
+    _engine = None
+
+
+def test_dither_many(monkeypatch):
+    """
+    Tests if `dither_many()` passes the Golang objects dithering images
+    for each ditherer (their `Engine`, if they use one) to a single
+    `DitherMany` call, and returns its images in the same order.
+    """
+
+    calls = []
+
+    def dither_many(img_data, group, paletted):
+        calls.append((img_data, group, paletted))
+        return [f"{ditherer}-image" for ditherer in group]
+
+    monkeypatch.setattr(wrapper.dither_go, "Slice_dither_go_ImageDitherer", list, raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "DitherMany", dither_many, raising=False)
+
+    plain, with_engine = FakeDitherer(), FakeDitherer()
+    with_engine._engine = "engine"  # pylint: disable=W0212
+
+    images = dither_go.dither_many("img", [plain, with_engine], paletted=True)
+
+    assert calls == [("img", [plain, "engine"], True)]
+    assert images == [f"{plain}-image", "engine-image"]
+
+def test_dither_many_error(monkeypatch):
+    """
+    Tests if `dither_many()` raises errors returned by `DitherMany`.
+    """
+
+    def dither_many(img_data, group, paletted):
+        raise RuntimeError("ditherer 0: no Ditherer provided")
+
+    monkeypatch.setattr(wrapper.dither_go, "Slice_dither_go_ImageDitherer", list, raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "DitherMany", dither_many, raising=False)
+
+    with pytest.raises(RuntimeError):
+        dither_go.dither_many("img", [FakeDitherer()])
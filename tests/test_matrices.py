@@ -0,0 +1,87 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import subprocess
+import sys
+from dataclasses import fields
+
+import pytest
+
+from dither_go import DitherGoError
+from dither_go.algorithms import ERROR_DIFFUSION, ORDERED, get_algorithm, list_algorithms
+from dither_go.matrices import ErrorDiffusers, OrderedDitherers
+
+
+def _can_read_rows() -> bool:
+    """
+    Reports whether the bindings can read rows of a matrix. Some gopy versions
+    generate bindings which abort the process on it, so it's checked in a child one.
+    """
+
+    code = "from dither_go.matrices import ErrorDiffusers; list(ErrorDiffusers.Simple2D[0])"
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, check=False).returncode == 0
+
+
+def test_names():
+    """
+    Tests if `names()` method lists matrices without creating them.
+    """
+
+    names = ErrorDiffusers.names()
+
+    assert names[:2] == ["Simple2D", "FloydSteinberg"]
+    assert "StevenPigeon" in names
+    assert "ClusteredDotVerticalLine" in OrderedDitherers.names()
+
+    assert fields(ErrorDiffusers)[-1].default_factory.matrix is None
+
+def test_lazy_matrix():
+    """
+    Tests if matrices are created on first access and cached afterwards.
+    """
+
+    matrix = OrderedDitherers.ClusteredDot4x4
+
+    assert matrix is not None
+    assert OrderedDitherers.ClusteredDot4x4 is matrix
+    assert OrderedDitherers().ClusteredDot4x4 is matrix
+
+    with pytest.raises(AttributeError):
+        OrderedDitherers().ClusteredDot4x4 = matrix
+
+    assert len(fields(OrderedDitherers())) == len(OrderedDitherers.names())
+
+def test_algorithm_registry():
+    """
+    Tests if the algorithm registry lists all matrices in their order.
+    """
+
+    assert [info.name for info in list_algorithms(ERROR_DIFFUSION)] == ErrorDiffusers.names()
+    assert [info.name for info in list_algorithms(ORDERED)] == OrderedDitherers.names()
+
+    info = get_algorithm("JarvisJudiceNinke")
+
+    assert info.display_name == "Jarvis, Judice & Ninke"
+    assert (info.kind, info.width, info.height) == (ERROR_DIFFUSION, 5, 3)
+    assert get_algorithm("Vertical5x3")[3:5] == (5, 3)
+
+    with pytest.raises(DitherGoError):
+        get_algorithm("Unknown")
+
+@pytest.mark.skipif(not _can_read_rows(), reason="bindings can't read matrix rows")
+def test_algorithm_registry_matches_matrices():
+    """
+    Tests if sizes and costs in the algorithm registry are the ones
+    of the actual matrices.
+    """
+
+    for info in list_algorithms(ERROR_DIFFUSION):
+        rows = [list(row) for row in getattr(ErrorDiffusers, info.name)]
+        taps = sum(1 for row in rows for weight in row if weight != 0)
+
+        assert (info.width, info.height, info.cost) == (len(rows[0]), len(rows), 1 + taps), info.name
+
+    for info in list_algorithms(ORDERED):
+        rows = [list(row) for row in getattr(OrderedDitherers, info.name).Matrix]
+
+        assert (info.width, info.height) == (len(rows[0]), len(rows)), info.name
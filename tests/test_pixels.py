@@ -0,0 +1,19 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dither_go import wrapper
+
+
+def test_image_mode_doesnt_copy_pixels(monkeypatch):
+    """
+    Tests if `image_mode` asks Golang for the mode only, without getting
+    the pixels, which are copied for images of other types.
+    """
+
+    def image_pixels(img_data):  # pylint: disable=W0613
+        raise AssertionError("pixels are read")
+
+    monkeypatch.setattr(wrapper.dither_go, "ImagePixels", image_pixels, raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "ImageMode", lambda img_data: "RGBa", raising=False)
+
+    assert wrapper.image_mode(object()) == "RGBa"
@@ -0,0 +1,87 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import ctypes
+import gc
+
+import pytest
+
+import dither_go
+from dither_go import wrapper
+
+
+class FakeImage:  # pylint: disable=C0115,R0903
+    def __init__(self, handle):
+        self.handle = handle
+
+
+class FakeBuffer:  # pylint: disable=C0115,C0116
+    def __init__(self, memory):
+        self.memory = memory
+
+    def Address(self):  # pylint: disable=C0103
+        return ctypes.addressof(self.memory)
+
+    def Len(self):  # pylint: disable=C0103
+        return len(self.memory)
+
+
+class FakePixelBuffer:  # pylint: disable=C0115,C0116,R0903
+    """ Mimics the Go `PixelBuffer` of a 2x2 RGBA image. """
+
+    def __init__(self, memory=None):
+        self.Width, self.Height, self.Channels, self.Stride = 2, 2, 4, 8  # pylint: disable=C0103
+        self.memory = (ctypes.c_ubyte * 16)() if memory is None else memory
+
+    def Buffer(self):  # pylint: disable=C0103
+        return FakeBuffer(self.memory)
+
+
+def test_release_image_with_view(monkeypatch):
+    """
+    Tests if `release_image()` refuses to release an image while a view
+    of its pixels is alive, also when the view was taken through another
+    Python object wrapping the same image, and releases it once the view
+    is deleted.
+    """
+
+    released = []
+    memory = (ctypes.c_ubyte * 16)()
+
+    monkeypatch.setattr(wrapper.dither_go, "ImagePixels", lambda img_data: FakePixelBuffer(memory), raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "PooledMemory", lambda img_data: FakeBuffer(memory), raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "ReleaseImage", released.append, raising=False)
+
+    img, same_img = FakeImage(1), FakeImage(2)
+    view = dither_go.image_to_array(same_img)[1:]
+
+    with pytest.raises(BufferError):
+        dither_go.release_image(img)
+
+    assert not released
+
+    del view
+    gc.collect()
+
+    dither_go.release_image(img)
+    assert released == [img]
+
+
+def test_release_image_ignores_other_views(monkeypatch):
+    """
+    Tests if `release_image()` releases an image while views of other
+    memory are alive.
+    """
+
+    released = []
+
+    monkeypatch.setattr(wrapper.dither_go, "ImagePixels", lambda img_data: FakePixelBuffer(), raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "PooledMemory", lambda img_data: FakePixelBuffer().Buffer(), raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "ReleaseImage", released.append, raising=False)
+
+    img = FakeImage(1)
+    view = dither_go.image_to_array(FakeImage(2))
+
+    dither_go.release_image(img)
+    assert released == [img]
+    assert view.nbytes == 16
@@ -0,0 +1,34 @@
+# Copyright 2023, tfuxu <https://github.com/tfuxu>
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dither_go import wrapper
+
+
+class FakePreparedImage:  # pylint: disable=C0115,R0903
+    pass
+
+
+class FakeEngine:  # pylint: disable=C0115,C0116,R0903
+    def __init__(self, ditherer):
+        self.ditherer = ditherer
+
+    def DitherCopy(self, src):  # pylint: disable=C0103
+        return ("engine", src)
+
+
+def test_prepared_image_uses_engine(monkeypatch):
+    """
+    Tests if ditherers, including frozen ones, switch to an `Engine` when
+    given a `PreparedImage`, which only an `Engine` reads.
+    """
+
+    monkeypatch.setattr(wrapper.dither_go, "PreparedImage", FakePreparedImage, raising=False)
+    monkeypatch.setattr(wrapper.dither_go, "NewEngine", FakeEngine, raising=False)
+
+    prepared = FakePreparedImage()
+
+    for ditherer in [wrapper.Ditherer(), wrapper.FrozenDitherer(handle=wrapper.Ditherer().handle)]:
+        assert ditherer.DitherCopy(prepared) == ("engine", prepared)
+        assert ditherer._engine.ditherer is ditherer  # pylint: disable=W0212
+
+        assert wrapper._go_ditherer(ditherer) is ditherer._engine  # pylint: disable=W0212